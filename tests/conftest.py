@@ -0,0 +1,47 @@
+import csv
+import json
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from titan.cache import CACHE_LIMITS, SharedCache, use_handles
+from titan.config import SiteConfig
+from titan.data_sources import SheetSource
+
+
+def _capture_settings():
+    # Runs as a Streamlit script: the sidebar and tabs fill in every setting with its default
+    import streamlit as st
+    from titan import ui
+    from titan.config import SiteConfig
+    cfg = SiteConfig()
+    ui.sidebar(cfg)
+    ui.workspace(cfg)
+    st.session_state["settings"] = cfg.to_json()
+
+
+@pytest.fixture(scope="session")
+def defaults():
+    at = AppTest.from_function(_capture_settings, default_timeout=120).run()
+    assert not at.exception
+    return json.loads(at.session_state["settings"])
+
+
+@pytest.fixture
+def site(defaults, tmp_path):
+    # -> make(**settings): a SiteConfig with the builder's defaults. Builds run on a fresh shared
+    # cache and a sheet source that reads local CSVs (see write_csv).
+    source = SheetSource(cache_dir=str(tmp_path / "sheet-cache"), local_dirs=None)
+    with use_handles(cache=SharedCache(CACHE_LIMITS), sheets=source):
+        yield lambda **settings: SiteConfig(**{**defaults, **settings})
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    # write_csv(name, rows) -> path of a CSV in tmp_path, for sheet_url and friends
+    def write(name, rows):
+        path = tmp_path / name
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+        return str(path)
+    return write
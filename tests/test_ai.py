@@ -0,0 +1,112 @@
+import threading
+import time
+from types import SimpleNamespace
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from titan import ai, mock_llm
+from titan.cache import CACHE_LIMITS, SharedCache
+
+DELAY = 0.3
+
+
+@pytest.fixture
+def mock(request):
+    # Mock chat API on a free port; make_handler arguments come from the test's parametrize/marker
+    kwargs = getattr(request, "param", {})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), mock_llm.make_handler(DELAY, 0, **kwargs))
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def run(base_url, names, key="test", limit=ai.MAX_CONCURRENCY):
+    results, threads = {}, set()
+    def on_result(name, result, error, seconds):
+        threads.add(threading.current_thread())
+        results[name] = (result, error)
+    t0 = time.perf_counter()
+    ai.generate_sections(key, "bakery", names, on_result, base_url=base_url, limit=limit)
+    return results, time.perf_counter() - t0, threads
+
+
+def test_sections_run_concurrently_and_validate(mock):
+    names = list(ai.SECTIONS)
+    results, elapsed, threads = run(mock, names, limit=len(names))
+    assert set(results) == set(names)
+    assert all(error is None for _, error in results.values())
+    # One wave instead of eight sequential calls
+    assert elapsed < DELAY * len(names) / 2
+    assert threads == {threading.current_thread()}
+    values, problems = results["features"][0]
+    assert problems == [] and len(values["feat_data"].splitlines()) == 4
+    assert results["blog"][0][0]["blog_drafts"].startswith("Slug,Title,Date")
+
+
+def test_limit_bounds_concurrency(mock):
+    names = ["hero", "about", "faq", "legal"]
+    _, elapsed, _ = run(mock, names, limit=2)
+    assert elapsed >= DELAY * 2
+
+
+@pytest.mark.parametrize("mock", [{"malformed": ["faq_data"], "empty": ["feat_data", "hero_sub"]}], indirect=True)
+def test_failures_stay_in_their_section(mock):
+    results, _, _ = run(mock, ["hero", "features", "faq", "booking"])
+    assert set(results) == {"hero", "features", "faq", "booking"}
+    assert results["faq"] == (None, results["faq"][1]) and "Malformed API response" in results["faq"][1]
+    assert results["features"][0] is None and "valid line(s)" in results["features"][1]
+    # A section keeps the fields that passed and reports the one that did not
+    values, problems = results["hero"][0]
+    assert set(values) == {"hero_h"} and problems[0].startswith("hero_sub")
+    assert results["booking"][1] is None
+
+
+def test_bad_key_reports_every_section(mock):
+    results, _, _ = run(mock, ["hero", "faq"], key="bad")
+    assert all(result is None and "Invalid API Key" in error for result, error in results.values())
+
+
+def test_unreachable_endpoint_is_an_ai_error():
+    results, _, _ = run("http://127.0.0.1:9/v1", ["hero"])
+    assert results["hero"][0] is None and results["hero"][1].startswith("Request failed")
+
+
+@pytest.mark.parametrize("value, ok", [
+    (["bolt | Fast | Quick pages", "x | Y | Z", "shield | Safe | No DB"], True),
+    (["bolt | Fast", "only one part"], False),
+])
+def test_feature_lines(value, ok):
+    check = ai.FORMATS["features"][1]
+    if ok:
+        assert len(check(value).splitlines()) == 3
+    else:
+        with pytest.raises(ai.AIError):
+            check(value)
+
+
+class CountingSession:
+    # Stands in for requests.Session: every post is a new answer; "bad" keys get a 401
+    def __init__(self):
+        self.keys = []
+
+    def post(self, url, headers, json, timeout):
+        key = headers["Authorization"].removeprefix("Bearer ")
+        self.keys.append(key)
+        if key == "bad": return SimpleNamespace(status_code=401, text="")
+        body = {"choices": [{"message": {"content": f"answer {len(self.keys)}"}}]}
+        return SimpleNamespace(status_code=200, json=lambda: body, text="")
+
+
+def test_cached_answers_are_per_key_and_can_be_regenerated():
+    session, cache = CountingSession(), SharedCache(CACHE_LIMITS)
+    ask = lambda key, fresh=False: ai.complete(session, cache, key, "same prompt", "http://x/v1", fresh)
+    assert ask("alice") == "answer 1" and ask("alice") == "answer 1"
+    # Another key, missing or invalid, never sees alice's paid answer
+    assert ask("bob") == "answer 2"
+    with pytest.raises(ai.AIError):
+        ask("bad")
+    assert ask("") == "answer 4"
+    assert ask("alice", fresh=True) == "answer 5" and ask("alice") == "answer 5"
+    assert session.keys == ["alice", "bob", "bad", "", "alice"]
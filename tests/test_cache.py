@@ -0,0 +1,77 @@
+import json
+import threading
+
+from titan.cache import SharedCache, handle, use_handles
+from titan.content import compile_store_index
+from titan.data_sources import Product
+
+
+def products(n):
+    return [Product(f"Product {i}", 10.0 + i, f"${10 + i}", f"Description of product {i} " * 3,
+                    f"https://img.example.com/{i}.jpg", "", f"Cat{i % 5}", i + 2) for i in range(n)]
+
+
+def test_size_counts_contents_of_containers():
+    index = compile_store_index(products(2000))
+    # At least the serialized payload, not just the outer dict
+    assert SharedCache._size(index) >= len(json.dumps(index))
+    rows = products(2000)
+    assert SharedCache._size(rows) >= sum(len(p.description) for p in rows)
+
+
+def test_size_handles_cycles_and_shared_objects():
+    a = ["x" * 1000]
+    a.append(a)
+    assert 1000 <= SharedCache._size(a) < 2000
+    shared = "y" * 1000
+    assert SharedCache._size([[shared], [shared]]) >= 2000
+
+
+def test_evicts_least_recently_used_by_count():
+    cache = SharedCache({"t": (2, 10**6)})
+    cache.get_or_set("t", "a", lambda: "A")
+    cache.get_or_set("t", "b", lambda: "B")
+    cache.get_or_set("t", "a", lambda: "A2")         # hit, a becomes most recent
+    cache.get_or_set("t", "c", lambda: "C")          # evicts b
+    assert cache.get_or_set("t", "a", lambda: "new") == "A"
+    assert cache.get_or_set("t", "b", lambda: "new") == "new"
+    assert cache.stats["t"]["evictions"] == 2
+
+
+def test_evicts_by_bytes_for_nested_values():
+    cache = SharedCache({"t": (100, 50_000)})
+    for n in range(5):
+        cache.get_or_set("t", n, lambda: [{"text": "z" * 15_000}])
+    # Three 15 KB rows fit in 50 KB; the list shells alone never would have triggered eviction
+    assert len(cache._data["t"]) == 3
+    assert cache._bytes["t"] <= 50_000
+    assert cache.stats["t"]["evictions"] == 2
+
+
+def test_oversized_value_is_returned_but_not_kept():
+    cache = SharedCache({"t": (100, 10_000)})
+    big = products(500)
+    assert cache.get_or_set("t", "big", lambda: big) is big
+    assert len(cache._data["t"]) == 0 and cache._bytes["t"] == 0
+
+
+def test_metrics_report_hits_and_misses():
+    cache = SharedCache({"t": (10, 10**6)})
+    cache.get_or_set("t", "k", lambda: "v")
+    cache.get_or_set("t", "k", lambda: "v")
+    (row,) = cache.metrics()
+    assert (row["Entries"], row["Hits"], row["Misses"], row["Hit Rate"]) == (1, 1, 1, "50%")
+
+
+def test_use_handles_binds_per_thread_and_restores():
+    made = []
+    make = lambda: made.append(1) or "process"
+    with use_handles(cache="outer"):
+        with use_handles(cache="inner", other=1):
+            assert handle("cache", make) == "inner"
+        assert handle("cache", make) == "outer" and handle("other", make) == "process"
+        other = []
+        t = threading.Thread(target=lambda: other.append(handle("cache", make)))
+        t.start(); t.join()
+        assert other == ["process"]
+    assert handle("cache", make) == "process"
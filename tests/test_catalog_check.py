@@ -0,0 +1,98 @@
+import csv
+import io
+import tracemalloc
+
+from titan import catalog_check, data_sources
+
+
+def rows(text):
+    reader = csv.reader(io.StringIO(text))
+    for row in reader:
+        yield reader.line_num, row
+
+
+def run(text):
+    out = list(catalog_check.validate(rows(text)))
+    return [x for k, x in out if k == "issue"], [x for k, x in out if k == "row"]
+
+
+HEADER = "Name,Price,Description,ImageURL,StripeLink,Category\n"
+
+
+def test_clean_sheet_has_no_issues():
+    issues, products = run(HEADER + "Mug,$12,Ceramic,https://img.example.com/m.jpg,https://buy.stripe.com/x,Kitchen\n")
+    assert issues == []
+    (p,) = products
+    assert (p.name, p.price, p.category, p.line) == ("Mug", 12.0, "Kitchen", 2)
+
+
+def test_duplicates_are_dropped_with_the_first_line():
+    issues, products = run(HEADER + "Mug,$12,a,,,\nCup,$5,b,,,\n  mug ,$13,c,,,\n")
+    assert [p.name for p in products] == ["Mug", "Cup"]
+    (dup,) = issues
+    assert (dup.line, dup.column, dup.severity) == (4, "Name", "error")
+    assert "line 2" in dup.message
+
+
+def test_line_numbers_follow_multiline_cells():
+    issues, products = run(HEADER + 'Mug,$12,"two\nlines",,,\nBad,free,x,,,\n')
+    assert products[0].line == 3
+    (bad,) = issues
+    assert (bad.line, bad.column, bad.severity) == (4, "Price", "error")
+
+
+def test_row_level_checks():
+    issues, products = run(HEADER + ",$1,x,,,\nLamp,$9,x,not a url,http://pay.example.com,\n")
+    assert [(i.line, i.column, i.severity) for i in issues] == [
+        (2, "Name", "error"), (3, "ImageURL", "warning"), (3, "StripeLink", "warning")]
+    (p,) = products
+    assert (p.image, p.stripe) == ("", "")
+
+
+def test_unknown_headers_are_read_by_position_like_the_store():
+    text = "Product,Cost,Details,Picture,Checkout,Category\nMug,$12,Ceramic,,,Kitchen\n"
+    issues, products = run(text)
+    assert {i.column for i in issues} == {"Name", "Price", "Description", "ImageURL", "StripeLink"}
+    assert all(i.severity == "warning" for i in issues)
+    (p,) = products
+    (raw,) = data_sources.products(rows(text))
+    assert (p.name, p.price_label, p.description, p.category) == (raw.name, raw.price_label, raw.description, raw.category)
+
+
+def test_known_header_keeps_its_column():
+    # Category sits where Description would be; Description is not guessed into it
+    issues, products = run("Name,Price,Category\nMug,$12,Kitchen\n")
+    (p,) = products
+    assert (p.category, p.description) == ("Kitchen", "")
+    assert ("Description", "warning") in {(i.column, i.severity) for i in issues}
+
+
+def test_missing_name_column_stops():
+    issues, products = run("Price,Description\n$1,x\n")
+    assert products == []
+    assert ("Name", "error") in {(i.column, i.severity) for i in issues}
+
+
+def test_empty_sheet():
+    issues, products = run("")
+    assert products == [] and issues[0].message == "Sheet is empty"
+
+
+def test_memory_grows_with_distinct_names_not_with_the_file(tmp_path):
+    # A 30 MB export with long descriptions is validated in a few MB: only the name hashes stay
+    path, n = tmp_path / "erp.csv", 4000
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(catalog_check.COLUMNS)
+        for i in range(n):
+            w.writerow([f"Product {i}", f"${i % 90 + 1}", "Long-description-" * 450, "", "", f"Cat {i % 7}"])
+    size = path.stat().st_size
+    sheet = data_sources.Sheet(str(path), str(path), "1")
+    tracemalloc.start()
+    try:
+        rows = sum(1 for kind, _ in catalog_check.validate(sheet.rows()) if kind == "row")
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert rows == n and size > 30_000_000
+    assert peak < 300 * n and peak < size / 10
@@ -0,0 +1,12 @@
+from titan.config import SiteConfig
+
+
+def test_json_roundtrip_keeps_settings_and_digest():
+    cfg = SiteConfig(biz_name="Café Titan", sheet_url="", lang_list="en, fr", price=12.5)
+    back = SiteConfig.from_json(cfg.to_json())
+    assert vars(back) == vars(cfg) and back.digest() == cfg.digest()
+
+
+def test_digest_follows_settings():
+    assert SiteConfig(a=1, b=2).digest() == SiteConfig(b=2, a=1).digest()
+    assert SiteConfig(a=1).digest() != SiteConfig(a=2).digest()
@@ -0,0 +1,33 @@
+from titan.content import render_markdown
+
+
+def test_link_url_cannot_break_out_of_href():
+    out = render_markdown('[x](https://a.com/"onmouseover="alert(1))')
+    assert '"onmouseover' not in out
+    assert "<a href=" in out
+
+
+def test_image_url_cannot_break_out_of_src():
+    out = render_markdown("![p](https://a.com/x.png\"onerror=\"alert(1))")
+    assert '"onerror' not in out
+    assert "<img src=" in out
+
+
+def test_single_quotes_are_escaped():
+    out = render_markdown("[x](https://a.com/'onclick='alert(1))")
+    assert "'onclick" not in out
+
+
+def test_raw_html_is_escaped():
+    out = render_markdown('<script>alert(1)</script>\n\n<img src=x onerror="y">')
+    assert "<script>" not in out and "<img src=x" not in out
+    assert "&lt;script&gt;" in out
+
+
+def test_markdown_still_renders():
+    out = render_markdown("## Title\n\nSome **bold** and [link](https://a.com/p?q=1&r=2)\n\n* one\n* two\n\n> quote")
+    assert "<h3>Title</h3>" in out
+    assert "<strong>bold</strong>" in out
+    assert '<a href="https://a.com/p?q=1&amp;r=2">link</a>' in out
+    assert "<ul><li>one</li><li>two</li></ul>" in out
+    assert "<blockquote>quote</blockquote>" in out
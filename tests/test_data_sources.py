@@ -0,0 +1,114 @@
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from titan import data_sources
+
+CSV = "Name,Price,Description,ImageURL,StripeLink,Category\nCafé Crème,₹250,Hot,,,Drinks\n"
+
+
+@pytest.fixture
+def serve(tmp_path):
+    # Local HTTP stand-in for a published sheet; returns (url for a file, list of status codes)
+    statuses = []
+    class Handler(SimpleHTTPRequestHandler):
+        def log_request(self, code="-", size="-"):
+            statuses.append(int(code))
+        def guess_type(self, path):
+            return self.server.content_type
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(Handler, directory=str(tmp_path)))
+    server.content_type = "text/csv"
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield server, lambda name: f"http://127.0.0.1:{server.server_port}/{name}", statuses
+    server.shutdown()
+    server.server_close()
+
+
+def test_csv_without_charset_is_read_as_utf8(tmp_path, serve):
+    (tmp_path / "inv.csv").write_text(CSV, encoding="utf-8")
+    _, url, _ = serve
+    sheet = data_sources.SheetSource(cache_dir=str(tmp_path / "cache")).fetch(url("inv.csv"))
+    (p,) = data_sources.products(sheet.rows())
+    assert (p.name, p.price_label) == ("Café Crème", "₹250")
+
+
+def test_utf8_bom_is_dropped(tmp_path, serve):
+    (tmp_path / "inv.csv").write_bytes(b"\xef\xbb\xbf" + CSV.encode())
+    _, url, _ = serve
+    sheet = data_sources.SheetSource(cache_dir=str(tmp_path / "cache")).fetch(url("inv.csv"))
+    assert next(sheet.rows())[1][0] == "Name"
+
+
+def test_declared_charset_is_honoured(tmp_path, serve):
+    (tmp_path / "inv.csv").write_bytes("Name,Price\nCafé,5\n".encode("latin-1"))
+    server, url, _ = serve
+    server.content_type = "text/csv; charset=ISO-8859-1"
+    sheet = data_sources.SheetSource(cache_dir=str(tmp_path / "cache")).fetch(url("inv.csv"))
+    assert list(sheet.rows())[1][1][0] == "Café"
+
+
+def test_unchanged_sheet_revalidates_with_304(tmp_path, serve):
+    (tmp_path / "inv.csv").write_text(CSV, encoding="utf-8")
+    _, url, statuses = serve
+    source = data_sources.SheetSource(cache_dir=str(tmp_path / "cache"), fresh_for=0)
+    first = source.fetch(url("inv.csv"))
+    second = source.fetch(url("inv.csv"))
+    assert statuses == [200, 304]
+    assert second == first
+    (p,) = data_sources.products(second.rows())
+    assert p.name == "Café Crème"
+
+
+def test_fresh_download_is_not_revalidated(tmp_path, serve):
+    (tmp_path / "inv.csv").write_text(CSV, encoding="utf-8")
+    _, url, statuses = serve
+    source = data_sources.SheetSource(cache_dir=str(tmp_path / "cache"), fresh_for=60)
+    source.fetch(url("inv.csv")); source.fetch(url("inv.csv"))
+    assert statuses == [200]
+
+
+def test_changed_sheet_gets_new_version(tmp_path, serve):
+    path = tmp_path / "inv.csv"
+    path.write_text(CSV, encoding="utf-8")
+    _, url, statuses = serve
+    source = data_sources.SheetSource(cache_dir=str(tmp_path / "cache"), fresh_for=0)
+    first = source.fetch(url("inv.csv"))
+    path.write_text(CSV + "Tea,₹90,Hot,,,Drinks\n", encoding="utf-8")
+    os.utime(path, (os.stat(path).st_atime, os.stat(path).st_mtime + 5))
+    second = source.fetch(url("inv.csv"))
+    assert statuses == [200, 200]
+    assert second.version != first.version
+    assert [p.name for p in data_sources.products(second.rows())] == ["Café Crème", "Tea"]
+
+
+def test_missing_local_file_raises_sheet_error(tmp_path):
+    with pytest.raises(data_sources.SheetError):
+        data_sources.SheetSource(cache_dir=str(tmp_path), local_dirs=None).fetch(str(tmp_path / "nope.csv"))
+
+
+def test_local_files_only_from_allowed_dirs(tmp_path):
+    allowed, other = tmp_path / "sheets", tmp_path / "other"
+    allowed.mkdir(); other.mkdir()
+    (allowed / "inv.csv").write_text("Name,Price\nTea,$3\n")
+    (other / "secret.csv").write_text("x")
+    (allowed / "link.csv").symlink_to(other / "secret.csv")
+    source = data_sources.SheetSource(cache_dir=str(tmp_path / "cache"), local_dirs=(str(allowed),))
+    assert source.fetch(str(allowed / "inv.csv")).path == str(allowed / "inv.csv")
+    assert source.fetch(f"file://{allowed}/inv.csv").url.startswith("file://")
+    for url in (str(other / "secret.csv"), f"file://{other}/secret.csv", f"{allowed}/../other/secret.csv",
+                str(allowed / "link.csv"), "/etc/passwd"):
+        with pytest.raises(data_sources.SheetError, match="not allowed"):
+            source.fetch(url)
+    # The builder default: no local files at all
+    with pytest.raises(data_sources.SheetError, match="not allowed"):
+        data_sources.SheetSource(cache_dir=str(tmp_path / "cache"), local_dirs=()).fetch(str(allowed / "inv.csv"))
+
+
+def test_download_locks_are_a_fixed_set(tmp_path):
+    source = data_sources.SheetSource(cache_dir=str(tmp_path))
+    locks = {id(source._lock(f"https://example.com/{n}.csv")) for n in range(1000)}
+    assert len(locks) <= data_sources.LOCK_STRIPES
+    assert source._lock("https://example.com/a.csv") is source._lock("https://example.com/a.csv")
@@ -0,0 +1,64 @@
+import re
+
+import pytest
+
+from titan.export import site_files
+
+ATTACK = '"><script>alert(1)</script>'
+ESCAPED = "&lt;script&gt;alert(1)&lt;/script&gt;"
+
+
+@pytest.fixture
+def hostile(site, write_csv):
+    # Quotes, markup and javascript: URLs in business, product, FAQ and blog fields
+    store = write_csv("store.csv", [
+        ["Name", "Price", "Description", "ImageURL", "StripeLink", "Category"],
+        [f"Cake {ATTACK}", "$5", f"Sweet {ATTACK}", "javascript:alert(1)", "javascript:alert('http')", f"Treats {ATTACK}"],
+        ["Bread", "$3", "Plain", "https://img.example.com/bread.jpg", "https://buy.stripe.com/x", "Loaves"],
+    ])
+    blog = write_csv("blog.csv", [
+        ["Slug", "Title", "Date", "Category", "Summary", "ImageURL", "Content"],
+        ["hello", f"Hello {ATTACK}", "2026-01-01", f"News {ATTACK}", f"Sum {ATTACK}", "javascript:alert(1)",
+         f"Body {ATTACK} [click](javascript:alert(1)) ![i](javascript:alert(1))"],
+    ])
+    return lambda **kw: site(biz_name=f"Acme {ATTACK}", biz_addr=f"1 Road {ATTACK}", seo_d=f"Best {ATTACK}",
+                             faq_data=f"Is it safe {ATTACK}? ? Yes {ATTACK}", sheet_url=store, blog_sheet_url=blog, **kw)
+
+
+def pages(cfg):
+    html, _ = site_files(cfg)
+    return dict(html)
+
+
+def assert_escaped(html):
+    for name, doc in html.items():
+        assert "<script>alert(1)" not in doc, name
+        assert not re.search(r"""(?:href|src)=["']?\s*javascript:""", doc, re.I), name
+
+
+def test_standard_build_escapes_every_field(hostile):
+    html = pages(hostile())
+    assert_escaped(html)
+    assert ESCAPED in html["index.html"] and ESCAPED in html["blog.html"]
+    # The first blog page is baked in through the blog_card template
+    assert f"Hello &#34;&gt;{ESCAPED}" in html["blog.html"]
+
+
+def test_lite_build_escapes_every_field(hostile):
+    html = pages(hostile(lite=True))
+    assert_escaped(html)
+    post = html["post-hello.html"]
+    assert ESCAPED in post and "Body &quot;&gt;" + ESCAPED in post
+    product = next(doc for name, doc in html.items() if name.startswith("product-cake"))
+    assert ESCAPED in product and "https://buy.stripe.com" not in product
+
+
+def test_page_scripts_escape_feed_fields(hostile):
+    # Later blog pages and the post view are filled in by script from the JSON feed, which holds
+    # plain text: every field must go through esc() (p.html is Markdown rendered at build time)
+    html = pages(hostile())
+    for name in ("blog.html", "post.html"):
+        fields = re.findall(r"\$\{([^}]*\bp\.\w+[^}]*)\}", html[name])
+        assert fields, name
+        for expr in fields:
+            assert re.fullmatch(r"(esc|encodeURIComponent)\(p\.\w+\)|p\.html", expr.strip()), (name, expr)
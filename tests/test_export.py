@@ -0,0 +1,126 @@
+import io
+import os
+import random
+import tarfile
+import zipfile
+
+import pytest
+
+from titan.export import MARKER, ZIP_EPOCH, build_archive, build_tar, build_zip, export_path, publish_files, write_dir
+
+
+def site(seed=0):
+    # Enough semi-compressible text for the compression level to matter
+    rnd = random.Random(seed)
+    words = ["store", "price", "blog", "card", "section", "container", "grid", "button"]
+    page = lambda: "<html>" + " ".join(rnd.choice(words) + str(rnd.randint(0, 999)) for _ in range(20000)) + "</html>"
+    return [("index.html", page()), ("blog/feed-1.json", page()), ("about.html", page()), ("icon.bin", bytes(range(256)) * 8)]
+
+
+def test_zip_level_changes_output():
+    files = site()
+    sizes = {level: len(build_zip(files, level)) for level in (0, 1, 9)}
+    assert sizes[0] > sizes[1] > sizes[9]
+
+
+def test_zip_is_reproducible():
+    files = site()
+    assert build_zip(files, 6) == build_zip(list(reversed(files)), 6)
+
+
+def test_zip_entries_are_sorted_and_pinned():
+    with zipfile.ZipFile(io.BytesIO(build_zip(site()))) as zf:
+        infos = zf.infolist()
+        assert [i.filename for i in infos] == sorted(i.filename for i in infos)
+        assert {i.date_time for i in infos} == {(1980, 1, 1, 0, 0, 0)}
+        assert {i.external_attr >> 16 for i in infos} == {0o100644}
+        assert zf.read("icon.bin") == bytes(range(256)) * 8
+
+
+@pytest.mark.parametrize("compression", ["gz", "xz"])
+def test_tar_is_reproducible(compression):
+    files = site()
+    a = build_tar(files, compression, 6)
+    assert a == build_tar(list(reversed(files)), compression, 6)
+    assert len(build_tar(files, compression, 1)) != len(build_tar(files, compression, 9))
+    with tarfile.open(fileobj=io.BytesIO(a)) as tf:
+        members = tf.getmembers()
+        assert [m.name for m in members] == sorted(m.name for m in members)
+        assert {(m.mtime, m.mode, m.uid, m.uname) for m in members} == {(ZIP_EPOCH, 0o644, 0, "")}
+
+
+def test_source_date_epoch_is_used(monkeypatch):
+    files = site()
+    before = build_tar(files, "gz")
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", str(ZIP_EPOCH + 86400))
+    after = build_tar(files, "gz")
+    assert after != before
+    with tarfile.open(fileobj=io.BytesIO(after)) as tf:
+        assert tf.getmembers()[0].mtime == ZIP_EPOCH + 86400
+
+
+def test_later_duplicate_wins():
+    out = build_archive([("a.html", "old"), ("a.html", "new")], "zip")
+    with zipfile.ZipFile(io.BytesIO(out)) as zf:
+        assert zf.namelist() == ["a.html"] and zf.read("a.html") == b"new"
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        build_archive([], "rar")
+
+
+def test_write_dir_replaces_folder_and_publish_updates_in_place(tmp_path):
+    root = tmp_path / "site"
+    write_dir([("index.html", "one"), ("old.html", "x")], root)
+    write_dir([("index.html", "two"), ("blog/post.html", "p")], root)
+    assert sorted(os.listdir(root)) == [MARKER, "blog", "index.html"]
+    assert (root / "index.html").read_text() == "two"
+    assert os.stat(root / "index.html").st_mtime == ZIP_EPOCH
+
+    publish_files([("index.html", "three"), ("new.html", "n")], root, remove=["blog/post.html", "missing.html"])
+    assert (root / "index.html").read_text() == "three"
+    assert (root / "new.html").read_text() == "n"
+    assert not (root / "blog" / "post.html").exists()
+    assert not [n for n in os.listdir(root) if n.startswith(".titan-")]
+
+
+@pytest.mark.parametrize("name", ["", ".", "..", "../x", "site/../..", "a/../../b", "/tmp/site", "..\\x"])
+def test_export_path_stays_inside_the_base(tmp_path, name):
+    with pytest.raises(ValueError):
+        export_path(name, tmp_path / "dist")
+
+
+def test_export_path_resolves_inside_the_base(tmp_path):
+    base = tmp_path / "dist"
+    assert export_path("site", base) == str(base / "site")
+    assert export_path("a/./b", base) == str(base / "a" / "b")
+
+
+def test_export_path_refuses_symlinks_out(tmp_path):
+    base = tmp_path / "dist"
+    base.mkdir()
+    (base / "out").symlink_to(tmp_path)
+    (base / "in").symlink_to(base / "site")
+    for name in ("out", "out/site", "in"):
+        with pytest.raises(ValueError):
+            export_path(name, base)
+
+
+def test_write_dir_only_replaces_its_own_folders(tmp_path):
+    mine, theirs, empty = tmp_path / "mine", tmp_path / "theirs", tmp_path / "empty"
+    write_dir([("index.html", "one")], mine)
+    theirs.mkdir()
+    (theirs / "app.py").write_text("keep")
+    empty.mkdir()
+    (tmp_path / "file").write_text("keep")
+    (tmp_path / "link").symlink_to(mine)
+
+    write_dir([("index.html", "two")], mine)
+    write_dir([("index.html", "one")], empty)
+    assert (mine / "index.html").read_text() == "two" and (empty / MARKER).exists()
+    for root in (theirs, tmp_path / "file", tmp_path / "link"):
+        with pytest.raises(ValueError):
+            write_dir([("index.html", "x")], root)
+    assert (theirs / "app.py").read_text() == "keep" and (tmp_path / "file").read_text() == "keep"
+    assert (tmp_path / "link").is_symlink()
@@ -0,0 +1,87 @@
+import json
+import os
+import re
+
+import pytest
+
+from titan import host_config
+from titan.export import site_host_configs, write_dir
+from titan.host_config import DEFAULT_CACHE, cache_control, classify, host_configs, verify
+
+SPRITE = "icons-0a1b2c3d.svg"
+FILES = ["index.html", "about.html", "es/index.html", "es/about.html", SPRITE, "service-worker.js", "manifest.json",
+         "store-index.json", "blog/feed-1.json", "blog/posts/hello.json", "robots.txt"]
+LINKS = ["<https://fonts.gstatic.com>; rel=preconnect; crossorigin", "<https://fonts.googleapis.com/css2?family=Inter>; rel=preload; as=style"]
+INDEX_LINKS = ["<https://img.example.com/hero.jpg>; rel=preload; as=image; fetchpriority=high"]
+CLASSES = {"index.html": "html", "es/about.html": "html", SPRITE: "sprite", "service-worker.js": "service-worker",
+           "manifest.json": "manifest", "store-index.json": "data", "blog/posts/hello.json": "data", "robots.txt": None}
+
+
+@pytest.fixture
+def configs():
+    return dict(host_configs(FILES, LINKS, INDEX_LINKS))
+
+
+def served_path(f):
+    return "/" + f
+
+
+def nginx_headers(conf, path):
+    # location ~* blocks are tried in order and the first match wins, as in nginx
+    for rx, body in re.findall(r'location ~\* "([^"]+)" \{\n(.*?)\n\}', conf, re.S):
+        if re.search(rx, path, re.I):
+            return dict(re.findall(r'add_header (\S+) ["\'](.*?)["\'] always;', body))
+    return {}
+
+
+def htaccess_headers(conf, name):
+    # FilesMatch sees the file name only; later blocks override earlier ones
+    headers = dict(re.findall(r'^  Header set (\S+) "(.*?)"$', conf, re.M))
+    for rx, body in re.findall(r'<FilesMatch "([^"]+)">\n(.*?)\n  </FilesMatch>', conf, re.S):
+        if re.search(rx, name): headers.update(re.findall(r'Header set (\S+) "(.*?)"', body))
+    return headers
+
+
+def test_file_classes():
+    assert {f: classify(f) for f in CLASSES} == CLASSES
+    assert cache_control("robots.txt") == DEFAULT_CACHE
+
+
+def test_every_host_gives_each_file_its_class_header(configs):
+    netlify = dict(host_config.parse_headers_file(configs["_headers"]))
+    vercel = {r["source"]: {h["key"]: h["value"] for h in r["headers"]} for r in json.loads(configs["vercel.json"])["headers"]}
+    for f in FILES:
+        want, path = cache_control(f), served_path(f)
+        if f.startswith("blog/posts/"):
+            assert netlify["/blog/posts/*"] == [("Cache-Control", want)]
+            assert vercel["/blog/posts/(.*)"]["Cache-Control"] == want
+        else:
+            assert dict(netlify[path])["Cache-Control"] == want, f
+            assert vercel[path]["Cache-Control"] == want, f
+        assert nginx_headers(configs["nginx-titan.conf"], path)["Cache-Control"] == want, f
+        assert htaccess_headers(configs[".htaccess"], os.path.basename(f))["Cache-Control"] == want, f
+
+
+def test_index_pages_get_the_index_preloads(configs):
+    netlify = dict(host_config.parse_headers_file(configs["_headers"]))
+    assert "hero.jpg" in dict(netlify["/"])["Link"] and "hero.jpg" in dict(netlify["/es/"])["Link"]
+    assert "hero.jpg" not in dict(netlify["/about.html"])["Link"]
+    assert "hero.jpg" in nginx_headers(configs["nginx-titan.conf"], "/es/")["Link"]
+    assert "hero.jpg" in htaccess_headers(configs[".htaccess"], "index.html")["Link"]
+
+
+def test_verify_serves_a_build_with_matching_headers(tmp_path, configs):
+    files = [(f, "x" * 300) for f in FILES] + list(configs.items())
+    root = write_dir(files, tmp_path / "site")
+    assert verify(root) == []
+    # A header file that disagrees is reported
+    with open(os.path.join(root, "_headers"), "a") as f: f.write("\n/robots.txt\n  Cache-Control: no-store\n")
+    assert verify(root) == [("robots.txt", f"Cache-Control {DEFAULT_CACHE + ', no-store'!r}, expected {DEFAULT_CACHE!r}")]
+
+
+def test_site_links_do_not_preload_the_sprite(site):
+    cfg = site(show_hero=True, hero_img_1="https://img.example.com/hero.jpg")
+    netlify = dict(host_config.parse_headers_file(dict(site_host_configs(cfg, FILES))["_headers"]))
+    link = dict(netlify["/"])["Link"]
+    assert "rel=preload; as=style" in link and "hero.jpg" in link
+    assert "icons-" not in link
@@ -0,0 +1,62 @@
+import http.client
+import io
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from titan.http_util import BodyError, read_body
+
+
+def handler(length, body=b""):
+    headers = {} if length is None else {"Content-Length": length}
+    return SimpleNamespace(headers=headers, rfile=io.BytesIO(body), close_connection=False)
+
+
+def test_body_within_the_limit_is_read():
+    h = handler("5", b"hello, and more")
+    assert read_body(h, 5) == b"hello" and not h.close_connection
+
+
+@pytest.mark.parametrize("length, status", [(None, 400), ("", 400), ("abc", 400), ("-1", 400), ("0", 400), ("1.5", 400),
+                                            ("6", 413), ("99999999999999", 413)])
+def test_bad_lengths_are_refused_unread(length, status):
+    h = handler(length, b"hello!")
+    with pytest.raises(BodyError) as e:
+        read_body(h, 5)
+    assert e.value.status == status and h.close_connection and h.rfile.tell() == 0
+
+
+def test_refused_request_closes_the_connection():
+    class Echo(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            try: body, status = read_body(self, 5), 200
+            except BodyError as e: body, status = b"", e.status
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Echo)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+        conn.request("POST", "/", b"hi")
+        resp = conn.getresponse()
+        assert (resp.status, resp.read(), resp.will_close) == (200, b"hi", False)
+        conn.close()
+        # The server hangs up after the refusal instead of reading the unread body as a request
+        with socket.create_connection(("127.0.0.1", server.server_port), timeout=5) as sock:
+            sock.sendall(b"POST / HTTP/1.1\r\nHost: x\r\nContent-Length: 8\r\n\r\ntoo long")
+            data = b""
+            while chunk := sock.recv(4096): data += chunk
+        assert data.startswith(b"HTTP/1.1 413")
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,48 @@
+import re
+
+import pytest
+
+from titan.icons import ICON_ALIASES, ICONS, icon_sprite, icon_svg, preview_icon_sprite, resolve_icon
+
+
+@pytest.mark.parametrize("name, icon", [
+    ("shield", "shield"),
+    ("  Shield ", "shield"),
+    ("fa-shield", "shield"),
+    ("mdi-Home", "home"),
+    ("pricing", "wallet"),
+    ("twitter", "x"),
+    # One known word is enough, in order
+    ("Lightning Fast", "bolt"),
+    ("Spreadsheet sync", "table"),
+    ("eco friendly", "leaf"),
+    # Typos and near misses from AI-written feature lists
+    ("secruity", "shield"),
+    ("analytic", "chart"),
+    ("shopp", "cart"),
+])
+def test_resolve_icon(name, icon):
+    assert resolve_icon(name) == icon
+
+
+@pytest.mark.parametrize("name", ["unicorn", "icon-rocket", "", "???"])
+def test_unknown_names_fall_back_to_check(name):
+    assert resolve_icon(name) == "check"
+
+
+def test_every_alias_points_at_a_real_icon():
+    assert set(ICON_ALIASES.values()) <= set(ICONS)
+    assert not set(ICON_ALIASES) & set(ICONS)
+
+
+def test_sprite_name_follows_its_content():
+    sprite_file, svg = icon_sprite()
+    assert re.fullmatch(r"icons-[0-9a-f]{8}\.svg", sprite_file)
+    assert set(re.findall(r'<symbol id="i-([a-z]+)"', svg)) == set(ICONS)
+    assert icon_svg("fast", size=32) == f'<svg width="32" height="32" fill="currentColor" aria-hidden="true"><use href="{sprite_file}#i-bolt"/></svg>'
+
+
+def test_preview_points_at_an_inline_sprite():
+    body = preview_icon_sprite([("features", icon_svg("star"))])
+    assert body[0][0] == "sprite" and body[0][1].startswith('<svg width="0" height="0"')
+    assert '<use href="#i-star"/>' in body[1][1]
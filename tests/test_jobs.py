@@ -0,0 +1,73 @@
+import threading
+from types import SimpleNamespace
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from titan import jobs
+from titan.cache import _handles, shared_cache
+from titan.content import sheet_source
+
+
+def result(blocked=False):
+    return SimpleNamespace(blocked=blocked)
+
+
+def wait(job):
+    for _ in range(200):
+        if not job.active: return job
+        threading.Event().wait(0.01)
+    raise AssertionError(f"job still {job.state}")
+
+
+def test_worker_gets_the_submitting_threads_handles(monkeypatch):
+    pool = jobs.ExportJobs(workers=1)
+    cache, source = object(), object()
+    monkeypatch.setattr(jobs, "shared_cache", lambda: cache)
+    monkeypatch.setattr(jobs, "sheet_source", lambda: source)
+    seen = []
+    def run(job):
+        seen.append((threading.current_thread(), shared_cache(), sheet_source(), get_script_run_ctx(suppress_warning=True)))
+        return result()
+    wait(pool.submit("a", run))
+    (thread, c, s, ctx), = seen
+    assert c is cache and s is source and thread is not threading.main_thread()
+    # No Streamlit context is lent to the worker, and nothing stays bound after the job
+    assert ctx is None
+    assert pool.pool.submit(lambda: vars(_handles)).result() == {}
+
+
+def test_states_and_progress():
+    pool = jobs.ExportJobs(workers=1)
+    def run(job):
+        job.total = 4
+        for label in "ab": job.step(label)
+        return result()
+    job = wait(pool.submit("k", run))
+    assert (job.state, job.done, job.current, job.progress) == ("done", 2, "b", 0.5)
+    assert wait(pool.submit("blocked", lambda j: result(True))).state == "blocked"
+    failed = wait(pool.submit("boom", lambda j: 1 / 0))
+    assert failed.state == "failed" and failed.error.startswith("ZeroDivisionError")
+
+
+def test_cancel_between_steps_and_join_running_job():
+    pool = jobs.ExportJobs(workers=1)
+    started, release = threading.Event(), threading.Event()
+    def run(job):
+        job.step("first")
+        started.set()
+        release.wait(5)
+        job.step("second")
+        return result()
+    job = pool.submit("k", run)
+    started.wait(5)
+    assert pool.submit("k", run) is job
+    job.cancel()
+    release.set()
+    assert wait(job).state == "cancelled" and job.done == 1
+
+
+def test_finished_jobs_are_pruned():
+    pool = jobs.ExportJobs(workers=1, keep=2)
+    ids = [wait(pool.submit(str(n), lambda j: result())).id for n in range(4)]
+    pool.submit("last", lambda j: result())
+    assert pool.get(ids[0]) is None and pool.get(ids[-1]) is not None
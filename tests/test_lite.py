@@ -0,0 +1,59 @@
+import re
+
+import pytest
+
+from titan.export import site_files
+from titan.generators import product_pages
+
+# JSON-LD and speculation rules are data for the browser, not script that runs
+DATA_SCRIPTS = ("application/ld+json", "speculationrules")
+
+
+@pytest.fixture
+def lite(site, write_csv):
+    store = write_csv("store.csv", [
+        ["Name", "Price", "Description", "ImageURL", "StripeLink", "Category"],
+        ["Cake", "$5", "Sponge", "https://img.example.com/cake.jpg", "", "Treats"],
+        ["Cake!", "$6", "Another sponge", "", "https://buy.stripe.com/x", "Treats"],
+        ["Sourdough Loaf", "$3", "Bread", "", "", "Bread"],
+    ])
+    blog = write_csv("blog.csv", [
+        ["Slug", "Title", "Date", "Category", "Summary", "ImageURL", "Content"],
+        ["hello-world", "Hello", "2026-01-01", "News", "First", "", "First **post**"],
+        ["Second Post", "Second", "2026-01-02", "News", "", "", "Second post"],
+    ])
+    # The booking embed is the user's own widget markup and may carry its script; not ours to drop
+    return site(lite=True, rum_on=False, show_blog=True, show_inventory=True, sheet_url=store, blog_sheet_url=blog,
+                booking_embed='<iframe src="https://calendly.com/acme"></iframe>')
+
+
+def test_one_static_page_per_product_and_post(lite):
+    pages, assets = site_files(lite)
+    names = {f for f, _ in pages}
+    assert [f for f, _ in product_pages(lite)] == ["product-cake.html", "product-cake-2.html", "product-sourdough-loaf.html"]
+    assert {f for f in names if f.startswith("product")} == {"product-cake.html", "product-cake-2.html", "product-sourdough-loaf.html"}
+    assert {f for f in names if f.startswith("post")} == {"post-hello-world.html", "post-second-post.html"}
+    # Nothing is rendered at runtime: no query-string detail pages, feeds or service worker
+    assert not {f for f, _ in assets} & {"service-worker.js", "store-index.json"}
+    assert not any(f.startswith("blog/") for f, _ in assets)
+
+
+def test_lite_pages_run_no_script(lite):
+    pages, _ = site_files(lite)
+    for name, doc in pages:
+        for attrs in re.findall(r"<script\b([^>]*)>", doc, re.I):
+            assert any(t in attrs for t in DATA_SCRIPTS), (name, attrs)
+        assert not re.search(r"\son[a-z]+=", doc, re.I), name
+
+
+def test_index_pages_link_to_the_static_files(lite):
+    pages = dict(site_files(lite)[0])
+    for f in ("product-cake.html", "product-cake-2.html", "product-sourdough-loaf.html"):
+        assert f'href="{f}"' in pages["index.html"]
+    for f in ("post-hello-world.html", "post-second-post.html"):
+        assert f'href="{f}"' in pages["blog.html"]
+    # Every internal page link resolves to a file of the build
+    for name, doc in pages.items():
+        for href in re.findall(r'href="([a-z0-9-]+\.html)[?#"]', doc):
+            assert href in pages, (name, href)
+    assert "<strong>post</strong>" in pages["post-hello-world.html"]
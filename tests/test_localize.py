@@ -0,0 +1,80 @@
+import re
+
+import pytest
+
+from titan.content import _T_NODE, _T_PAGE_LINK, localize_site, translate_html
+from titan.export import site_files
+
+
+@pytest.fixture
+def multilang(site, write_csv):
+    strings = write_csv("strings.csv", [
+        ["ElementID", "TranslatedText", "Lang"],
+        ["nav.home", "Inicio", "es"],
+        ["hero.title", "Hola <mundo>", "es"],
+        ["page.about.body", "Somos **locales**", "es"],
+        ["nav.home", "Accueil", "fr"],
+    ])
+    # de has no strings and gets no folder
+    return site(lang_list="es, fr, de, en", lang_sheet=strings, rum_on=False)
+
+
+def test_each_language_gets_a_folder_of_every_page(multilang):
+    files = dict(site_files(multilang)[0])
+    base = [f for f in files if "/" not in f]
+    assert "index.html" in base and "about.html" in base
+    for lang in ("es", "fr"):
+        assert {f"{lang}/{f}" for f in base} <= set(files)
+    assert not any(f.startswith(("de/", "en/")) for f in files)
+
+
+def test_translated_page_swaps_text_and_falls_back_to_english(multilang):
+    files = dict(site_files(multilang)[0])
+    es = files["es/index.html"]
+    assert '<html lang="es">' in es and '<head>\n<base href="../">' in es
+    assert re.search(r'data-t="nav.home">Inicio</a>', es)
+    # Span-like nodes are escaped, not parsed as markup
+    assert "Hola &lt;mundo&gt;" in es and "<mundo>" not in es
+    # No es string for nav.contact: the English text stays
+    assert re.search(r'data-t="nav.contact">Contact</a>', es)
+    assert re.search(r'data-t="nav.home">Accueil</a>', files["fr/index.html"])
+    # The base page is untouched apart from the language links
+    assert re.search(r'data-t="nav.home">Home</a>', files["index.html"])
+    assert "<base " not in files["index.html"]
+
+
+def test_translated_page_links_stay_in_the_language_folder(multilang):
+    es = dict(site_files(multilang)[0])["es/index.html"]
+    hrefs = re.findall(r'<a href="([^"]+)"', es)
+    assert "es/contact.html" in hrefs and "contact.html" not in hrefs
+    assert "es/index.html#features" in hrefs
+    # Shared assets are not rewritten; <base href="../"> resolves them at the root
+    assert 'href="manifest.json"' in es
+    alternates = re.findall(r'<link rel="alternate" hreflang="([^"]+)"', es)
+    assert alternates == ["en", "es", "fr", "x-default"]
+    switch = re.search(r'<span class="lang-switch">(.*?)</span>', es, re.S).group(1)
+    assert 'href="index.html" hreflang="en"' in switch and 'href="fr/index.html" hreflang="fr"' in switch
+
+
+def test_div_nodes_get_markdown_and_other_nodes_plain_text():
+    page = '<div class="x" data-t="page.about.body">Old</div><h3 data-t="t">Old <b>x</b></h3><p data-t="gone">Keep</p>'
+    out = translate_html(page, {"page.about.body": "Somos **locales**", "t": "A & B"})
+    assert "<strong>locales</strong>" in out
+    assert '<h3 data-t="t">A &amp; B</h3>' in out
+    assert '<p data-t="gone">Keep</p>' in out
+
+
+def test_node_and_link_patterns():
+    m = _T_NODE.search('<a href="index.html" data-t="nav.home">Home</a>')
+    assert m.group(2, 3, 4) == ("a", "nav.home", "Home")
+    # A nested element of another tag does not end the node early
+    m = _T_NODE.search('<div data-t="d"><p>a</p><p>b</p></div>')
+    assert m.group(4) == "<p>a</p><p>b</p>"
+    links = 'href="product-cake.html" href="post-hello.html" href="#" href="style.css" href="https://x.com/index.html" href="feed.xml"'
+    assert [m.group(1) for m in _T_PAGE_LINK.finditer(links)] == ["product-cake.html", "post-hello.html", "#"]
+
+
+def test_no_strings_means_no_translated_copies(site):
+    cfg = site(lang_list="es", lang_sheet="")
+    pages = [("index.html", "<html><head></head><body></body></html>")]
+    assert localize_site(cfg, pages) == pages
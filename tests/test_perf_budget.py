@@ -0,0 +1,78 @@
+import pytest
+
+from titan.export import _build_export, export_site
+from titan.jobs import ExportJob
+from titan.perf_budget import BUDGETS, analyze, measure, over_budget
+
+PAGE = """<!DOCTYPE html>
+<html><head>
+<link rel="stylesheet" href="style.css">
+<link rel="stylesheet" href="print.css" media="print">
+<link rel="stylesheet" href="https://fonts.example.com/css">
+<script src="https://cdn.example.com/lib.js"></script>
+<script src="app.js" defer></script>
+<style>.hero { background: url('https://img.example.com/bg.jpg') }</style>
+</head><body>
+<img src="https://acme.example.com/logo.png">
+<img src="https://img.example.com/a.jpg" srcset="https://img.example.com/a-400.jpg 400w, x.jpg 800w">
+<img src="data:image/png;base64,AAAA">
+<svg viewBox="0 0 1 1"><path d="M0 0"/></svg>
+<script>console.log("hi")</script>
+</body></html>"""
+
+
+def test_analyze_counts_what_the_browser_waits_for():
+    s = analyze(PAGE, "https://acme.example.com")
+    # Two stylesheets in the head (not the print one) and the one sync script
+    assert s.render_blocking == 3
+    # The site's own origin is not a third party
+    assert s.third_party == ("https://cdn.example.com", "https://fonts.example.com", "https://img.example.com")
+    assert s.images == ("https://img.example.com/bg.jpg", "https://acme.example.com/logo.png",
+                        "https://img.example.com/a.jpg", "https://img.example.com/a-400.jpg")
+    assert s.inline_js == len('console.log("hi")')
+    assert s.inline_image == len("data:image/png;base64,AAAA") + len('<svg viewBox="0 0 1 1"><path d="M0 0"/>')
+    assert s.bytes == len(PAGE.encode())
+    assert s.dom_nodes == 15
+
+
+def test_measure_uses_budget_units_and_optional_image_sizes():
+    s = analyze(PAGE, "https://acme.example.com")
+    values = measure(s)
+    assert set(values) == set(BUDGETS)
+    assert values["third_party"] == 3 and values["render_blocking"] == 3
+    assert values["image_kb"] == round(s.inline_image / 1024, 1)
+    # Unknown sizes count as zero
+    sized = measure(s, {"https://img.example.com/a.jpg": 300 * 1024, "https://img.example.com/bg.jpg": None})
+    assert sized["image_kb"] == round((300 * 1024 + s.inline_image) / 1024, 1)
+
+
+def test_over_budget_lists_only_exceeded_metrics():
+    values = {"page_kb": 151, "render_blocking": 3, "dom_nodes": 10, "third_party": 9}
+    budgets = {"page_kb": 150, "render_blocking": 3, "dom_nodes": 5, "third_party": None}
+    assert over_budget(values, budgets) == [("page_kb", 151, 150), ("dom_nodes", 10, 5)]
+
+
+@pytest.fixture
+def strict(site, tmp_path):
+    # Every page is over a one-node DOM budget
+    budgets = {m: default for m, (_, default) in BUDGETS.items()}
+    return lambda mode, **settings: site(budgets={**budgets, "dom_nodes": 1}, budget_mode=mode, budget_images=False,
+                                         rum_on=False, **settings)
+
+
+def test_block_download_stops_the_export(strict, tmp_path, monkeypatch):
+    cfg = strict("Block download", archive_format="zip")
+    result = _build_export(cfg, ExportJob("k"))
+    assert result.blocked and result.archive == b""
+    assert {f for f, m, _, _ in result.over if m == "dom_nodes"} >= {"index.html", "about.html"}
+    assert all(b == 1 for _, m, _, b in result.over if m == "dom_nodes")
+    # Nothing is written for a blocked directory export either
+    monkeypatch.chdir(tmp_path)
+    assert _build_export(strict("Block download", archive_format="dir", export_dir="site"), ExportJob("k")).blocked
+    assert not (tmp_path / "dist" / "site").exists()
+
+
+def test_warn_mode_still_builds_the_archive(strict):
+    result = export_site(strict("Warn", archive_format="zip"), ExportJob("k"))
+    assert not result.blocked and result.archive[:2] == b"PK"
+    assert result.over and {r["Page"] for r in result.report} >= {"index.html", "about.html"}
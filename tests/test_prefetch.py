@@ -0,0 +1,54 @@
+import json
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from titan.generators import PREFETCH_PAGES, gen_prefetch
+
+MODES = {"pages": "Prerender", "product": "Prefetch", "post": "Prefetch"}
+
+
+def rules(markup):
+    m = re.search(r'<script type="speculationrules">(.*?)</script>', markup, re.S)
+    return json.loads(m.group(1))
+
+
+@pytest.mark.parametrize("eagerness", ["conservative", "moderate", "eager"])
+def test_rules_are_valid_json_with_the_chosen_eagerness(site, eagerness):
+    spec = rules(gen_prefetch(site(prefetch_modes=MODES, prefetch_eagerness=eagerness)))
+    assert set(spec) == {"prerender", "prefetch"}
+    assert {r["eagerness"] for group in spec.values() for r in group} == {eagerness}
+    assert {r["source"] for group in spec.values() for r in group} == {"document"}
+    pages, = spec["prerender"]
+    assert [p["href_matches"]["pathname"] for p in pages["where"]["or"]] == [f"*/{p}" for p in PREFETCH_PAGES]
+    assert [r["where"] for r in spec["prefetch"]] == [{"href_matches": {"pathname": "*/product.html"}},
+                                                       {"href_matches": {"pathname": "*/post.html"}}]
+
+
+def test_off_types_are_left_out(site):
+    spec = rules(gen_prefetch(site(prefetch_modes={**MODES, "post": "Off", "product": "Off"})))
+    assert list(spec) == ["prerender"]
+    assert gen_prefetch(site(prefetch_modes={t: "Off" for t in MODES})) == ""
+
+
+def test_a_new_eagerness_is_not_served_from_the_cache(site):
+    first = gen_prefetch(site(prefetch_modes=MODES, prefetch_eagerness="eager"))
+    second = gen_prefetch(site(prefetch_modes=MODES, prefetch_eagerness="conservative"))
+    assert '"eager"' in first and '"eager"' not in second
+
+
+def test_lite_pages_keep_only_the_rules(site):
+    markup = gen_prefetch(site(prefetch_modes=MODES, lite=True))
+    assert markup.count("<script") == 1
+    paths = [r["where"]["href_matches"]["pathname"] for r in rules(markup)["prefetch"]]
+    assert paths == ["*/product-*.html", "*/post-*.html"]
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="needs node")
+def test_fallback_script_parses(site):
+    markup = gen_prefetch(site(prefetch_modes=MODES))
+    body = re.findall(r"<script>(.*?)</script>", markup, re.S)[0]
+    subprocess.run(["node", "--check", "-"], input=body, text=True, capture_output=True, timeout=10, check=True)
+    assert 'types = ["pages", "product", "post"]' in body
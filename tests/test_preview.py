@@ -0,0 +1,120 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from titan import preview
+from titan.theme import ROOT_DIR
+from titan.preview_server import PreviewServer
+
+
+@pytest.fixture
+def server():
+    srv = PreviewServer()
+    yield srv
+    srv.stop()
+
+
+def as_session(monkeypatch, name):
+    monkeypatch.setattr(preview, "session_id", lambda: name)
+
+
+def test_running_server_belongs_to_the_session_that_started_it(server, monkeypatch):
+    as_session(monkeypatch, "a")
+    assert preview.owns_server(server) and preview.start_server(server, 0)
+    as_session(monkeypatch, "b")
+    assert not preview.owns_server(server)
+    assert not preview.start_server(server, 0)
+    as_session(monkeypatch, "a")
+    assert preview.owns_server(server)
+    preview.stop_server(server)
+    as_session(monkeypatch, "b")
+    assert preview.owns_server(server) and preview.start_server(server, 0)
+    assert server.owner[0] == "b"
+
+
+def test_idle_owner_can_be_taken_over(server, monkeypatch):
+    as_session(monkeypatch, "a")
+    preview.start_server(server, 0)
+    server.owner = ("a", server.owner[1] - preview.OWNER_IDLE - 1)
+    as_session(monkeypatch, "b")
+    assert preview.owns_server(server) and server.owner[0] == "b"
+
+
+def _preview_script():
+    import streamlit as st
+    from titan.config import SiteConfig
+    from titan.preview import live_preview
+    if st.session_state.get("paused"): st.session_state.pop("_lp_state", None)
+    else: live_preview(SiteConfig(**st.session_state["cfg"]), "index.html", "Home", [("hero", f"<section>{st.session_state['text']}</section>")])
+
+
+@pytest.fixture
+def rerun(defaults, monkeypatch):
+    # -> run(**state) -> the payload the component got on that rerun
+    sent = []
+    monkeypatch.setattr(preview, "_live_preview", lambda payload, **kw: sent.append(payload))
+    at = AppTest.from_function(_preview_script, default_timeout=60)
+    at.session_state["cfg"], at.session_state["text"] = defaults, "Hello"
+    def run(**state):
+        for k, v in state.items(): at.session_state[k] = v
+        at.run()
+        assert not at.exception
+        return sent[-1] if sent else None
+    return run
+
+
+def test_unchanged_rerun_sends_only_a_digest(rerun):
+    first = rerun()
+    assert first["mode"] == "full" and "Hello" in first["doc"]
+    same = rerun()
+    assert same.keys() == {"mode", "rev", "page", "digest"}
+    assert same["mode"] == "same" and same["rev"] == first["rev"]
+    # Identical args on every idle rerun, so the component has nothing to update
+    assert rerun() == same
+    patch = rerun(text="Hola")
+    assert patch["mode"] == "patch" and patch["base"] == first["rev"] and "Hola" in patch["sections"]["hero"]
+    again = rerun()
+    assert again["mode"] == "same" and again["rev"] == patch["rev"] and again["digest"] != same["digest"]
+
+
+def test_fresh_iframe_gets_a_full_document(rerun):
+    rerun()
+    # Paused: the iframe is gone, so the next render ships the whole page
+    rerun(paused=True)
+    assert rerun(paused=False)["mode"] == "full"
+    # A remounted iframe that only saw a digest asks for a resync
+    assert rerun()["mode"] == "same"
+    assert rerun(titan_live_preview={"resync": "r1"})["mode"] == "full"
+    assert rerun()["mode"] == "same"
+
+
+COMPONENT_HARNESS = """
+var sent = [], listener = null;
+var iframe = {contentWindow: null, contentDocument: null, srcdoc: null};
+var document = {getElementById: function () { return iframe; }};
+var window = {parent: {postMessage: function (m) { sent.push(m.type); }},
+              addEventListener: function (t, f) { listener = f; }};
+%s
+function render(p) { sent = []; listener({data: {type: 'streamlit:render', args: {payload: p, height: 600}}}); return sent; }
+var out = [];
+out.push(render({mode: 'same', rev: 3, page: 'index.html', digest: 'd'}));                  // remounted: resync
+out.push(render({mode: 'full', rev: 4, page: 'index.html', doc: '<p>hi</p>'}).concat([iframe.srcdoc]));
+out.push(render({mode: 'same', rev: 4, page: 'index.html', digest: 'd'}));                  // idle rerun
+console.log(JSON.stringify(out));
+"""
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="needs node")
+def test_component_ignores_a_digest_it_already_shows():
+    page = open(os.path.join(ROOT_DIR, "components", "live_preview", "index.html"), encoding="utf-8").read()
+    body = re.search(r"<script>(.*?)</script>", page, re.S).group(1)
+    out = subprocess.run(["node", "-e", COMPONENT_HARNESS % body], capture_output=True, text=True, timeout=10, check=True)
+    remounted, full, idle = json.loads(out.stdout)
+    assert remounted == ["streamlit:setFrameHeight", "streamlit:setComponentValue"]
+    assert full == ["<p>hi</p>"]
+    assert idle == []
@@ -0,0 +1,114 @@
+import http.client
+import json
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from titan.preview_server import CLIENT, MAX_ENTRIES, PROFILES, PreviewServer, Profile, request_kind
+
+
+@pytest.fixture(scope="module")
+def running():
+    srv = PreviewServer().start(port=0)
+    yield srv
+    srv.stop()
+
+
+@pytest.fixture
+def server(running):
+    running.loads.clear()
+    running.profile = PROFILES["Off"]
+    running.publish([])
+    return running
+
+
+def request(srv, method, path, body=b"", length=None):
+    conn = http.client.HTTPConnection(*srv.httpd.server_address[:2], timeout=5)
+    conn.putrequest(method, path)
+    if method == "POST":
+        conn.putheader("Content-Length", str(len(body)) if length is None else length)
+    conn.endheaders()
+    if body: conn.send(body)
+    resp = conn.getresponse()
+    data = resp.read()
+    conn.close()
+    return resp.status, data
+
+
+def beacon():
+    return json.dumps({"page": "/index.html", "fcp": 120, "lcp": 300, "nav": {"url": "http://x/index.html", "start": 0, "end": 50},
+                       "resources": [{"url": "http://x/icons-0a1b2c3d.svg", "type": "img", "start": 60, "end": 90, "bytes": 900}]}).encode()
+
+
+def test_timing_beacon_is_recorded(server):
+    assert request(server, "POST", "/__titan/timing", beacon())[0] == 204
+    (load,) = server.loads
+    assert [e["kind"] for e in load["entries"]] == ["html", "image"]
+    assert load["metrics"]["lcp"] == 300
+
+
+def test_unknown_post_path(server):
+    assert request(server, "POST", "/other", b"{}")[0] == 404
+
+
+def test_publish_serves_and_reports_changes(server):
+    assert server.publish([("index.html", "<html><head></head><body>a</body></html>"), ("data.json", "{}")]) == ["/data.json", "/index.html"]
+    assert server.publish([("index.html", "<html><head></head><body>a</body></html>"), ("data.json", '{"a":1}')]) == ["/data.json"]
+    status, body = request(server, "GET", "/")
+    assert status == 200 and b"<body>a" in body and b"/__titan/events" in body
+    assert request(server, "GET", "/data.json") == (200, b'{"a":1}')
+    assert request(server, "GET", "/missing.html")[0] == 404
+
+
+def test_latency_is_applied(server):
+    server.publish([("data.json", "{}")])
+    server.profile = Profile(200, 0, 1)
+    t0 = time.perf_counter()
+    request(server, "GET", "/data.json")
+    assert time.perf_counter() - t0 >= 0.2
+
+
+@pytest.mark.parametrize("url, initiator, kind", [
+    ("http://x/page.html", "navigation", "html"),
+    ("https://fonts.gstatic.com/s/inter.woff2", "css", "font"),
+    ("http://x/store-index.json", "fetch", "data"),
+])
+def test_request_kind(url, initiator, kind):
+    assert request_kind(url, initiator) == kind
+
+
+# The page client run in node against a fake clock: the long task reported for a stretch
+# (the observer's own callback) must not be stretched again
+STRETCH_HARNESS = """
+var clock = 0, observers = {};
+global.window = global;
+global.performance = {now: function () { return clock += 1; }, getEntriesByType: function () { return []; }, getEntriesByName: function () { return []; }};
+global.PerformanceObserver = function (cb) { this.observe = function (o) { observers[o.type] = cb; }; };
+global.addEventListener = function () {};
+global.location = {pathname: '/index.html'};
+global.EventSource = function () {};
+%s
+function task(start, duration) {
+  // -> [start, end] of the observer callback that handled it
+  clock = Math.max(clock, start + duration);
+  var t0 = clock;
+  observers.longtask({getEntries: function () { return [{startTime: start, duration: duration}]; }});
+  return [t0, clock];
+}
+var first = task(1000, 100);                        // a real 100 ms task, stretched 3x
+var again = task(first[0], first[1] - first[0]);    // the browser reports the stretch itself
+var later = task(again[1] + 1000, 60);              // a later real task is stretched as usual
+console.log(JSON.stringify([first, again, later].map(function (r) { return r[1] - r[0]; })));
+"""
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="needs node")
+def test_client_does_not_stretch_its_own_stretch():
+    script = CLIENT % {"rev": 1, "cpu": 4, "max_entries": MAX_ENTRIES}
+    body = script.removeprefix("<script>").removesuffix("</script>")
+    out = subprocess.run(["node", "-e", STRETCH_HARNESS % body], capture_output=True, text=True, timeout=10, check=True)
+    first, again, later = json.loads(out.stdout)
+    assert first >= 300 and later >= 180
+    assert again < 5
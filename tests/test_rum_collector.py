@@ -0,0 +1,50 @@
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from titan import rum_collector
+
+
+@pytest.fixture
+def collector(tmp_path):
+    store = rum_collector.JsonlStore(str(tmp_path / "rum.jsonl"))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), rum_collector.make_handler(store))
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    def post(body=b"", length=None, path="/rum"):
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+        conn.putrequest("POST", path)
+        conn.putheader("Content-Type", "text/plain")
+        conn.putheader("Content-Length", str(len(body)) if length is None else length)
+        conn.endheaders()
+        if body: conn.send(body)
+        status = conn.getresponse().status
+        conn.close()
+        return status
+    yield post, store
+    server.shutdown()
+    server.server_close()
+
+
+def test_valid_beacon_is_stored(collector):
+    post, store = collector
+    assert post(json.dumps({"site": "shop", "page": "/", "lcp": 1234.56, "cls": 0.12345, "inp": "x"}).encode()) == 204
+    (sample,) = store.samples()
+    assert (sample["site"], sample["lcp"], sample["cls"]) == ("shop", 1234.6, 0.1235)
+    assert "inp" not in sample
+
+
+def test_wrong_path_and_bad_payloads(collector):
+    post, store = collector
+    assert post(b'{"site": "x"}', path="/other") == 404
+    assert post(b"not json") == 400
+    assert post(b'{"page": "/"}') == 400
+    assert list(store.samples()) == []
+
+
+def test_aggregate_percentiles():
+    samples = [{"site": "s", "page": "/", "lcp": float(v)} for v in range(1, 101)]
+    (row,) = rum_collector.aggregate(samples)
+    assert (row["Samples"], row["LCP p50"], row["LCP p75"], row["LCP p95"]) == (100, 50.0, 75.0, 95.0)
@@ -0,0 +1,135 @@
+import logging
+import os
+import threading
+import time
+
+import pytest
+
+from titan import cache, content, sheet_watcher
+from titan.content import sheet_source
+from titan.generators import site_pages
+from titan.sheet_watcher import BLOG_PAGES, STORE_PAGES, Site, dirty_pages, main, row_digests
+
+OLD = {"product-1.html": b"a", "product-2.html": b"b", "post-hello.html": b"c",
+       "product.html": b"o1", "post.html": b"o2"}
+
+
+def test_no_change_is_clean():
+    assert dirty_pages(OLD, dict(OLD)) == set()
+
+
+def test_changed_product_renders_its_page_and_the_store():
+    new = dict(OLD, **{"product-2.html": b"x"})
+    assert dirty_pages(OLD, new) == {"product-2.html", *STORE_PAGES}
+
+
+def test_changed_post_renders_its_page_and_the_blog():
+    new = dict(OLD, **{"post-hello.html": b"x"})
+    assert dirty_pages(OLD, new) == {"post-hello.html", *BLOG_PAGES}
+
+
+def test_added_and_removed_rows_are_dirty():
+    new = dict(OLD, **{"product-3.html": b"d"})
+    del new["post-hello.html"]
+    assert dirty_pages(OLD, new) == {"product-3.html", "post-hello.html", *STORE_PAGES, *BLOG_PAGES}
+
+
+def test_reorder_renders_the_index_pages_only():
+    new = dict(OLD, **{"product.html": b"o3"})
+    assert dirty_pages(OLD, new) == set(STORE_PAGES)
+
+
+STORE = [["Name", "Price", "Description", "ImageURL", "StripeLink", "Category"],
+         ["Cake", "$5", "Sponge", "", "", "Treats"], ["Bread", "$3", "Loaf", "", "", "Bread"]]
+BLOG = [["Slug", "Title", "Date", "Category", "Summary", "ImageURL", "Content"],
+        ["hello", "Hello", "2026-01-01", "News", "First", "", "First post"]]
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    # Titles of the pages the watcher renders
+    titles = []
+    build = sheet_watcher.build_page
+    monkeypatch.setattr(sheet_watcher, "build_page", lambda cfg, title, body: titles.append(title) or build(cfg, title, body))
+    return titles
+
+
+@pytest.fixture
+def watched(site, write_csv, tmp_path):
+    # -> (make(**settings) -> Site, edit(name, rows), round() -> published paths of the last site)
+    sites = []
+    def make(**settings):
+        cfg = site(show_inventory=True, show_blog=True, rum_on=False, sheet_url=write_csv("store.csv", STORE),
+                   blog_sheet_url=write_csv("blog.csv", BLOG), **settings)
+        path = tmp_path / f"site{len(sites)}.json"
+        path.write_text(cfg.to_json(), encoding="utf-8")
+        sites.append(Site(str(path), str(tmp_path / "out" / path.stem)))
+        return sites[-1]
+    def edit(name, rows):
+        path = write_csv(name, rows)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    def round_():
+        got = sheet_source().fetch_all([u for s in sites for u in s.urls])
+        return sites[-1].update({u: got[u].version for u in sites[-1].urls})
+    return make, edit, round_
+
+
+def test_row_digests_key_the_pages_each_mode_builds(watched):
+    make, _, _ = watched
+    for lite in (False, True):
+        cfg = make(lite=lite).cfg
+        assert set(row_digests(cfg)) - {"product.html", "post.html"} <= {f for f, _, _ in site_pages(cfg)}
+    assert set(row_digests(make(lite=False).cfg)) == {"blog.html", "post.html"}
+
+
+def test_standard_product_change_publishes_only_the_store_index(watched, rendered):
+    make, edit, round_ = watched
+    site = make(lite=False)
+    assert "index.html" in round_()
+    rendered.clear()
+    edit("store.csv", STORE[:2] + [["Bread", "$4", "Loaf", "", "", "Bread"]])
+    assert round_() == ["store-index.json"]
+    # The store pages only fetch the index, so no page is rendered again
+    assert rendered == []
+    assert '"$4"' in open(os.path.join(site.out, "store-index.json"), encoding="utf-8").read()
+    # Same rows under a new version: nothing to publish
+    edit("store.csv", STORE[:2] + [["Bread", "$4", "Loaf", "", "", "Bread"]])
+    assert round_() == []
+
+
+def test_standard_post_change_rebuilds_the_blog_index_only_for_its_cards(watched, rendered):
+    make, edit, round_ = watched
+    make(lite=False)
+    round_()
+    rendered.clear()
+    # The body is only in the post's shard
+    edit("blog.csv", [BLOG[0], BLOG[1][:6] + ["Edited post"]])
+    assert round_() == ["blog/posts/hello.json"] and rendered == []
+    # The title is on the card baked into blog.html
+    edit("blog.csv", [BLOG[0], ["hello", "Hi"] + BLOG[1][2:]])
+    assert sorted(round_()) == ["blog.html", "blog/feed-1.json", "blog/posts/hello.json"]
+
+
+def test_lite_product_change_rebuilds_its_page_and_the_store(watched):
+    make, edit, round_ = watched
+    make(lite=True)
+    assert {"product-cake.html", "product-bread.html"} <= set(round_())
+    edit("store.csv", STORE[:2] + [["Bread", "$4", "Loaf", "", "", "Bread"]])
+    assert sorted(round_()) == ["index.html", "product-bread.html"]
+
+
+def test_main_runs_on_its_own_handles(watched, tmp_path, caplog, monkeypatch):
+    make, _, _ = watched
+    settings = tmp_path / "site0.json"
+    make(lite=False)
+    caplog.set_level(logging.INFO, logger="titan.sheet_watcher")
+    # Nothing may reach the Streamlit-made handles
+    def streamlit_handle(): raise AssertionError("st.cache_resource used")
+    monkeypatch.setattr(cache, "_shared_cache", streamlit_handle)
+    monkeypatch.setattr(content, "_sheet_source", streamlit_handle)
+    # A thread without bound handles, like the real process
+    done = []
+    thread = threading.Thread(target=lambda: done.append(main([str(settings), "--out", str(tmp_path / "cli"), "--once"])))
+    thread.start(); thread.join(60)
+    assert done and os.path.exists(tmp_path / "cli" / "site0" / "index.html")
+    assert any("site0:" in r.getMessage() and "published" in r.getMessage() for r in caplog.records)
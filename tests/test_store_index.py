@@ -0,0 +1,51 @@
+import json
+from bisect import bisect_left
+
+from titan.content import compile_store_index, store_assets
+from titan.data_sources import Product
+
+
+def prefix_ids(index, token):
+    # The same lookup the store script runs on the sorted terms
+    terms = index["terms"]
+    i = bisect_left([t for t, _ in terms], token)
+    ids = set()
+    while i < len(terms) and terms[i][0].startswith(token):
+        ids.update(terms[i][1]); i += 1
+    return ids
+
+
+def test_compile_store_index():
+    products = [
+        Product("Sourdough Loaf", 3.5, "$3.50", "Slow *rise*", "", "", "Bread", 2),
+        Product("Chocolate Cake", 12.0, "$12", "Rich sponge", "https://img.example.com/c.jpg", "https://buy.stripe.com/c", "Treats", 3),
+        Product("Rye Loaf", 4.0, "4 EUR", "", "", "", "", 4),
+    ]
+    index = compile_store_index(products)
+    assert index["items"][1] == ["Chocolate Cake", 12.0, "$12", "Rich sponge", "https://img.example.com/c.jpg", "https://buy.stripe.com/c", "Treats"]
+    assert [t for t, _ in index["terms"]] == sorted(t for t, _ in index["terms"])
+    # Name, description and price label are searchable, each term once per product
+    assert dict(index["terms"])["loaf"] == [0, 2]
+    assert prefix_ids(index, "choc") == {1} and prefix_ids(index, "eur") == {2} and prefix_ids(index, "ri") == {0, 1}
+    # Products without a category are not in any facet
+    assert index["facets"] == {"Bread": [0], "Treats": [1]}
+
+
+def test_store_index_asset_is_deduplicated_and_priced(site, write_csv):
+    store = write_csv("store.csv", [
+        ["Name", "Price", "Description", "ImageURL", "StripeLink", "Category"],
+        ["Cake", "$5.50", "Sponge", "", "", " Treats "],
+        ["  cake ", "$6", "Same name, other case and spacing", "", "", "Treats"],
+        ["Bread", "free", "No number in the price", "", "", "Bread"],
+        ["Pie", "€1,200.00", "Big pie", "", "", ""],
+    ])
+    (name, text), = store_assets(site(sheet_url=store))
+    index = json.loads(text)
+    assert name == "store-index.json" and text == json.dumps(index, separators=(",", ":"))
+    assert [(i[0], i[1], i[2], i[6]) for i in index["items"]] == [("Cake", 5.5, "$5.50", "Treats"), ("Pie", 1200.0, "€1,200.00", "")]
+    assert index["facets"] == {"Treats": [0]}
+    assert prefix_ids(index, "spon") == {0}
+
+
+def test_no_store_sheet_no_index(site):
+    assert store_assets(site(sheet_url="")) == []
@@ -0,0 +1,46 @@
+import json
+import os
+
+from titan import theme
+
+SPEC = {"bg": "#000000", "txt": "#ffffff", "card": "#111111", "nav": "rgba(0,0,0,0.9)"}
+
+
+def test_registry_has_builtins_without_theme_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(theme, "THEMES_DIR", str(tmp_path / "missing"))
+    assert theme.registry() == theme.THEMES
+
+
+def test_registry_loads_valid_files_and_follows_edits(tmp_path, monkeypatch):
+    monkeypatch.setattr(theme, "THEMES_DIR", str(tmp_path))
+    path = tmp_path / "night.json"
+    path.write_text(json.dumps(dict(SPEC, name="Night Shift")))
+    (tmp_path / "partial.json").write_text(json.dumps({"bg": "#fff"}))
+    (tmp_path / "broken.json").write_text("{not json")
+    themes = theme.registry()
+    assert themes["Night Shift"]["bg"] == "#000000"
+    assert "partial" not in themes and "broken" not in themes
+    assert set(theme.THEMES) <= set(themes)
+
+    path.write_text(json.dumps(dict(SPEC, bg="#222222")))
+    os.utime(path, (1_000_000, 1_000_000))
+    themes = theme.registry()
+    # No name in the file: the file name is used
+    assert themes["night"]["bg"] == "#222222" and "Night Shift" not in themes
+
+
+def test_resolve_returns_the_theme_and_its_dark_pair():
+    auto, dark = theme.resolve(theme.THEMES, "Auto (Light/Dark)")
+    assert auto["bg"] == "#ffffff" and dark == theme.THEMES["Midnight SaaS (Dark)"]
+    assert theme.resolve(theme.THEMES, "Forest Eco")[1] is None
+    assert theme.resolve(theme.THEMES, "gone")[0] == theme.THEMES["Clean Corporate (Light)"]
+
+
+def test_settings_hold_only_the_chosen_theme(site):
+    # The builder's settings carry the two specs, not the registry of every theme file
+    cfg = site()
+    assert cfg.theme_spec == theme.THEMES[cfg.theme_mode] and cfg.dark_spec is None
+    assert "Cyberpunk Neon" not in cfg.to_json()
+    assert "--bg: #ffffff" in theme.get_theme_vars(cfg)
+    dark = site(theme_mode="Auto (Light/Dark)", dark_spec=theme.THEMES["Midnight SaaS (Dark)"])
+    assert "prefers-color-scheme: dark" in theme.get_theme_vars(dark)
@@ -0,0 +1,10 @@
+# --- TITAN SITE BUILDER ---
+# ui:         Streamlit script body (sidebar, tabs, Launchpad)
+# generators: page sections and page assembly     theme: theme registry and CSS
+# content:    markdown, sheet data, translations   icons: SVG sprite
+# export:     budgets, host configs, archive       preview: live preview component
+# ai:         per-section copy generation          config: SiteConfig
+# templates:  Jinja2 section templates, fragment cache
+# Standalone tools: data_sources, catalog_check, perf_budget, rum_collector, host_config,
+# mock_llm (offline stand-in for the AI endpoint), preview_server (throttled local serving),
+# sheet_watcher (republishes exported sites when their sheets change).
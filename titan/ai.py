@@ -0,0 +1,193 @@
+# --- TITAN AI GENERATOR ---
+# Copywriting through an OpenAI-compatible chat API (Groq by default). Every content block
+# has its own prompt; generate_sections fans them out concurrently (asyncio, bounded by a
+# semaphore), checks each answer against the line format its field uses on the site, and
+# hands results back as they arrive. requests is imported on the first call.
+#   TITAN_AI_BASE_URL=http://127.0.0.1:8788/v1  -> local mock (python -m titan.mock_llm)
+import asyncio
+import csv
+import datetime
+import hashlib
+import io
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .cache import shared_cache
+from .icons import resolve_icon
+
+BASE_URL = os.environ.get("TITAN_AI_BASE_URL", "https://api.groq.com/openai/v1")
+MODEL = os.environ.get("TITAN_AI_MODEL", "llama-3.1-8b-instant")
+MAX_CONCURRENCY = 4
+TIMEOUT = 60
+
+class AIError(Exception):
+    pass
+
+# --- LINE FORMATS ---
+# Each validator takes what the model sent for one field and returns the text the
+# builder field expects, or raises AIError. List answers keep only their valid lines.
+def _items(value):
+    if isinstance(value, list): return value
+    return [l for l in str(value or "").splitlines() if l.strip()]
+
+def _parts(item, sep):
+    if isinstance(item, dict): item = list(item.values())
+    if isinstance(item, list): return [" ".join(str(x).split()) for x in item]
+    return [" ".join(p.split()) for p in str(item).split(sep)]
+
+def _short(value):
+    if isinstance(value, list): value = " ".join(str(x) for x in value)
+    text = " ".join(str(value or "").split())
+    if not text: raise AIError("empty")
+    return text[:300]
+
+def _text(value):
+    if isinstance(value, list): value = "\n".join(str(x) for x in value)
+    text = "\n".join(l.rstrip() for l in str(value or "").strip().splitlines())
+    if not text: raise AIError("empty")
+    return text
+
+def _feature(item):
+    parts = _parts(item, "|")
+    if len(parts) < 3 or not all(parts[:3]): return None
+    return f"{resolve_icon(parts[0])} | {parts[1]} | {' '.join(parts[2:])}"
+
+def _testimonial(item):
+    parts = _parts(item, "|")
+    if len(parts) < 2 or not parts[0] or not parts[1]: return None
+    return f"{parts[0]} | {' '.join(parts[1:]).strip(chr(34))}"
+
+def _faq(item):
+    parts = _parts(item, "\0") if isinstance(item, (dict, list)) else list(str(item).partition("?")[::2])
+    if len(parts) < 2: return None
+    q, a = parts[0].strip().rstrip("?").strip(), " ".join(parts[1].split()).lstrip("? ").replace("?", ".")
+    return f"{q}? ? {a}" if q and a else None
+
+def _lines(check, minimum):
+    def validate(value):
+        lines = [l for l in map(check, _items(value)) if l]
+        if len(lines) < minimum: raise AIError(f"{len(lines)} valid line(s), need {minimum}")
+        return "\n".join(lines)
+    return validate
+
+def _blog(value):
+    # Draft posts as CSV rows for the blog sheet (Slug, Title, Date, Category, Summary, ImageURL, Content)
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["Slug", "Title", "Date", "Category", "Summary", "ImageURL", "Content"])
+    today, rows = datetime.date.today().isoformat(), 0
+    for p in value if isinstance(value, list) else []:
+        if not isinstance(p, dict) or not p.get("title") or not p.get("content"): continue
+        slug = re.sub(r"[^a-z0-9]+", "-", str(p.get("slug") or p["title"]).lower()).strip("-")
+        writer.writerow([slug, p["title"], today, p.get("category", ""), p.get("summary", ""), "", p["content"]])
+        rows += 1
+    if not rows: raise AIError("no complete posts")
+    return out.getvalue().strip()
+
+# key -> (what to ask for, validator)
+FORMATS = {
+    "short": ("String, one line", _short),
+    "sentences": ("String, 2-3 sentences", _short),
+    "text": ("String, several short paragraphs separated by newlines; a line in **double asterisks** is a heading, lines starting with '* ' are list items", _text),
+    "features": ("Array of 4-6 strings, each 'iconname | Title | One sentence description'", _lines(_feature, 3)),
+    "testimonials": ("Array of 3 strings, each 'Customer Name, Role | Quote'", _lines(_testimonial, 2)),
+    "faq": ("Array of 4-6 strings, each 'Question? ? Answer'", _lines(_faq, 3)),
+    "blog": ("Array of 3 objects with keys slug, title, category, summary, content (Markdown)", _blog),
+}
+
+@dataclass(frozen=True)
+class Section:
+    label: str
+    fields: tuple       # (session_state key, format, what it is)
+
+SECTIONS = {
+    "hero": Section("Hero", (("hero_h", "short", "catchy headline"), ("hero_sub", "sentences", "subheadline"))),
+    "about": Section("About", (("about_h", "short", "about section title"), ("about_short", "sentences", "home page summary"),
+                               ("about_long", "text", "full About page"))),
+    "features": Section("Features", (("feat_data", "features", "key selling points"),)),
+    "testimonials": Section("Testimonials", (("testi_data", "testimonials", "realistic customer testimonials"),)),
+    "faq": Section("FAQ", (("faq_data", "faq", "frequently asked questions with answers"),)),
+    "legal": Section("Legal", (("priv_txt", "text", "privacy policy"), ("term_txt", "text", "terms of service"))),
+    "booking": Section("Booking", (("booking_title", "short", "booking page title"), ("booking_desc", "short", "booking page subtext"))),
+    "blog": Section("Blog", (("blog_hero_title", "short", "blog page title"), ("blog_hero_sub", "short", "blog page subtext"),
+                             ("blog_drafts", "blog", "first blog posts"))),
+}
+
+def section_prompt(name, biz_desc):
+    keys = "\n".join(f"{key} ({FORMATS[fmt][0]}): {what}" for key, fmt, what in SECTIONS[name].fields)
+    return f"Act as a copywriter for a '{biz_desc}' business. Return a JSON object with exactly these keys:\n{keys}"
+
+# --- REQUESTS ---
+def complete(session, cache, api_key, prompt, base_url=BASE_URL, fresh=False):
+    import requests
+    data = {"messages": [{"role": "user", "content": prompt}], "model": MODEL, "response_format": {"type": "json_object"}}
+
+    def fetch_completion():
+        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        try:
+            resp = session.post(base_url.rstrip("/") + "/chat/completions", headers=headers, json=data, timeout=TIMEOUT)
+        except requests.RequestException as e:
+            raise AIError(f"Request failed: {e}") from e
+        if resp.status_code == 401:
+            raise AIError("❌ Invalid API Key. Ensure no spaces and starts with 'gsk_'.")
+        if resp.status_code != 200:
+            raise AIError(f"API Error {resp.status_code}: {resp.text[:200]}")
+        # A 200 with an unexpected body fails this section only, like any other API error
+        try: content = resp.json()['choices'][0]['message']['content']
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise AIError(f"Malformed API response: {resp.text[:200]}") from e
+        if not isinstance(content, str): raise AIError("Malformed API response: no message content")
+        return content
+
+    # Identical prompts with the same key are answered from the shared cache (errors are never
+    # cached); the key is only kept as a digest. fresh=True asks again and replaces the answer.
+    key_digest = hashlib.blake2b(api_key.encode("utf-8", "ignore"), digest_size=16).hexdigest()
+    return cache.get_or_set("ai", (base_url, MODEL, key_digest, prompt), fetch_completion, refresh=fresh)
+
+def generate_section(session, cache, api_key, name, biz_desc, base_url=BASE_URL, fresh=False):
+    # -> {session_state key: validated text}; fields that fail validation are left out
+    try: answer = json.loads(complete(session, cache, api_key, section_prompt(name, biz_desc), base_url, fresh))
+    except ValueError as e: raise AIError("Answer is not JSON") from e
+    if not isinstance(answer, dict): raise AIError("Answer is not a JSON object")
+    values, problems = {}, []
+    for key, fmt, _ in SECTIONS[name].fields:
+        try: values[key] = FORMATS[fmt][1](answer.get(key))
+        except AIError as e: problems.append(f"{key}: {e}")
+    if not values: raise AIError("; ".join(problems))
+    return values, problems
+
+async def _fan_out(names, run, limit):
+    # requests blocks, so each call runs on a pool as wide as the limit (the default
+    # executor is sized by CPU count and would queue calls behind each other)
+    sem, loop = asyncio.Semaphore(limit), asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=limit, thread_name_prefix="titan-ai") as pool:
+        async def one(name):
+            async with sem:
+                t0 = time.perf_counter()
+                try: result, error = await loop.run_in_executor(pool, run, name), None
+                except AIError as e: result, error = None, str(e)
+                return name, result, error, time.perf_counter() - t0
+        for next_done in asyncio.as_completed([one(n) for n in names]):
+            yield await next_done
+
+def generate_sections(api_key, biz_desc, names, on_result, base_url=BASE_URL, limit=MAX_CONCURRENCY, fresh=False):
+    # on_result(name, (values, problems) or None, error, seconds) runs on the calling thread
+    # as each section lands, so it can write straight into st.session_state.
+    import requests
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=limit, pool_maxsize=limit)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    cache = shared_cache()
+
+    async def run_all():
+        async for result in _fan_out(names, lambda n: generate_section(session, cache, api_key, n, biz_desc, base_url, fresh), limit):
+            on_result(*result)
+    try:
+        asyncio.run(run_all())
+    finally:
+        session.close()
@@ -0,0 +1,128 @@
+# --- TITAN SHARED CACHE ---
+# One LRU per namespace, shared by every session on this server process.
+# Limits are (max entries, max bytes); the least recently used entries go first.
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import streamlit as st
+
+CACHE_LIMITS = {
+    "theme": (256, 4 * 1024 * 1024),
+    "markdown": (2048, 8 * 1024 * 1024),
+    "icons": (512, 1024 * 1024),
+    "csv": (64, 64 * 1024 * 1024),
+    "ai": (256, 2 * 1024 * 1024),
+    "perf": (4096, 512 * 1024),
+    "export": (8, 128 * 1024 * 1024),
+    "html": (2048, 16 * 1024 * 1024),
+}
+SCALAR = sys.getsizeof(0.0)
+
+class SharedCache:
+    def __init__(self, limits):
+        self.limits = limits
+        self._lock = threading.Lock()
+        self._data = {ns: OrderedDict() for ns in limits}
+        self._bytes = {ns: 0 for ns in limits}
+        self.stats = {ns: {"hits": 0, "misses": 0, "evictions": 0} for ns in limits}
+
+    @staticmethod
+    def _key(key):
+        # Keys can be whole text blocks; store a digest so keys stay small
+        return hashlib.blake2b(repr(key).encode("utf-8", "ignore"), digest_size=16).digest()
+
+    @staticmethod
+    def _size(value):
+        # Approximate bytes held, containers and objects walked all the way down: getsizeof
+        # alone only sees a list's or dict's own slots, not the rows and strings behind them.
+        # Strings count their length; numbers, bools and None a flat SCALAR.
+        total, stack, seen = 0, [value], set()
+        while stack:
+            v = stack.pop()
+            if isinstance(v, (str, bytes)):
+                total += len(v)
+                continue
+            # Shared or self-referencing objects are counted once
+            if id(v) in seen: continue
+            seen.add(id(v))
+            total += sys.getsizeof(v)
+            if isinstance(v, dict): items = [*v.keys(), *v.values()]
+            elif isinstance(v, (list, tuple, set, frozenset)): items = v
+            elif hasattr(v, "__dict__"): items = v.__dict__.values()
+            else: continue
+            # Leaves are counted inline: a big index is mostly strings and ints
+            for x in items:
+                t = type(x)
+                if t is str or t is bytes: total += len(x)
+                elif t is int or t is float or t is bool or x is None: total += SCALAR
+                else: stack.append(x)
+        return total
+
+    def get_or_set(self, ns, key, build, refresh=False):
+        # refresh=True builds again even on a hit and replaces the entry
+        k = self._key(key)
+        with self._lock:
+            entries = self._data[ns]
+            if k in entries and not refresh:
+                entries.move_to_end(k)
+                self.stats[ns]["hits"] += 1
+                return entries[k][0]
+            self.stats[ns]["misses"] += 1
+        # Build outside the lock so a slow entry (AI call, fetch) never blocks other sessions
+        value = build()
+        size = self._size(value)
+        max_items, max_bytes = self.limits[ns]
+        if size > max_bytes: return value
+        with self._lock:
+            entries = self._data[ns]
+            if k in entries: self._bytes[ns] -= entries.pop(k)[1]
+            entries[k] = (value, size)
+            self._bytes[ns] += size
+            while len(entries) > max_items or self._bytes[ns] > max_bytes:
+                _, (_, old_size) = entries.popitem(last=False)
+                self._bytes[ns] -= old_size
+                self.stats[ns]["evictions"] += 1
+        return value
+
+    def metrics(self):
+        with self._lock:
+            rows = []
+            for ns, st_ in self.stats.items():
+                lookups = st_["hits"] + st_["misses"]
+                rows.append({
+                    "Cache": ns, "Entries": len(self._data[ns]), "KB": round(self._bytes[ns] / 1024, 1),
+                    "Hits": st_["hits"], "Misses": st_["misses"], "Evictions": st_["evictions"],
+                    "Hit Rate": f"{st_['hits'] / lookups:.0%}" if lookups else "-",
+                })
+            return rows
+
+# --- PROCESS-WIDE HANDLES ---
+# The shared cache and the sheet source are made once per process through st.cache_resource,
+# which belongs on the script thread. Code running off it (export jobs, the sheet watcher) is
+# handed the objects with use_handles(), so it never needs a Streamlit script context.
+_handles = threading.local()
+
+@contextmanager
+def use_handles(**handles):
+    saved = dict(vars(_handles))
+    vars(_handles).update(handles)
+    try:
+        yield
+    finally:
+        vars(_handles).clear()
+        vars(_handles).update(saved)
+
+def handle(name, make):
+    # The object bound to this thread by use_handles, else make() (an st.cache_resource)
+    bound = getattr(_handles, name, None)
+    return make() if bound is None else bound
+
+def shared_cache():
+    return handle("cache", _shared_cache)
+
+@st.cache_resource
+def _shared_cache():
+    return SharedCache(CACHE_LIMITS)
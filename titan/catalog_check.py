@@ -0,0 +1,126 @@
+# --- TITAN CATALOG CHECK ---
+# Streaming validator for the store sheet (Name, Price, Description, ImageURL, StripeLink, [Category]).
+# Rows are read one at a time, so memory does not grow with the size of the ERP export, only
+# with its number of distinct product names: one 64-bit name hash and its first line each
+# (O(distinct names), about 100 bytes per name).
+#
+#   python -m titan.catalog_check catalog.csv --out clean.csv
+import argparse
+import csv
+import hashlib
+import re
+import sys
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+from . import data_sources
+
+COLUMNS = ["Name", "Price", "Description", "ImageURL", "StripeLink", "Category"]
+REQUIRED = ["name", "price", "description", "imageurl", "stripelink"]
+IMAGE_EXT = (".jpg", ".jpeg", ".png", ".webp", ".gif", ".avif", ".svg")
+
+@dataclass(frozen=True)
+class Issue:
+    line: int
+    column: str
+    severity: str   # "error" drops the row from the build, "warning" keeps it
+    message: str
+
+def _norm(value):
+    return " ".join(value.split())
+
+def _name_key(name):
+    # A small int, not the name: duplicate tracking costs the same for any name length
+    return int.from_bytes(hashlib.blake2b(_norm(name).casefold().encode(), digest_size=8).digest(), "big")
+
+def _url_ok(value):
+    u = urlparse(value)
+    return u.scheme in ("http", "https") and bool(u.netloc) and " " not in value
+
+def validate(rows):
+    # (line, row) pairs in -> ("issue", Issue) and ("row", Product) out, in sheet order.
+    # Rows with errors and repeated names are not yielded as products.
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        yield "issue", Issue(0, "", "error", "Sheet is empty")
+        return
+    line, header = first
+    header = [h.strip().lower() for h in header]
+    col = {c: header.index(c) if c in header else None for c in REQUIRED + ["category"]}
+    # Columns without a known header are read from their documented position when no other
+    # known header claims it, the same way data_sources.products reads the sheet
+    taken = {i for i in col.values() if i is not None}
+    for i, c in enumerate(REQUIRED + ["category"]):
+        if col[c] is not None or i in taken: continue
+        col[c] = i
+        if c in REQUIRED and i < len(header):
+            yield "issue", Issue(line, COLUMNS[i], "warning", f"No {COLUMNS[i]!r} header, reading column {i + 1} ({header[i] or 'blank'}) as {COLUMNS[i]}")
+    for c in (c for c in REQUIRED if col[c] is None or col[c] >= len(header)):
+        yield "issue", Issue(line, COLUMNS[REQUIRED.index(c)], "error" if c in ("name", "price") else "warning", "Column missing from header")
+    if col["name"] is None: return
+    seen = {}
+
+    for line, r in rows:
+        if not any(v.strip() for v in r): continue
+        get = lambda c: r[col[c]].strip() if col[c] is not None and col[c] < len(r) else ""
+        errors = 0
+        if len(r) < len(header):
+            yield "issue", Issue(line, "", "warning", f"Row has {len(r)} columns, header has {len(header)}")
+        name = _norm(get("name"))
+        if not name:
+            yield "issue", Issue(line, "Name", "error", "Missing product name"); continue
+        price = get("price")
+        if not price or not re.search(r"\d", price):
+            yield "issue", Issue(line, "Price", "error", f"Price {price!r} has no number"); errors += 1
+        image = get("imageurl")
+        if image and not _url_ok(image):
+            yield "issue", Issue(line, "ImageURL", "warning", f"Not an absolute http(s) URL: {image[:80]}"); image = ""
+        elif image and not urlparse(image).path.lower().endswith(IMAGE_EXT) and "unsplash" not in image:
+            yield "issue", Issue(line, "ImageURL", "warning", "URL does not look like an image file")
+        stripe = get("stripelink")
+        if stripe and not (_url_ok(stripe) and stripe.startswith("https://")):
+            yield "issue", Issue(line, "StripeLink", "warning", "Not an https payment link, falling back to Add to Cart"); stripe = ""
+        key = _name_key(name)
+        if key in seen:
+            yield "issue", Issue(line, "Name", "error", f"Duplicate of line {seen[key]}: {name[:60]}"); continue
+        seen[key] = line
+        if errors: continue
+        yield "row", data_sources.Product(name, data_sources.price_value(price), price, _norm(get("description")),
+                                          image, stripe, _norm(get("category")), line)
+
+def clean_products(rows):
+    # Validated, deduplicated products for the static build
+    return (p for kind, p in validate(rows) if kind == "row")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Validate a Titan store CSV and write a normalized, deduplicated copy.")
+    ap.add_argument("source", help="CSV path, file:// URL or published sheet URL")
+    ap.add_argument("--out", help="write clean CSV here")
+    ap.add_argument("--max-issues", type=int, default=200, help="stop printing after this many issues (counting continues)")
+    args = ap.parse_args(argv)
+    try:
+        sheet = data_sources.SheetSource(local_dirs=None).fetch(args.source)
+    except data_sources.SheetError as e:
+        print(e, file=sys.stderr); return 2
+
+    counts = {"error": 0, "warning": 0, "row": 0}
+    out = open(args.out, "w", newline="", encoding="utf-8") if args.out else None
+    writer = csv.writer(out) if out else None
+    if writer: writer.writerow(COLUMNS)
+    try:
+        for kind, x in validate(sheet.rows()):
+            if kind == "row":
+                counts["row"] += 1
+                if writer: writer.writerow([x.name, x.price_label, x.description, x.image, x.stripe, x.category])
+                continue
+            counts[x.severity] += 1
+            if counts["error"] + counts["warning"] <= args.max_issues:
+                print(f"line {x.line}: {x.severity}: {x.column + ': ' if x.column else ''}{x.message}")
+    finally:
+        if out: out.close()
+    print(f"{counts['row']} clean rows, {counts['error']} errors, {counts['warning']} warnings", file=sys.stderr)
+    return 1 if counts["error"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+# --- TITAN SITE CONFIG ---
+# Every builder setting the generators read, filled in by the UI on each rerun.
+# Generators take it as their first argument (`cfg`) instead of reading script globals.
+import hashlib
+import json
+from types import SimpleNamespace
+
+class SiteConfig(SimpleNamespace):
+    def digest(self):
+        # Same settings -> same digest; keys build artifacts such as the export archive
+        return hashlib.blake2b(repr(sorted(vars(self).items())).encode("utf-8", "ignore"), digest_size=16).hexdigest()
+
+    def to_json(self):
+        # Every setting is plain data, so a site can be rebuilt outside the UI (see sheet_watcher)
+        return json.dumps(vars(self), indent=1)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls(**json.loads(text))
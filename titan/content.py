@@ -0,0 +1,258 @@
+# --- TITAN CONTENT ---
+# Text formatting, markdown, build-time sheet data (store, blog) and the static multi-language build.
+# data_sources (and with it requests) is only imported once a sheet is actually configured.
+import csv
+import html
+import json
+import re
+from urllib.parse import urlparse
+
+import streamlit as st
+
+from .cache import handle, shared_cache
+
+# One pooled sheet fetcher (session, threads, disk cache) per server process
+def sheet_source():
+    return handle("sheets", _sheet_source)
+
+@st.cache_resource
+def _sheet_source():
+    from . import data_sources
+    return data_sources.SheetSource()
+
+def format_text(text):
+    if not text: return ""
+    return shared_cache().get_or_set("markdown", text, lambda: _format_text(text))
+
+def _format_text(text):
+    # User text is escaped first; only **bold** and "* " list lines become markup
+    processed_text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', html.escape(text, quote=False))
+    lines = processed_text.split('\n')
+    html_out = ""
+    in_list = False
+    
+    for line in lines:
+        clean_line = line.strip()
+        if not clean_line: continue
+        if clean_line.startswith("* "):
+            if not in_list:
+                html_out += '<ul style="margin-bottom:1rem; padding-left:1.5rem;">'
+                in_list = True
+            content = clean_line[2:] 
+            html_out += f'<li style="margin-bottom:0.5rem; opacity:0.9; color:inherit;">{content}</li>'
+        elif clean_line.startswith("<strong>") and clean_line.endswith("</strong>"):
+            if in_list: 
+                html_out += "</ul>"
+                in_list = False
+            header_text = clean_line.replace("<strong>", "").replace("</strong>", "")
+            html_out += f"<h3 style='margin-top:1.5rem; margin-bottom:0.5rem; color:var(--p); font-size:1.25rem;'>{header_text}</h3>"
+        else:
+            if in_list: 
+                html_out += "</ul>"
+                in_list = False
+            html_out += f"<p style='margin-bottom:1rem; opacity:0.9; color:inherit;'>{clean_line}</p>"
+    if in_list: html_out += "</ul>"
+    return html_out
+
+# --- NEW: BUILD-TIME SHEET DATA ---
+# Sheets go through data_sources (see sheet_source): concurrent pooled downloads,
+# conditional GETs against an on-disk cache, typed rows. A local path or file:// URL works too.
+def sheets(cfg):
+    # Every configured sheet fetched in one concurrent round; {url: Sheet} for those that loaded
+    urls = [u for u in (cfg.sheet_url, cfg.blog_sheet_url, cfg.lang_sheet) if u]
+    if not urls: return {}
+    from . import data_sources
+    got = sheet_source().fetch_all(urls)
+    return {u: s for u, s in got.items() if isinstance(s, data_sources.Sheet)}
+
+def sheet_records(sheet, parse, *args):
+    # Typed rows, parsed once per sheet version and shared by every session
+    if sheet is None: return None
+    key = (parse.__name__, args, sheet.url, sheet.version)
+    try:
+        return shared_cache().get_or_set("csv", key, lambda: list(parse(sheet.rows(), *args)))
+    except (OSError, csv.Error):
+        return None
+
+def _md_inline(text):
+    # Input is already HTML-escaped, quotes included, so a URL can't break out of its attribute;
+    # only markdown syntax becomes markup
+    text = re.sub(r"`([^`]+)`", r"<code>\1</code>", text)
+    text = re.sub(r"!\[([^\]]*)\]\(((?:https?://|/)[^)\s]+)\)", r'<img src="\2" alt="\1" loading="lazy" style="max-width:100%;">', text)
+    text = re.sub(r"\[([^\]]+)\]\(((?:https?://|mailto:|/|#)[^)\s]+)\)", r'<a href="\2">\1</a>', text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    text = re.sub(r"(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])", r"<em>\1</em>", text)
+    return text
+
+def render_markdown(text):
+    # Block-level markdown for blog articles: headings, lists, quotes, code fences, rules, paragraphs
+    if not text: return ""
+    out, para, list_tag, in_code = [], [], None, False
+    def flush():
+        nonlocal list_tag
+        if para: out.append("<p>" + "<br>".join(_md_inline(x) for x in para) + "</p>"); para.clear()
+        if list_tag: out.append(f"</{list_tag}>"); list_tag = None
+    for raw in html.escape(text).replace("\r\n", "\n").split("\n"):
+        line = raw.strip()
+        if line.startswith("```"):
+            flush()
+            out.append("</code></pre>" if in_code else "<pre><code>")
+            in_code = not in_code
+            continue
+        if in_code: out.append(raw + "\n"); continue
+        heading = re.match(r"(#{1,6})\s+(.*)", line)
+        item = re.match(r"([*-]|\d+\.)\s+(.*)", line)
+        if not line: flush()
+        elif heading:
+            flush()
+            level = min(len(heading.group(1)) + 1, 6)  # the page title is the only h1
+            out.append(f"<h{level}>{_md_inline(heading.group(2))}</h{level}>")
+        elif re.fullmatch(r"(-{3,}|\*{3,})", line): flush(); out.append("<hr>")
+        elif item:
+            tag = "ol" if item.group(1)[0].isdigit() else "ul"
+            if para or list_tag != tag:
+                flush(); out.append(f"<{tag}>"); list_tag = tag
+            out.append(f"<li>{_md_inline(item.group(2))}</li>")
+        elif line.startswith("&gt;"):
+            flush(); out.append(f"<blockquote>{_md_inline(line[4:].strip())}</blockquote>")
+        else:
+            if list_tag: flush()
+            para.append(line)
+    if in_code: out.append("</code></pre>")
+    flush()
+    return "".join(out)
+
+BLOG_PAGE_SIZE = 12
+
+def post_slug(raw):
+    return re.sub(r"[^a-z0-9]+", "-", raw.lower()).strip("-")
+
+def compile_blog(cfg, posts):
+    # data_sources.Post rows -> small summary feed (paged) + one pre-rendered shard per post
+    summaries, shards = [], {}
+    for p in posts:
+        slug = post_slug(p.slug)
+        if not slug: continue
+        plain = re.sub(r"[#*_`>\[\]]|\(https?://[^)]*\)", "", p.content)
+        excerpt = p.summary.strip() or " ".join(plain.split())[:160]
+        # Plain text: the templates and the page scripts (esc) escape it where it lands
+        image = p.image if p.image and urlparse(p.image).scheme in ("", "http", "https") else cfg.custom_feat
+        meta = {"slug": slug, "title": p.title, "date": p.date, "category": p.category, "image": image, "excerpt": excerpt}
+        summaries.append(meta)
+        shards[slug] = dict(meta, html=render_markdown(p.content))
+    pages = [summaries[i:i + BLOG_PAGE_SIZE] for i in range(0, len(summaries), BLOG_PAGE_SIZE)] or [[]]
+    return pages, shards
+
+def get_blog_feed(cfg):
+    sheet = sheets(cfg).get(cfg.blog_sheet_url)
+    if sheet is None: return None
+    from . import data_sources
+    posts = sheet_records(sheet, data_sources.posts)
+    if not posts: return None
+    return shared_cache().get_or_set("csv", ("blog-feed", sheet.url, sheet.version, cfg.custom_feat), lambda: compile_blog(cfg, posts))
+
+def blog_assets(cfg):
+    feed = get_blog_feed(cfg)
+    if not feed: return []
+    pages, shards = feed
+    files = [(f"blog/feed-{n}.json", json.dumps({"page": n, "pages": len(pages), "posts": posts})) for n, posts in enumerate(pages, 1)]
+    files += [(f"blog/posts/{slug}.json", json.dumps(shard)) for slug, shard in shards.items()]
+    return files
+
+def compile_store_index(products):
+    # data_sources.Product rows -> compact inverted index: items as arrays,
+    # sorted (term, ids) pairs for prefix search, category facets
+    items, postings, facets = [], {}, {}
+    for i, p in enumerate(products):
+        items.append([p.name, p.price, p.price_label, p.description, p.image, p.stripe, p.category])
+        for term in set(re.findall(r"[a-z0-9]+", f"{p.name} {p.description} {p.price_label}".lower())):
+            postings.setdefault(term, []).append(i)
+        if p.category: facets.setdefault(p.category, []).append(i)
+    return {"items": items, "terms": sorted(postings.items()), "facets": facets}
+
+def get_store_index(cfg):
+    sheet = sheets(cfg).get(cfg.sheet_url)
+    if sheet is None: return None
+    # Only validated, deduplicated rows reach the build (see catalog_check)
+    from . import catalog_check
+    products = sheet_records(sheet, catalog_check.clean_products)
+    if not products: return None
+    return shared_cache().get_or_set("csv", ("store-index", sheet.url, sheet.version), lambda: compile_store_index(products))
+
+def store_assets(cfg):
+    index = get_store_index(cfg)
+    return [("store-index.json", json.dumps(index, separators=(",", ":")))] if index else []
+
+# --- NEW: STATIC MULTI-LANGUAGE BUILD ---
+# Translation sheet columns: ElementID, TranslatedText, [Lang]. ElementID is the data-t key
+# of a text node (nav.home, hero.title, features.2.desc, page.about.body, ...).
+# Every language is compiled into its own folder at export, no runtime swap.
+BASE_LANG = "en"
+_T_NODE = re.compile(r'(<(\w+)\b[^>]*?\bdata-t="([^"]+)"[^>]*>)(.*?)(</\2>)', re.S)
+_T_PAGE_LINK = re.compile(r'href="((?:index|about|contact|privacy|terms|booking|blog|(?:product|post)(?:-[a-z0-9-]+)?)\.html|#)')
+
+def lang_codes(cfg):
+    codes = (re.sub(r"[^a-z-]", "", c.lower()) for c in cfg.lang_list.split(","))
+    return [c for c in dict.fromkeys(codes) if c and c != BASE_LANG]
+
+def load_translations(cfg):
+    codes = lang_codes(cfg)
+    sheet = sheets(cfg).get(cfg.lang_sheet) if codes else None
+    if sheet is None: return {}
+    # Rows without a Lang go to the first configured language
+    from . import data_sources
+    rows = sheet_records(sheet, data_sources.translations, codes[0])
+    if not rows: return {}
+    def build():
+        table = {}
+        for t in rows:
+            if t.lang in codes: table.setdefault(t.lang, {})[t.key] = t.text
+        return table
+    return shared_cache().get_or_set("csv", ("translations", sheet.url, sheet.version, tuple(codes)), build)
+
+def site_languages(cfg):
+    # Only languages that actually have strings get a folder
+    table = load_translations(cfg)
+    return [c for c in lang_codes(cfg) if table.get(c)]
+
+def lang_switch_links(cfg, page_file, current):
+    # hrefs are root-relative; translated pages carry <base href="../"> so the same links work there
+    langs = [(BASE_LANG, page_file)] + [(c, f"{c}/{page_file}") for c in site_languages(cfg)]
+    if len(langs) < 2: return ""
+    click = "" if cfg.lite else ' onclick="toggleMenu()"'
+    links = "".join(f'<a href="{href}" hreflang="{c}"{click}>🌐 {c.upper()}</a>' for c, href in langs if c != current)
+    return f'<span class="lang-switch">{links}</span>'
+
+def translate_html(page_html, strings):
+    def swap(m):
+        text = strings.get(m.group(3))
+        if text is None: return m.group(0)
+        inner = format_text(text) if m.group(2) == "div" else html.escape(text)
+        return m.group(1) + inner + m.group(5)
+    return _T_NODE.sub(swap, page_html)
+
+def localize_page(cfg, page_html, page_file, lang, strings):
+    langs = [BASE_LANG] + site_languages(cfg)
+    site = cfg.prod_url.rstrip("/")
+    alternates = "".join(f'<link rel="alternate" hreflang="{c}" href="{site}/{page_file if c == BASE_LANG else f"{c}/{page_file}"}">' for c in langs)
+    alternates += f'<link rel="alternate" hreflang="x-default" href="{site}/{page_file}">'
+    if lang != BASE_LANG:
+        page_html = translate_html(page_html, strings)
+        # Assets, feeds and the service worker stay shared at the root; page links stay in the language folder
+        page_html = _T_PAGE_LINK.sub(lambda m: f'href="{lang}/{page_file}#' if m.group(1) == "#" else f'href="{lang}/{m.group(1)}', page_html)
+        page_html = page_html.replace('<html lang="en">', f'<html lang="{lang}">', 1).replace("<head>", '<head>\n<base href="../">', 1)
+    page_html = re.sub(r'<span class="lang-switch">.*?</span>', lang_switch_links(cfg, page_file, lang), page_html, count=1, flags=re.S)
+    return page_html.replace("</head>", alternates + "\n</head>", 1)
+
+def localize_site(cfg, pages, step=None):
+    # [(file, html)] in the base language -> the same pages plus one translated copy per language.
+    # step(file) is called before each translated page (export progress).
+    langs = site_languages(cfg)
+    if not langs: return pages
+    table = load_translations(cfg)
+    out = [(f, localize_page(cfg, doc, f, BASE_LANG, {})) for f, doc in pages]
+    for c in langs:
+        for f, doc in pages:
+            if step: step(f"{c}/{f}")
+            out.append((f"{c}/{f}", localize_page(cfg, doc, f, c, table[c])))
+    return out
@@ -0,0 +1,222 @@
+# --- TITAN DATA SOURCES ---
+# Build-time access to the published Google Sheets (store, blog, translations).
+# Sheets are downloaded concurrently over one pooled session, revalidated with
+# ETag / If-Modified-Since against an on-disk cache and parsed as a stream, so a
+# large catalog never has to sit in memory as one string.
+# Any local HTTP server can stand in for Google Sheets. Local paths and file:// URLs are read
+# only from LOCAL_DIRS (TITAN_LOCAL_SHEETS, none by default), so builder users cannot publish
+# server files; the command-line tools pass local_dirs=None and read any path.
+import codecs
+import csv
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import unquote, urlparse
+
+import requests
+
+CACHE_DIR = os.environ.get("TITAN_SHEET_CACHE", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".sheet_cache"))
+FRESH_FOR = 60        # seconds a download is trusted before it is revalidated
+CHUNK = 64 * 1024
+CODEC = "utf-8/declared"  # how cached copies were decoded
+LOCAL_DIRS = tuple(d for d in os.environ.get("TITAN_LOCAL_SHEETS", "").split(os.pathsep) if d)
+LOCK_STRIPES = 64         # concurrent downloads of one URL share a lock; URLs share stripes
+
+class SheetError(Exception):
+    pass
+
+# --- TYPED ROWS ---
+# `line` is the CSV line the record ends on, for error reports.
+@dataclass(frozen=True)
+class Product:
+    # Store sheet columns: Name, Price, Description, ImageURL, StripeLink, [Category]
+    name: str
+    price: float
+    price_label: str
+    description: str
+    image: str
+    stripe: str
+    category: str
+    line: int
+
+@dataclass(frozen=True)
+class Post:
+    # Blog sheet columns: Slug, Title, Date, Category, Summary, ImageURL, Content (Markdown)
+    slug: str
+    title: str
+    date: str
+    category: str
+    summary: str
+    image: str
+    content: str
+    line: int
+
+@dataclass(frozen=True)
+class Translation:
+    # Translation sheet columns: ElementID, TranslatedText, [Lang]
+    key: str
+    text: str
+    lang: str
+    line: int
+
+def price_value(label):
+    try: return float(re.sub(r"[^0-9.]", "", label) or 0)
+    except ValueError: return 0.0
+
+def _pad(row, n):
+    return row + [""] * (n - len(row))
+
+def _header(row):
+    return [h.strip().lower() for h in row]
+
+def products(rows):
+    header = None
+    for line, r in rows:
+        if header is None:
+            header = _header(r)
+            cat_col = header.index("category") if "category" in header else 5
+            continue
+        if len(r) < 2 or not r[0].strip(): continue
+        r = _pad(r, max(6, cat_col + 1))
+        yield Product(r[0], price_value(r[1]), r[1], r[2], r[3] if len(r[3]) > 5 else "",
+                      r[4] if "http" in r[4] else "", r[cat_col].strip(), line)
+
+def posts(rows):
+    header = None
+    for line, r in rows:
+        if header is None:
+            header = r
+            continue
+        if len(r) < 5 or not r[0].strip(): continue
+        yield Post(*_pad(r, 7)[:7], line)
+
+def translations(rows, default_lang):
+    header = None
+    for line, r in rows:
+        if header is None:
+            header = _header(r)
+            lang_col = header.index("lang") if "lang" in header else None
+            continue
+        if len(r) < 2 or not r[0].strip(): continue
+        lang = r[lang_col].strip().lower() if lang_col is not None and len(r) > lang_col else ""
+        yield Translation(r[0].strip(), r[1], lang or default_lang, line)
+
+# --- FETCHED SHEET ---
+@dataclass(frozen=True)
+class Sheet:
+    url: str
+    path: str
+    version: str    # changes only when the content does (ETag, content digest or file stat)
+
+    def rows(self):
+        # Streams (line, row) pairs straight off the disk
+        with open(self.path, newline="", encoding="utf-8-sig", errors="replace") as f:
+            reader = csv.reader(f)
+            for row in reader:
+                yield reader.line_num, row
+
+def local_path(url):
+    if url.startswith("file://"): return unquote(urlparse(url).path)
+    if "://" not in url: return url
+    return None
+
+def _inside(path, dirs):
+    real = os.path.realpath(path)
+    return any(os.path.commonpath([real, d]) == d for d in map(os.path.realpath, dirs))
+
+class SheetSource:
+    def __init__(self, cache_dir=CACHE_DIR, workers=4, timeout=15, fresh_for=FRESH_FOR, local_dirs=LOCAL_DIRS):
+        self.cache_dir = cache_dir
+        self.local_dirs = local_dirs    # None: any local path
+        self.timeout = timeout
+        self.fresh_for = fresh_for
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="titan-sheets")
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _lock(self, url):
+        # A fixed set, so memory does not grow with every URL ever fetched
+        return self._locks[int.from_bytes(hashlib.blake2b(url.encode(), digest_size=4).digest(), "big") % LOCK_STRIPES]
+
+    def _paths(self, url):
+        stem = os.path.join(self.cache_dir, hashlib.blake2b(url.encode(), digest_size=12).hexdigest())
+        return stem + ".csv", stem + ".json"
+
+    def fetch(self, url):
+        path = local_path(url)
+        if path is not None:
+            if self.local_dirs is not None and not _inside(path, self.local_dirs):
+                raise SheetError(f"{url}: local files are not allowed here, use an http(s) URL")
+            if not os.path.isfile(path): raise SheetError(f"{path}: file not found")
+            st = os.stat(path)
+            return Sheet(url, path, f"{st.st_mtime_ns}-{st.st_size}")
+        # One download per URL at a time; other sessions wait and reuse the result
+        with self._lock(url):
+            return self._fetch_http(url)
+
+    def _fetch_http(self, url):
+        data_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f: meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        # Copies from before the UTF-8 default (no "codec" entry) are downloaded again
+        cached = meta.get("url") == url and meta.get("codec") == CODEC and os.path.isfile(data_path)
+        if cached and time.time() - meta.get("checked", 0) < self.fresh_for:
+            return Sheet(url, data_path, meta["version"])
+
+        headers = {}
+        if cached and meta.get("etag"): headers["If-None-Match"] = meta["etag"]
+        if cached and meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as resp:
+                if resp.status_code == 304 and cached:
+                    meta["checked"] = time.time()
+                else:
+                    resp.raise_for_status()
+                    meta = self._download(url, resp, data_path)
+        except requests.RequestException as e:
+            # A stale copy beats no data; the next call revalidates again
+            if cached: return Sheet(url, data_path, meta["version"])
+            raise SheetError(f"{url}: {e}") from e
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w") as f: json.dump(meta, f)
+        os.replace(tmp, meta_path)
+        return Sheet(url, data_path, meta["version"])
+
+    def _download(self, url, resp, data_path):
+        # Chunks go straight to disk and are re-encoded to UTF-8 on the way. Without a declared
+        # charset requests assumes ISO-8859-1 for text/*; sheets are UTF-8 (a BOM is dropped).
+        digest = hashlib.blake2b(digest_size=16)
+        declared = "charset" in resp.headers.get("Content-Type", "").lower()
+        decoder = codecs.getincrementaldecoder(resp.encoding if declared and resp.encoding else "utf-8-sig")(errors="replace")
+        tmp = data_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            for chunk in resp.iter_content(CHUNK):
+                digest.update(chunk)
+                f.write(decoder.decode(chunk))
+            f.write(decoder.decode(b"", final=True))
+        os.replace(tmp, data_path)
+        return {
+            "url": url, "codec": CODEC, "etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified"),
+            "version": resp.headers.get("ETag") or digest.hexdigest(), "checked": time.time(),
+        }
+
+    def fetch_all(self, urls):
+        # {url: Sheet or SheetError}, all sheets in flight at once
+        urls = [u for u in dict.fromkeys(urls) if u]
+        futures = {u: self.pool.submit(self.fetch, u) for u in urls}
+        out = {}
+        for u, fut in futures.items():
+            try: out[u] = fut.result()
+            except SheetError as e: out[u] = e
+        return out
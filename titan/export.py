@@ -0,0 +1,234 @@
+# --- TITAN EXPORT ---
+# Performance budgets, host configs and the site archive. The checkers are imported on first export.
+# export_site is the whole pipeline, run as a background job (see jobs.py).
+import io
+import os
+import time
+from typing import NamedTuple
+
+from .cache import shared_cache
+from .content import localize_site, sheet_source, sheets, site_languages
+from .generators import build_page, site_assets, site_pages
+from .theme import fonts_url
+
+# --- PERFORMANCE BUDGET CHECK ---
+def image_sizes(urls):
+    # Content-Length per image URL via concurrent HEAD requests, remembered per process
+    import requests
+    session, pool = sheet_source().session, sheet_source().pool
+    def head(u):
+        r = session.head(u, allow_redirects=True, timeout=5)
+        r.raise_for_status()
+        return int(r.headers.get("Content-Length") or 0)
+    def size(u):
+        # Failures are not cached, the next export asks again
+        try: return shared_cache().get_or_set("perf", ("img", u), lambda: head(u))
+        except (requests.RequestException, ValueError): return 0
+    futures = {u: pool.submit(size, u) for u in urls}
+    return {u: f.result() for u, f in futures.items()}
+
+def budget_report(cfg, pages):
+    # [(file, html)] -> per-page table rows and [(file, metric, value, budget)] over budget
+    from . import perf_budget
+    stats = [(f, perf_budget.analyze(doc, cfg.prod_url)) for f, doc in pages]
+    sizes = image_sizes({u for _, s in stats for u in s.images}) if cfg.budget_images else {}
+    report, over = [], []
+    for f, s in stats:
+        values = perf_budget.measure(s, sizes)
+        report.append({"Page": f, **{perf_budget.BUDGETS[m][0]: v for m, v in values.items()}, "Third parties": ", ".join(s.third_party)})
+        over += [(f, m, v, b) for m, v, b in perf_budget.over_budget(values, cfg.budgets)]
+    return report, over
+
+# --- HOST CONFIGS (CACHE HEADERS & PRELOADS) ---
+def site_host_configs(cfg, files):
+    # Early hints for what every page needs first: the font stylesheet. CSS is inlined, so there
+    # is no stylesheet of our own to preload. The icon sprite is not preloaded: <use href> fetches
+    # it as a plain same-origin request, which no preload destination matches, so it would
+    # download twice.
+    links = [
+        "<https://fonts.gstatic.com>; rel=preconnect; crossorigin",
+        f"<{fonts_url(cfg)}>; rel=preload; as=style",
+    ]
+    index_links = [f"<{cfg.hero_img_1}>; rel=preload; as=image; fetchpriority=high"] if cfg.show_hero and cfg.hero_img_1 else []
+    from . import host_config
+    return host_config.host_configs(files, links, index_links)
+
+# --- ARCHIVE ---
+# Reproducible output: entries sorted by path, every timestamp pinned to SOURCE_DATE_EPOCH
+# (default 1980-01-01, the earliest a ZIP can hold), regular files 0644 with no owner.
+# Identical settings and sheets give byte-identical archives, so uploads can dedupe.
+ARCHIVE_FORMATS = {     # format -> (extension, mime type)
+    "zip": (".zip", "application/zip"),
+    "tar.gz": (".tar.gz", "application/gzip"),
+    "tar.xz": (".tar.xz", "application/x-xz"),
+    "dir": ("", None),
+}
+ZIP_EPOCH = 315532800
+
+def source_date_epoch():
+    try: return max(int(os.environ.get("SOURCE_DATE_EPOCH", ZIP_EPOCH)), ZIP_EPOCH)
+    except ValueError: return ZIP_EPOCH
+
+def _sorted_files(files):
+    # Later entries win, as they would when unpacking
+    return sorted(dict(files).items())
+
+def build_zip(files, level=6):
+    import zipfile
+    stamp = time.gmtime(source_date_epoch())[:6]
+    z_b = io.BytesIO()
+    with zipfile.ZipFile(z_b, "w", zipfile.ZIP_DEFLATED, False, compresslevel=level) as zf:
+        for path, data in _sorted_files(files):
+            info = zipfile.ZipInfo(path, stamp)
+            info.compress_type, info.create_system = zipfile.ZIP_DEFLATED, 3
+            info.external_attr = 0o100644 << 16
+            # A ZipInfo entry ignores the archive's compresslevel, so it is passed per entry
+            zf.writestr(info, data, compresslevel=level)
+    return z_b.getvalue()
+
+def build_tar(files, compression="gz", level=6):
+    import tarfile
+    epoch, raw = source_date_epoch(), io.BytesIO()
+    # gzip stamps its own header with the current time and the file name unless told otherwise
+    if compression == "gz":
+        import gzip
+        out = gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=level, mtime=epoch)
+    else:
+        import lzma
+        out = lzma.LZMAFile(raw, "wb", preset=level)
+    with out, tarfile.open(fileobj=out, mode="w", format=tarfile.GNU_FORMAT) as tf:
+        for path, data in _sorted_files(files):
+            data = data.encode("utf-8") if isinstance(data, str) else data
+            info = tarfile.TarInfo(path)
+            info.size, info.mtime, info.mode = len(data), epoch, 0o644
+            tf.addfile(info, io.BytesIO(data))
+    return raw.getvalue()
+
+# Folder output: the builder only writes below EXPORT_BASE, and write_dir only replaces a
+# folder it wrote itself (one holding MARKER), so a typo cannot swap out the app or a home dir
+EXPORT_BASE = "dist"
+MARKER = ".titan"
+
+def export_path(name, base=EXPORT_BASE):
+    # Output Folder setting -> absolute path inside base; ValueError for anything that leaves it
+    base = os.path.realpath(base)
+    root = os.path.normpath(os.path.join(base, name or "."))
+    # Symlinks anywhere on the way are resolved before the check
+    if (os.path.isabs(name or "") or ".." in name.replace("\\", "/").split("/") or root == base
+            or os.path.commonpath([base, os.path.realpath(root)]) != base or os.path.islink(root)):
+        raise ValueError(f"Output folder must be a relative path inside {EXPORT_BASE}/: {name!r}")
+    return root
+
+def write_dir(files, root):
+    # Built next to the target and swapped in, so a half-written site is never published
+    import shutil, tempfile
+    root = os.path.abspath(root)
+    if os.path.lexists(root) and (os.path.islink(root) or not os.path.isdir(root)
+                                  or os.listdir(root) and not os.path.isfile(os.path.join(root, MARKER))):
+        raise ValueError(f"Refusing to replace {root}: not a folder written by a previous export")
+    parent = os.path.dirname(root)
+    os.makedirs(parent, exist_ok=True)
+    epoch, tmp = source_date_epoch(), tempfile.mkdtemp(prefix=".titan-", dir=parent)
+    os.chmod(tmp, 0o755)
+    for path, data in _sorted_files(files):
+        _write_file(os.path.join(tmp, *path.split("/")), data, epoch)
+    _write_file(os.path.join(tmp, MARKER), "Written by Titan; replaced on every export.\n", epoch)
+    old = None
+    if os.path.exists(root):
+        old = tempfile.mkdtemp(prefix=".titan-old-", dir=parent)
+        os.replace(root, os.path.join(old, "site"))
+    os.replace(tmp, root)
+    if old: shutil.rmtree(old, ignore_errors=True)
+    return root
+
+def _write_file(dest, data, epoch):
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    with open(dest, "wb") as f:
+        f.write(data.encode("utf-8") if isinstance(data, str) else data)
+    os.chmod(dest, 0o644)
+    os.utime(dest, (epoch, epoch))
+
+def publish_files(files, root, remove=()):
+    # Incremental update of a folder written by write_dir: every file is written next to its
+    # target and renamed over it, so a reader sees the old file or the new one, never half of
+    # one. Files go out in the given order and removals come last.
+    epoch = source_date_epoch()
+    for path, data in files:
+        dest = os.path.join(root, *path.split("/"))
+        tmp = os.path.join(os.path.dirname(dest), f".titan-{os.path.basename(dest)}")
+        _write_file(tmp, data, epoch)
+        os.replace(tmp, dest)
+    for path in remove:
+        try: os.remove(os.path.join(root, *path.split("/")))
+        except FileNotFoundError: pass
+
+def build_archive(files, fmt="zip", level=6):
+    if fmt == "zip": return build_zip(files, level)
+    if fmt in ("tar.gz", "tar.xz"): return build_tar(files, fmt[4:], level)
+    raise ValueError(f"Unknown archive format: {fmt}")
+
+# --- EXPORT PIPELINE ---
+# A tuple, so the shared cache can size the archive it holds
+class ExportResult(NamedTuple):
+    archive: bytes          # empty for directory output and blocked exports
+    file_name: str          # the output directory for "dir"
+    mime: str
+    files: int
+    report: list
+    over: list
+    blocked: bool
+
+def build_key(cfg):
+    # Same settings and same sheet versions -> same site
+    return cfg.digest(), tuple(sorted((u, s.version) for u, s in sheets(cfg).items()))
+
+def export_site(cfg, job):
+    # Same build key -> the archive comes straight from the cache
+    if cfg.archive_format == "dir":
+        # The directory on disk is the artifact, so it is always written
+        return _build_export(cfg, job)
+    job.cached = True
+    def build():
+        job.cached = False
+        return _build_export(cfg, job)
+    return shared_cache().get_or_set("export", build_key(cfg), build)
+
+def site_files(cfg, step=None):
+    # -> (pages, assets) as (path, text) pairs; translated pages included. step(label) runs
+    # before each unit of work (export progress and cancel points).
+    # Sheet-backed feeds first: the slowest part for big catalogs, and a cancel point after it
+    if step: step("data feeds")
+    assets = site_assets(cfg)
+    pages = []
+    for f, title, builder in site_pages(cfg):
+        if step: step(f)
+        pages.append((f, build_page(cfg, title, builder())))
+    return localize_site(cfg, pages, step=step), assets
+
+def cached_site_files(cfg):
+    # Every page and asset as one list, built once per build key (the preview server republishes
+    # on each rerun, and most reruns change nothing)
+    def build():
+        pages, assets = site_files(cfg)
+        return tuple(pages + assets)
+    return shared_cache().get_or_set("export", ("files",) + build_key(cfg), build)
+
+def _build_export(cfg, job):
+    # A bad output folder fails before any work
+    root = export_path(cfg.export_dir) if cfg.archive_format == "dir" else None
+    job.total = len(site_pages(cfg)) * (1 + len(site_languages(cfg))) + 3
+    pages, assets = site_files(cfg, job.step)
+
+    job.step("budgets")
+    report, over = budget_report(cfg, pages)
+    ext, mime = ARCHIVE_FORMATS[cfg.archive_format]
+    file_name = f"{cfg.biz_name.lower().replace(' ','_')}_site{ext}"
+    if over and cfg.budget_mode == "Block download":
+        return ExportResult(b"", file_name, mime, len(pages), report, over, True)
+
+    job.step("archive")
+    files = pages + assets
+    files += site_host_configs(cfg, [f for f, _ in files])
+    if cfg.archive_format == "dir":
+        return ExportResult(b"", write_dir(files, root), mime, len(files), report, over, False)
+    return ExportResult(build_archive(files, cfg.archive_format, cfg.archive_level), file_name, mime, len(files), report, over, False)
@@ -0,0 +1,922 @@
+# --- TITAN GENERATORS ---
+# HTML/JS generators for every page section. Defined once per process; everything they read
+# from the builder UI comes in through the SiteConfig (`cfg`) built on each rerun.
+import json
+
+from markupsafe import Markup
+
+from .content import blog_assets, get_blog_feed, get_store_index, lang_switch_links, post_slug, store_assets
+from .icons import icon_sprite, icon_svg
+from .templates import PAGE_SHELL, cached, fragment, js, render
+from .theme import fonts_url, get_lite_css, get_theme_css, get_theme_vars
+
+# --- SPECULATIVE NAVIGATION SETTINGS ---
+# Page types: key -> (label, default mode index: 0 Off, 1 Prefetch, 2 Prerender)
+PREFETCH_TYPES = {
+    "pages": ("Site pages (nav & footer links)", 2),
+    "product": ("Product pages (store cards)", 1),
+    "post": ("Blog posts (blog cards)", 1),
+}
+PREFETCH_PAGES = ["index.html", "about.html", "contact.html", "booking.html", "blog.html", "privacy.html", "terms.html"]
+
+def clean_wa(cfg):
+    # wa.me wants digits only
+    return cfg.wa_num.replace("+", "").replace(" ", "").replace("-", "")
+
+def gen_schema(cfg):
+    schema = {
+        "@context": "https://schema.org",
+        "@type": "LocalBusiness",
+        "name": cfg.biz_name,
+        "image": cfg.logo_url or cfg.hero_img_1,
+        "telephone": cfg.biz_phone,
+        "email": cfg.biz_email,
+        "areaServed": cfg.seo_area,
+        "address": {"@type": "PostalAddress", "streetAddress": cfg.biz_addr},
+        "url": cfg.prod_url,
+        "description": cfg.seo_d
+    }
+    return fragment("schema", schema=schema)
+
+# --- NEW: PWA GENERATORS ---
+def gen_pwa_manifest(cfg):
+    return json.dumps({
+        "name": cfg.biz_name,
+        "short_name": cfg.pwa_short,
+        "start_url": "./index.html",
+        "display": "standalone",
+        "background_color": "#ffffff",
+        "theme_color": cfg.p_color,
+        "description": cfg.pwa_desc,
+        "icons": [{"src": cfg.pwa_icon, "sizes": "512x512", "type": "image/png"}]
+    })
+
+def gen_sw():
+    return f"""
+    self.addEventListener('install', (e) => {{
+      e.waitUntil(caches.open('titan-store').then((cache) => cache.addAll(['./index.html', './contact.html', './{icon_sprite()[0]}'])));
+    }});
+    self.addEventListener('fetch', (e) => {{
+      e.respondWith(caches.match(e.request).then((response) => response || fetch(e.request)));
+    }});
+    """
+
+
+def gen_nav(cfg):
+    # Lite pages open the menu with a checkbox instead of a click handler
+    # (lang links are rewritten per page by the static language build)
+    return fragment("nav", lite=cfg.lite, logo_url=cfg.logo_url, biz_name=cfg.biz_name, phone=cfg.biz_phone,
+                    show_features=cfg.show_features, show_pricing=cfg.show_pricing, show_inventory=cfg.show_inventory,
+                    show_blog=cfg.show_blog, show_booking=cfg.show_booking, lang_links=Markup(lang_switch_links(cfg, "index.html", "en")))
+
+def gen_hero(cfg):
+    # Lite: the slides cycle on a CSS keyframe loop (see get_lite_css)
+    return fragment("hero", lite=cfg.lite, images=(cfg.hero_img_1, cfg.hero_img_2, cfg.hero_img_3), title=cfg.hero_h, sub=cfg.hero_sub)
+
+def gen_features(cfg):
+    cards = []
+    lines = [x for x in cfg.feat_data_input.split('\n') if x.strip()]
+    for n, line in enumerate(lines, 1):
+        parts = line.split('|')
+        if len(parts) >= 3:
+            cards.append((n, parts[0], parts[1].strip(), parts[2].strip()))
+    return fragment("features", title=cfg.f_title, cards=cards)
+
+def gen_stats(cfg):
+    return fragment("stats", stats=[(cfg.stat_1, cfg.label_1), (cfg.stat_2, cfg.label_2), (cfg.stat_3, cfg.label_3)])
+
+def gen_pricing_table(cfg):
+    if not cfg.show_pricing: return ""
+    return fragment("pricing", rival=cfg.wix_name, price=cfg.titan_price, annual=cfg.titan_mo, rival_annual=cfg.wix_mo, savings=cfg.save_val)
+
+# Sheet text is escaped before it goes into innerHTML. Declared once per page, whichever
+# script comes first.
+ESC_JS = """window.esc = window.esc || ((v) => String(v == null ? '' : v).replace(/[&<>"']/g, (c) => ({'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;',"'":'&#39;'})[c]));"""
+
+def gen_csv_parser():
+    # Preserved CSV + Markdown Parser
+    return """
+    <script>
+    """ + ESC_JS + """
+    function parseCSVLine(str) {
+        const res = []; let cur = ''; let inQuote = false;
+        for (let i = 0; i < str.length; i++) {
+            const c = str[i];
+            if (c === '"') { if (inQuote && str[i+1] === '"') { cur += '"'; i++; } else { inQuote = !inQuote; } }
+            else if (c === ',' && !inQuote) { res.push(cur.trim()); cur = ''; } else { cur += c; }
+        }
+        res.push(cur.trim()); return res;
+    }
+    function parseMarkdown(text) {
+        if (!text) return '';
+        let html = esc(text).replace(/\\r\\n/g, '\\n').replace(/\\n/g, '<br>').replace(/\\*\\*(.*?)\\*\\*/g, '<strong>$1</strong>');
+        return html;
+    }
+    </script>
+    """
+
+# --- NEW: SHOPPING CART & PAYMENT JS (FIXED) ---
+def gen_cart_system(cfg):
+    return f"""
+    <div id="cart-float" onclick="toggleCart()" style="display:none;">
+        <span>🛒</span> <span id="cart-count">0</span>
+    </div>
+    <div id="cart-overlay" onclick="toggleCart()"></div>
+    <div id="cart-modal">
+        <h3 data-t="cart.title">Your Cart</h3>
+        <div id="cart-items" style="max-height:300px; overflow-y:auto; margin:1rem 0;"></div>
+        <div style="font-weight:bold; font-size:1.2rem; margin-bottom:1rem; text-align:right;">Total: <span id="cart-total">0.00</span></div>
+        <button onclick="checkoutWhatsApp()" class="btn btn-accent" style="width:100%" data-t="cart.checkout">Checkout via WhatsApp</button>
+    </div>
+    
+    <div id="cart-toast" role="status" aria-live="polite"></div>
+    
+    <script>
+    // NEW: Cart store. One line per SKU with a quantity, prices parsed once at add time,
+    // rows patched in place, writes debounced and mirrored to other open tabs.
+    const CART_KEY = 'titanCart';
+    const waNumber = {js(clean_wa(cfg))};
+    const payLinks = {js(f"UPI: {cfg.upi_id} | PayPal: {cfg.paypal_link}")};
+    const cartBus = 'BroadcastChannel' in window ? new BroadcastChannel('titan-cart') : null;
+    const cartRows = new Map();
+    let cart = readCart(localStorage.getItem(CART_KEY));
+    let saveTimer = null, toastTimer = null;
+
+    function cartPrice(p) {{ return typeof p === 'number' ? p : (parseFloat(String(p).replace(/[^0-9.]/g, '')) || 0); }}
+    function cartSku(name) {{ return String(name).trim().toLowerCase(); }}
+
+    function readCart(raw) {{
+        const m = new Map();
+        let data;
+        try {{ data = JSON.parse(raw); }} catch (e) {{ data = null; }}
+        if (data && data.v === 2) {{
+            data.lines.forEach(([sku, name, price, label, qty]) => m.set(sku, {{name, price, label, qty}}));
+        }} else if (Array.isArray(data)) {{
+            // Old format: one {{name, price}} entry per click
+            data.forEach(i => {{
+                const sku = cartSku(i.name), line = m.get(sku);
+                if (line) line.qty++;
+                else m.set(sku, {{name: i.name, price: cartPrice(i.price), label: String(i.price), qty: 1}});
+            }});
+        }}
+        return m;
+    }}
+    function serializeCart() {{
+        return JSON.stringify({{v: 2, lines: [...cart].map(([sku, l]) => [sku, l.name, l.price, l.label, l.qty])}});
+    }}
+    function saveCart() {{
+        clearTimeout(saveTimer);
+        saveTimer = setTimeout(flushCart, 150);
+    }}
+    function flushCart() {{
+        if (saveTimer === null) return;
+        clearTimeout(saveTimer); saveTimer = null;
+        const raw = serializeCart();
+        localStorage.setItem(CART_KEY, raw);
+        if (cartBus) cartBus.postMessage(raw);
+    }}
+
+    function cartRow(sku) {{
+        const row = document.createElement('div');
+        row.className = 'cart-item';
+        row.dataset.sku = sku;
+        row.innerHTML = '<span class="cart-name"></span><span class="cart-qty"><button data-act="dec" aria-label="Less">&minus;</button><b></b><button data-act="inc" aria-label="More">+</button></span><span class="cart-line"></span><button class="cart-rm" data-act="rm" aria-label="Remove">&times;</button>';
+        row.firstChild.textContent = cart.get(sku).name;
+        return row;
+    }}
+    function patchRow(sku) {{
+        const box = document.getElementById('cart-items');
+        if (!box) return;
+        const line = cart.get(sku);
+        let row = cartRows.get(sku);
+        if (!line) {{
+            if (row) {{ row.remove(); cartRows.delete(sku); }}
+            return;
+        }}
+        if (!row) {{ row = cartRow(sku); cartRows.set(sku, row); box.appendChild(row); }}
+        row.querySelector('b').textContent = line.qty;
+        row.querySelector('.cart-line').textContent = (line.price * line.qty).toFixed(2);
+    }}
+    function patchTotals() {{
+        let count = 0, total = 0;
+        cart.forEach(l => {{ count += l.qty; total += l.price * l.qty; }});
+        document.getElementById('cart-count').textContent = count;
+        document.getElementById('cart-total').textContent = total.toFixed(2);
+        document.getElementById('cart-float').style.display = count > 0 ? 'flex' : 'none';
+    }}
+    function renderCart() {{
+        // Reconcile every row (first paint and changes from another tab)
+        cartRows.forEach((row, sku) => {{ if (!cart.has(sku)) patchRow(sku); }});
+        cart.forEach((l, sku) => patchRow(sku));
+        patchTotals();
+    }}
+    function setQty(sku, qty) {{
+        const line = cart.get(sku);
+        if (!line) return;
+        if (qty > 0) line.qty = qty; else cart.delete(sku);
+        patchRow(sku); patchTotals(); saveCart();
+    }}
+
+    function cartToast(msg) {{
+        const t = document.getElementById('cart-toast');
+        t.textContent = msg;
+        t.classList.add('show');
+        clearTimeout(toastTimer);
+        toastTimer = setTimeout(() => t.classList.remove('show'), 1800);
+    }}
+    function addToCart(name, price, sku) {{
+        sku = sku || cartSku(name);
+        const line = cart.get(sku);
+        if (line) line.qty++;
+        else cart.set(sku, {{name: String(name), price: cartPrice(price), label: String(price), qty: 1}});
+        patchRow(sku); patchTotals(); saveCart();
+        cartToast(name + " added!");
+    }}
+    function remItem(sku) {{ setQty(sku, 0); }}
+    function toggleCart() {{ 
+        const m = document.getElementById('cart-modal'); 
+        m.style.display = m.style.display === 'block' ? 'none' : 'block'; 
+        document.getElementById('cart-overlay').style.display = m.style.display;
+    }}
+    function checkoutWhatsApp() {{
+        let msg = "New Order:%0A";
+        let total = 0;
+        cart.forEach(l => {{ msg += encodeURIComponent(`- ${{l.qty}} x ${{l.name}} (${{l.label}})`) + '%0A'; total += l.price * l.qty; }});
+        msg += `%0ATotal: ${{total.toFixed(2)}}%0A%0A${{encodeURIComponent(payLinks)}}`;
+        // FIX: Use the JS constant waNumber here, not the python variable name
+        window.open(`https://wa.me/${{waNumber}}?text=${{msg}}`, '_blank');
+        cart = new Map(); renderCart(); saveCart(); flushCart(); toggleCart();
+    }}
+
+    function adoptCart(raw) {{ cart = readCart(raw); renderCart(); }}
+    if (cartBus) cartBus.onmessage = (e) => adoptCart(e.data);
+    else window.addEventListener('storage', (e) => {{ if (e.key === CART_KEY) adoptCart(e.newValue); }});
+    window.addEventListener('pagehide', flushCart);
+    document.addEventListener('visibilitychange', () => {{ if (document.visibilityState === 'hidden') flushCart(); }});
+    document.addEventListener('DOMContentLoaded', () => {{
+        document.getElementById('cart-items').addEventListener('click', (e) => {{
+            const act = e.target.dataset.act, row = e.target.closest('.cart-item');
+            if (!act || !row) return;
+            const line = cart.get(row.dataset.sku);
+            if (!line) return;
+            setQty(row.dataset.sku, act === 'inc' ? line.qty + 1 : act === 'dec' ? line.qty - 1 : 0);
+        }});
+        renderCart();
+    }});
+    </script>
+    """
+
+def gen_inventory_js(cfg, is_demo=False):
+    # UPDATED: Removed hardcoded color:var(--p) to fix dark mode
+    # NEW: Search runs against store-index.json (built at export). If that file is
+    # missing (preview, stale host) the same index is built from the CSV in the browser.
+    demo_flag = "const isDemo = true;" if is_demo else "const isDemo = false;"
+    return f"""
+    {gen_csv_parser()}
+    <script>
+    {demo_flag}
+    let store = null;
+    async function buildStoreFromSheet() {{
+        const res = await fetch({js(cfg.sheet_url)});
+        const lines = (await res.text()).split(/\\r\\n|\\n/);
+        const head = parseCSVLine(lines[0] || '').map(h => h.toLowerCase());
+        const catCol = head.indexOf('category') > -1 ? head.indexOf('category') : 5;
+        const items = [], post = {{}}, facets = {{}};
+        for(let i=1; i<lines.length; i++) {{
+            if(!lines[i].trim()) continue;
+            const c = parseCSVLine(lines[i]);
+            if(c.length < 2 || !c[0]) continue;
+            const id = items.length, cat = c[catCol] || '';
+            items.push([c[0], parseFloat(c[1].replace(/[^0-9.]/g, '')) || 0, c[1], c[2] || '', c[3] && c[3].length > 5 ? c[3] : '', c[4] && c[4].includes('http') ? c[4] : '', cat]);
+            new Set(`${{c[0]}} ${{c[2] || ''}} ${{c[1]}}`.toLowerCase().match(/[a-z0-9]+/g) || []).forEach(t => (post[t] = post[t] || []).push(id));
+            if(cat) (facets[cat] = facets[cat] || []).push(id);
+        }}
+        return {{ items, terms: Object.entries(post).sort((a, b) => a[0] < b[0] ? -1 : 1), facets }};
+    }}
+    function prefixIds(token) {{
+        // Binary search to the first term >= token, then walk the prefix range
+        const terms = store.terms;
+        let lo = 0, hi = terms.length;
+        while(lo < hi) {{ const mid = (lo + hi) >> 1; if(terms[mid][0] < token) lo = mid + 1; else hi = mid; }}
+        const ids = new Set();
+        for(let i = lo; i < terms.length && terms[i][0].startsWith(token); i++) terms[i][1].forEach(id => ids.add(id));
+        return ids;
+    }}
+    function applyFilters() {{
+        const q = (document.getElementById('inv-q').value.toLowerCase().match(/[a-z0-9]+/g) || []);
+        const cat = document.getElementById('inv-cat').value;
+        const min = parseFloat(document.getElementById('inv-min').value);
+        const max = parseFloat(document.getElementById('inv-max').value);
+        const sort = document.getElementById('inv-sort').value;
+        let ids = null;
+        for(const token of q) {{
+            const hit = prefixIds(token);
+            ids = ids === null ? hit : new Set([...ids].filter(id => hit.has(id)));
+        }}
+        if(cat) {{
+            const inCat = new Set(store.facets[cat] || []);
+            ids = ids === null ? inCat : new Set([...ids].filter(id => inCat.has(id)));
+        }}
+        let list = ids === null ? store.items.map((_, i) => i) : [...ids].sort((a, b) => a - b);
+        if(!isNaN(min)) list = list.filter(i => store.items[i][1] >= min);
+        if(!isNaN(max)) list = list.filter(i => store.items[i][1] <= max);
+        if(sort) list.sort((a, b) => sort === 'asc' ? store.items[a][1] - store.items[b][1] : store.items[b][1] - store.items[a][1]);
+        renderInv(list);
+    }}
+    function renderInv(list) {{
+        const box = document.getElementById('inv-grid');
+        box.innerHTML = list.length ? list.map(i => {{
+            const c = store.items[i];
+            const btn = c[5]
+                ? `<a href="${{esc(c[5])}}" class="btn btn-primary" style="padding:0.6rem; width:100%;">Buy Now</a>`
+                : `<button onclick="addItem(${{i}})" class="btn" style="padding:0.6rem; width:100%;">Add to Cart</button>`;
+            return `
+            <div class="card reveal">
+                <img src="${{esc(c[4] || {js(cfg.custom_feat)})}}" class="prod-img" loading="lazy">
+                <div>
+                    <h3><a href="product.html?item=${{encodeURIComponent(c[0])}}">${{esc(c[0])}}</a></h3>
+                    <p style="font-weight:bold; color:var(--s);">${{esc(c[2])}}</p>
+                    <p style="font-size:0.9rem; opacity:0.8;">${{esc(c[3])}}</p>
+                    ${{btn}}
+                </div>
+            </div>`;
+        }}).join('') : '<p style="text-align:center; padding:2rem;">No matching products.</p>';
+        window.dispatchEvent(new Event('scroll'));
+    }}
+    function addItem(i) {{ addToCart(store.items[i][0], store.items[i][2]); }}
+    async function loadInv() {{
+        try {{
+            try {{
+                const res = await fetch('store-index.json');
+                if(!res.ok) throw new Error(res.status);
+                store = await res.json();
+            }} catch(e) {{ store = await buildStoreFromSheet(); }}
+            const cats = Object.keys(store.facets).sort();
+            const sel = document.getElementById('inv-cat');
+            if(cats.length) sel.insertAdjacentHTML('beforeend', cats.map(c => `<option value="${{esc(c)}}">${{esc(c)}}</option>`).join(''));
+            else sel.style.display = 'none';
+            document.getElementById('inv-filters').addEventListener('input', applyFilters);
+            applyFilters();
+        }} catch(e) {{ console.log(e); }}
+    }}
+    if(document.getElementById('inv-grid')) window.addEventListener('load', loadInv);
+    </script>
+    """
+
+def gen_inventory(cfg):
+    if not cfg.show_inventory: return ""
+    if cfg.lite: return gen_inventory_static(cfg)
+    return f"""
+    <section id="inventory" style="background:rgba(0,0,0,0.02)"><div class="container">
+        <div class="section-head reveal"><h2 data-t="store.title">Portfolio & Store</h2><p data-t="store.sub">Secure Checkout available.</p></div>
+        <div id="inv-filters" class="inv-filters">
+            <input id="inv-q" type="search" placeholder="Search products..." aria-label="Search products">
+            <select id="inv-cat" aria-label="Category"><option value="">All Categories</option></select>
+            <input id="inv-min" type="number" min="0" placeholder="Min price" aria-label="Minimum price">
+            <input id="inv-max" type="number" min="0" placeholder="Max price" aria-label="Maximum price">
+            <select id="inv-sort" aria-label="Sort"><option value="">Featured</option><option value="asc">Price: Low to High</option><option value="desc">Price: High to Low</option></select>
+        </div>
+        <div id="inv-grid" class="grid-3"><div style="text-align:center; padding:4rem;">Loading Store...</div></div>
+    </div></section>
+    {gen_inventory_js(cfg, is_demo=False)}
+    """
+
+# --- NEW: LITE (ZERO-JS) STORE ---
+# The store index is rendered at build time: static cards, one page per product and a
+# WhatsApp order link (or the product's own Buy link) instead of the cart runtime.
+def product_pages(cfg):
+    # [(file, item)] for every store item; slugs are made unique in catalog order
+    index, seen, out = get_store_index(cfg), set(), []
+    for item in index["items"] if index else []:
+        base = post_slug(item[0]) or "item"
+        slug, n = base, 2
+        while slug in seen: slug, n = f"{base}-{n}", n + 1
+        seen.add(slug)
+        out.append((f"product-{slug}.html", item))
+    return out
+
+def buy_link(cfg, item, style=""):
+    return render("buy_link", stripe=item[5], wa_num=clean_wa(cfg), order=f"I'd like to order: {item[0]} ({item[2]})", style=style)
+
+def gen_inventory_static(cfg):
+    cards = [(f, item[0], item[2], item[3], item[4] or cfg.custom_feat, Markup(buy_link(cfg, item, "padding:0.6rem; width:100%;"))) for f, item in product_pages(cfg)]
+    return fragment("store", cards=cards)
+
+def gen_product_static(cfg, file, item):
+    if item is None: return gen_inner_header("Product Details")
+    return fragment("product", name=item[0], price=item[2], desc=item[3], img=item[4] or cfg.custom_feat,
+                    buy=Markup(buy_link(cfg, item)), url=f"{cfg.prod_url.rstrip('/')}/{file}")
+
+def gen_about_section(cfg):
+    return fragment("about", title=cfg.about_h_in, summary=cfg.about_short_in, image=cfg.about_img)
+
+def gen_faq_section(cfg):
+    items = []
+    for n, line in enumerate(cfg.faq_data.split('\n'), 1):
+        if "?" in line and line.strip():
+            q, a = line.split('?', 1)
+            items.append((n, q.strip(), a.replace('?', '').strip()))
+    return fragment("faq", items=items)
+
+def gen_footer(cfg):
+    # (Preserved Social Icons & Layout)
+    links = [(cfg.fb_link, "Facebook", "facebook"), (cfg.ig_link, "Instagram", "instagram"), (cfg.x_link, "X (Twitter)", "x"),
+             (cfg.li_link, "LinkedIn", "linkedin"), (cfg.yt_link, "YouTube", "youtube")]
+    socials = [link for link in links if link[0]]
+    return fragment("footer", biz_name=cfg.biz_name, address=cfg.biz_addr, socials=socials)
+
+def gen_wa_widget(cfg):
+    # FIX: Sanitize here too for the floating button
+    if not cfg.wa_num: return ""
+    return fragment("wa", number=clean_wa(cfg))
+
+def gen_scripts():
+    return """
+    <script>
+    window.addEventListener('scroll', () => {
+        var reveals = document.querySelectorAll('.reveal');
+        for (var i = 0; i < reveals.length; i++) {
+            var windowHeight = window.innerHeight;
+            var elementTop = reveals[i].getBoundingClientRect().top;
+            var elementVisible = 150;
+            if (elementTop < windowHeight - elementVisible) { reveals[i].classList.add('active'); }
+        }
+    });
+    window.dispatchEvent(new Event('scroll'));
+    </script>
+    """
+
+# --- NEW: SPECULATIVE NAVIGATION ---
+def gen_prefetch(cfg):
+    # Identical on every page, so it is compiled once per setting combination
+    key = ("prefetch", tuple(cfg.prefetch_modes.items()), cfg.prefetch_eagerness, cfg.lite, cfg.show_booking)
+    return cached(key, lambda: _compile_prefetch(cfg))
+
+def _compile_prefetch(cfg):
+    # Speculation Rules for browsers that have them (they already stand down on Save-Data);
+    # elsewhere a hover/touchstart <link rel=prefetch>, plus idle prefetch of the likely
+    # next page. Post pages share one shell, so their JSON shard is fetched too.
+    # Lite pages keep the rules (data, not script) and drop the fallback.
+    detail = "-*" if cfg.lite else ""
+    patterns = {
+        "pages": [{"href_matches": {"pathname": f"*/{p}"}} for p in PREFETCH_PAGES],
+        "product": [{"href_matches": {"pathname": f"*/product{detail}.html"}}],
+        "post": [{"href_matches": {"pathname": f"*/post{detail}.html"}}],
+    }
+    rules = {}
+    for t, mode in cfg.prefetch_modes.items():
+        if mode == "Off": continue
+        where = {"or": patterns[t]} if len(patterns[t]) > 1 else patterns[t][0]
+        rules.setdefault(mode.lower(), []).append({"source": "document", "where": where, "eagerness": cfg.prefetch_eagerness})
+    if not rules: return ""
+    if cfg.lite: return f'<script type="speculationrules">{js(rules)}</script>'
+    types = [t for t, mode in cfg.prefetch_modes.items() if mode != "Off"]
+    likely = {"index.html": "booking.html" if cfg.show_booking else "contact.html", "about.html": "contact.html", "product.html": "contact.html"}
+    return f"""
+    <script type="speculationrules">{js(rules)}</script>
+    <script>
+    (function() {{
+        var c = navigator.connection;
+        if (c && (c.saveData || /2g/.test(c.effectiveType || ''))) return;
+        var done = {{}}, types = {js(types)}, pages = {js(PREFETCH_PAGES)}, likely = {js(likely)};
+        var speculates = HTMLScriptElement.supports && HTMLScriptElement.supports('speculationrules');
+        function hint(href) {{
+            if (done[href]) return;
+            done[href] = true;
+            var l = document.createElement('link');
+            l.rel = 'prefetch'; l.href = href;
+            document.head.appendChild(l);
+        }}
+        function typeOf(u) {{
+            if (u.origin !== location.origin || u.pathname === location.pathname) return null;
+            var f = u.pathname.split('/').pop() || 'index.html';
+            if (f === 'product.html') return 'product';
+            if (f === 'post.html') return 'post';
+            return pages.indexOf(f) >= 0 ? 'pages' : null;
+        }}
+        function warm(a) {{
+            var u = new URL(a.href, location.href), t = typeOf(u);
+            if (!t || types.indexOf(t) < 0) return;
+            if (!speculates) hint(u.href);
+            if (t === 'post' && u.searchParams.get('id')) hint('blog/posts/' + encodeURIComponent(u.searchParams.get('id')) + '.json');
+        }}
+        var timer = null;
+        document.addEventListener('pointerover', function(e) {{
+            var a = e.target.closest && e.target.closest('a[href]');
+            clearTimeout(timer);
+            if (a) timer = setTimeout(function() {{ warm(a); }}, 65);
+        }}, {{passive: true}});
+        document.addEventListener('touchstart', function(e) {{
+            var a = e.target.closest && e.target.closest('a[href]');
+            if (a) warm(a);
+        }}, {{passive: true}});
+        var next = likely[location.pathname.split('/').pop() || 'index.html'];
+        if (next && types.indexOf('pages') >= 0) (window.requestIdleCallback || setTimeout)(function() {{ hint(next); }});
+    }})();
+    </script>
+    """
+
+# --- NEW: RUM BEACON ---
+def gen_rum_beacon(cfg):
+    # One beacon per page view, sent when the page is hidden. INP is the worst interaction
+    # (98th percentile past 50), CLS the largest session window, "sheet" the slowest data fetch.
+    site = cfg.rum_site.strip() or post_slug(cfg.biz_name)
+    return f"""
+    <script>
+    (function() {{
+        var E = {js(cfg.rum_endpoint)}, S = {js(site)};
+        if (!navigator.sendBeacon || Math.random() * 100 >= {cfg.rum_sample}) return;
+        var v = {{}}, sent = false, sess = 0, sessStart = 0, sessLast = 0, inter = {{}};
+        function po(type, cb, opts) {{
+            try {{ new PerformanceObserver(function(l) {{ l.getEntries().forEach(cb); }}).observe(Object.assign({{type: type, buffered: true}}, opts)); }} catch (e) {{}}
+        }}
+        // Prerendered pages (see gen_prefetch) are timed from activation, not from the speculative load
+        var nav = performance.getEntriesByType('navigation')[0], act = (nav && nav.activationStart) || 0;
+        po('largest-contentful-paint', function(e) {{ v.lcp = Math.max(0, e.startTime - act); }});
+        po('layout-shift', function(e) {{
+            if (e.hadRecentInput) return;
+            if (sess && e.startTime - sessLast < 1000 && e.startTime - sessStart < 5000) sess += e.value;
+            else {{ sess = e.value; sessStart = e.startTime; }}
+            sessLast = e.startTime;
+            v.cls = Math.max(v.cls || 0, sess);
+        }});
+        po('event', function(e) {{ if (e.interactionId) inter[e.interactionId] = Math.max(inter[e.interactionId] || 0, e.duration); }}, {{durationThreshold: 16}});
+        function send() {{
+            if (sent) return;
+            sent = true;
+            if (nav) v.ttfb = Math.max(0, nav.responseStart - act);
+            var d = Object.keys(inter).map(function(k) {{ return inter[k]; }}).sort(function(a, b) {{ return b - a; }});
+            if (d.length) v.inp = d[Math.min(d.length - 1, Math.floor(d.length / 50))];
+            performance.getEntriesByType('resource').forEach(function(r) {{
+                if (/output=csv|\.csv(\?|$)|store-index\.json|blog\/(feed|posts)\//.test(r.name)) v.sheet = Math.max(v.sheet || 0, r.duration);
+            }});
+            v.site = S; v.page = location.pathname;
+            navigator.sendBeacon(E, JSON.stringify(v));
+        }}
+        addEventListener('visibilitychange', function() {{ if (document.visibilityState === 'hidden') send(); }});
+        addEventListener('pagehide', send);
+    }})();
+    </script>
+    """
+
+
+def page_parts(cfg, title, content, extra_js=""):
+    # Content is either one HTML string or a list of (section_id, html) pairs
+    if isinstance(content, str): content = [("content", content)]
+    # NEW: PWA Meta Tags
+    pwa_tags = fragment("pwa", theme_color=cfg.p_color, icon=cfg.pwa_icon)
+    
+    # NEW: SW Registration
+    sw_script = """
+    <script>
+    if ('serviceWorker' in navigator) { navigator.serviceWorker.register('service-worker.js'); }
+    </script>
+    """
+    
+    head = [
+        ("meta", fragment("head", title=title, biz_name=cfg.biz_name, description=cfg.seo_d, gsc_tag=cfg.gsc_tag)),
+        ("pwa", pwa_tags),
+        ("schema", gen_schema(cfg)),
+        ("fonts", fragment("fonts", href=fonts_url(cfg))),
+        ("vars", f'<style id="theme-vars">{get_theme_vars(cfg)}</style>'),
+        ("css", f"<style>{get_theme_css(cfg)}</style>"),
+    ]
+    if cfg.lite:
+        # Zero-JS profile: CSS stand-ins, no cart, reveal handler or service worker
+        head.append(("lite", f"<style>{get_lite_css(cfg)}</style>"))
+        body = [("nav", gen_nav(cfg))] + list(content) + [("footer", gen_footer(cfg)), ("wa", gen_wa_widget(cfg)), ("extra", extra_js)]
+        return head, body
+    body = [("nav", gen_nav(cfg))] + list(content) + [
+        ("footer", gen_footer(cfg)),
+        ("wa", gen_wa_widget(cfg)),
+        ("cart", gen_cart_system(cfg)),
+        ("scripts", gen_scripts()),
+        ("sw", sw_script),
+        ("extra", extra_js),
+    ]
+    return head, body
+
+def render_page(head, body, mark_sections=False):
+    # Every part is finished HTML, so the shell is a plain join rather than a template.
+    # mark_sections wraps each body part in a layout-neutral marker for the live preview
+    if mark_sections: body = [(sid, f'<div data-lp="{sid}" style="display:contents">{part}</div>') for sid, part in body]
+    return PAGE_SHELL.format(head="".join(part for _, part in head), body="".join(part for _, part in body))
+
+def build_page(cfg, title, content, extra_js=""):
+    head, body = page_parts(cfg, title, content, extra_js)
+    # Field data only comes from the published site, never from the preview
+    if cfg.rum_on: body.append(("rum", gen_rum_beacon(cfg)))
+    body.append(("prefetch", gen_prefetch(cfg)))
+    return render_page(head, body)
+
+# --- CONTENT GENERATORS (Blog, Product, Booking) ---
+
+def gen_booking_content(cfg):
+    # The embed code is the user's own widget markup and is kept as HTML
+    return fragment("booking", title=cfg.booking_title, desc=cfg.booking_desc, embed=Markup(cfg.booking_embed))
+
+def blog_card(p, href=None):
+    return fragment("blog_card", image=p["image"], category=p["category"], title=p["title"], excerpt=p["excerpt"],
+                    href=href or f"post.html?id={p['slug']}")
+
+def gen_blog_index_html(cfg):
+    # UPDATED: Removed inline color style so CSS handles dark mode
+    hero = fragment("blog_hero", image=cfg.hero_img_1, title=cfg.blog_hero_title, sub=cfg.blog_hero_sub)
+    feed = get_blog_feed(cfg)
+    if cfg.lite:
+        # Every post on one static page, each linking to its own pre-rendered file
+        cards = "".join(blog_card(p, f"post-{p['slug']}.html") for page in (feed[0] if feed else []) for p in page)
+        cards = cards or '<p data-t="blog.empty">No posts yet.</p>'
+        return hero + f'<section><div class="container"><div class="grid-3">{cards}</div></div></section>'
+    if not feed:
+        return hero + gen_blog_index_runtime(cfg)
+    # NEW: First page is baked into the HTML; later pages come from small JSON feed files
+    pages, _ = feed
+    more_btn = '<div style="text-align:center; margin-top:2rem;"><button id="blog-more" class="btn btn-primary" onclick="loadMorePosts()" data-t="blog.more">Load More</button></div>' if len(pages) > 1 else ''
+    return hero + f"""
+    <section><div class="container"><div id="blog-grid" class="grid-3">{"".join(blog_card(p) for p in pages[0])}</div>{more_btn}</div></section>
+    <script>
+    {ESC_JS}
+    let blogPage = 1;
+    const blogPages = {len(pages)};
+    async function loadMorePosts() {{
+        try {{
+            const res = await fetch(`blog/feed-${{blogPage + 1}}.json`);
+            const feed = await res.json();
+            blogPage = feed.page;
+            const cards = feed.posts.map(p => `<div class="card reveal"><img src="${{esc(p.image)}}" class="prod-img" loading="lazy"><div><span class="blog-badge">${{esc(p.category)}}</span><h3><a href="post.html?id=${{encodeURIComponent(p.slug)}}">${{esc(p.title)}}</a></h3><p style="font-size:0.9rem; opacity:0.8;">${{esc(p.excerpt)}}</p></div></div>`);
+            document.getElementById('blog-grid').insertAdjacentHTML('beforeend', cards.join(''));
+            if (blogPage >= blogPages) document.getElementById('blog-more').remove();
+            window.dispatchEvent(new Event('scroll'));
+        }} catch(e) {{}}
+    }}
+    </script>
+    """
+
+def gen_blog_index_runtime(cfg):
+    # Fallback when the sheet can't be read at build time: the page reads the CSV itself
+    return f"""
+    <section><div class="container"><div id="blog-grid" class="grid-3">Loading...</div></div></section>
+    {gen_csv_parser()}
+    <script>
+    async function loadBlog() {{
+        try {{
+            const res = await fetch({js(cfg.blog_sheet_url)});
+            const txt = await res.text();
+            const lines = txt.split(/\\r\\n|\\n/);
+            const box = document.getElementById('blog-grid');
+            box.innerHTML = '';
+            for(let i=1; i<lines.length; i++) {{
+                const r = parseCSVLine(lines[i]);
+                if(r.length > 4) {{
+                    box.innerHTML += `<div class="card reveal"><img src="${{esc(r[5])}}" class="prod-img"><div><span class="blog-badge">${{esc(r[3])}}</span><h3><a href="post.html?id=${{encodeURIComponent(r[0])}}">${{esc(r[1])}}</a></h3></div></div>`;
+                }}
+            }}
+        }} catch(e) {{}}
+    }}
+    loadBlog();
+    </script>
+    """
+
+# --- UPDATED PRODUCT PAGE WITH SOCIAL SHARE ---
+def gen_product_page_content(cfg, is_demo=False):
+    demo_flag = "const isDemo = true;" if is_demo else "const isDemo = false;"
+    return f"""
+    <section style="padding-top:150px;"><div class="container"><div id="product-detail">Loading...</div></div></section>
+    {gen_csv_parser()}
+    <script>
+    {demo_flag}
+    function shareWA(url, title) {{ window.open('https://wa.me/?text=' + encodeURIComponent(title + ' ' + url), '_blank'); }}
+    async function loadProduct() {{
+        const params = new URLSearchParams(window.location.search);
+        let targetName = params.get('item');
+        if(isDemo && !targetName) targetName = "Demo Item";
+        try {{
+            // NEW: Prefer the validated, deduplicated store-index.json from the build,
+            // so duplicate or malformed sheet rows can't shadow the product
+            let rows = null;
+            try {{
+                const idx = await fetch('store-index.json');
+                if (idx.ok) rows = (await idx.json()).items.map(it => [it[0], it[2], it[3], it[4], it[5]]);
+            }} catch(e) {{}}
+            if (!rows) {{
+                const res = await fetch({js(cfg.sheet_url)});
+                const txt = await res.text();
+                rows = txt.split(/\\r\\n|\\n/).slice(1).map(parseCSVLine);
+            }}
+            for(let i=0; i<rows.length; i++) {{
+                const clean = rows[i];
+                if(isDemo) targetName = clean[0];
+                if(clean[0] === targetName) {{
+                    let img = clean[3] || {js(cfg.custom_feat)};
+                    let stripe = (clean.length > 4 && clean[4].includes('http')) ? clean[4] : '';
+                    window.currentProduct = clean;
+                    let btn = stripe ? `<a href="${{esc(stripe)}}" class="btn btn-primary">Buy Now</a>` : `<button onclick="addToCart(currentProduct[0], currentProduct[1])" class="btn btn-primary">Add to Cart</button>`;
+                    
+                    const u = encodeURIComponent(window.location.href);
+                    const t = encodeURIComponent(clean[0]);
+                    
+                    document.getElementById('product-detail').innerHTML = `
+                        <div class="detail-view">
+                            <img src="${{esc(img)}}" style="width:100%; border-radius:12px;">
+                            <div>
+                                <h1 style="font-size:3rem; line-height:1.1;">${{esc(clean[0])}}</h1>
+                                <p style="font-size:1.5rem; color:var(--s); font-weight:bold; margin-bottom:1.5rem;">${{esc(clean[1])}}</p>
+                                <p>${{esc(clean[2])}}</p>
+                                ${{btn}}
+                                
+                                <div style="margin-top:2rem; border-top:1px solid #eee; padding-top:1rem;">
+                                    <p style="font-size:0.9rem; font-weight:bold;">Share Product:</p>
+                                    <div class="share-row">
+                                        <a href="https://wa.me/?text=${{t}}%20${{u}}" target="_blank" class="share-btn bg-wa">{icon_svg("whatsapp")}</a>
+                                        <a href="https://www.facebook.com/sharer/sharer.php?u=${{u}}" target="_blank" class="share-btn bg-fb">{icon_svg("facebook")}</a>
+                                        <a href="https://twitter.com/intent/tweet?url=${{u}}&text=${{t}}" target="_blank" class="share-btn bg-x">{icon_svg("x")}</a>
+                                        <a href="https://www.linkedin.com/sharing/share-offsite/?url=${{u}}" target="_blank" class="share-btn bg-li">{icon_svg("linkedin")}</a>
+                                    </div>
+                                </div>
+                            </div>
+                        </div>
+                    `;
+                    break;
+                }}
+            }}
+        }} catch(e) {{}}
+    }}
+    loadProduct();
+    </script>
+    """
+
+# --- UPDATED BLOG POST WITH MOBILE PADDING FIX & SOCIAL SHARE ---
+def gen_blog_post_html(cfg, demo=False):
+    feed = get_blog_feed(cfg)
+    if not feed or not feed[1]:
+        return gen_blog_post_runtime(cfg)
+    # NEW: Each article is one small pre-rendered shard (blog/posts/<slug>.json)
+    demo_post = js(next(iter(feed[1].values()))) if demo else "null"
+    return f"""
+    <div id="post-container" style="padding-top:70px;">Loading...</div>
+    <script>
+    {ESC_JS}
+    const demoPost = {demo_post};
+    // p.html is Markdown rendered (and escaped) at build time; every other field is plain text
+    function renderPost(p) {{
+        const u = encodeURIComponent(window.location.href);
+        const t = encodeURIComponent(p.title);
+        document.getElementById('post-container').innerHTML = `
+            <div style="background:var(--p); padding:clamp(3rem, 8vw, 6rem) 1rem; color:white; text-align:center;">
+                <div class="container">
+                    <span class="blog-badge">${{esc(p.category)}}</span>
+                    <h1 style="font-size:clamp(1.8rem, 5vw, 3.5rem); margin-top:1rem;">${{esc(p.title)}}</h1>
+                </div>
+            </div>
+            <div class="container" style="max-width:800px; padding:3rem 1.5rem;">
+                <img src="${{esc(p.image)}}" style="width:100%; border-radius:12px; margin-bottom:2rem;">
+                <div style="line-height:1.8;">${{p.html}}</div>
+                
+                <div style="margin-top:3rem; border-top:1px solid #eee; padding-top:1.5rem;">
+                    <p style="font-weight:bold;">Share this article:</p>
+                    <div class="share-row">
+                        <a href="https://wa.me/?text=${{t}}%20${{u}}" target="_blank" class="share-btn bg-wa">{icon_svg("whatsapp")}</a>
+                    </div>
+                </div>
+                <a href="blog.html" class="btn btn-primary" style="margin-top:2rem;">&larr; Back to Blog</a>
+            </div>
+        `;
+    }}
+    async function loadPost() {{
+        if (demoPost) return renderPost(demoPost);
+        const slug = new URLSearchParams(window.location.search).get('id');
+        try {{
+            const res = await fetch(`blog/posts/${{encodeURIComponent(slug)}}.json`);
+            if (res.ok) renderPost(await res.json());
+        }} catch(e) {{}}
+    }}
+    loadPost();
+    </script>
+    """
+
+def gen_post_static(cfg, p):
+    # The body is rendered Markdown (content.render_markdown escapes the text it is given)
+    if p is None: return gen_inner_header("Article")
+    return fragment("post", category=p["category"], title=p["title"], image=p["image"], body=Markup(p["html"]),
+                    url=f"{cfg.prod_url.rstrip('/')}/post-{p['slug']}.html")
+
+def gen_blog_post_runtime(cfg):
+    # Fallback when the sheet can't be read at build time: scans the full CSV for the slug
+    return f"""
+    <div id="post-container" style="padding-top:70px;">Loading...</div>
+    {gen_csv_parser()}
+    <script>
+    async function loadPost() {{
+        const params = new URLSearchParams(window.location.search);
+        const slug = params.get('id');
+        try {{
+            const res = await fetch({js(cfg.blog_sheet_url)});
+            const txt = await res.text();
+            const lines = txt.split(/\\r\\n|\\n/);
+            const container = document.getElementById('post-container');
+            for(let i=1; i<lines.length; i++) {{
+                const r = parseCSVLine(lines[i]);
+                if(r[0] === slug) {{
+                    const contentHtml = parseMarkdown(r[6]);
+                    const u = encodeURIComponent(window.location.href);
+                    const t = encodeURIComponent(r[1]);
+                    
+                    container.innerHTML = `
+                        <div style="background:var(--p); padding:clamp(3rem, 8vw, 6rem) 1rem; color:white; text-align:center;">
+                            <div class="container">
+                                <span class="blog-badge">${{esc(r[3])}}</span>
+                                <h1 style="font-size:clamp(1.8rem, 5vw, 3.5rem); margin-top:1rem;">${{esc(r[1])}}</h1>
+                            </div>
+                        </div>
+                        <div class="container" style="max-width:800px; padding:3rem 1.5rem;">
+                            <img src="${{esc(r[5])}}" style="width:100%; border-radius:12px; margin-bottom:2rem;">
+                            <div style="line-height:1.8;">${{contentHtml}}</div>
+                            
+                            <div style="margin-top:3rem; border-top:1px solid #eee; padding-top:1.5rem;">
+                                <p style="font-weight:bold;">Share this article:</p>
+                                <div class="share-row">
+                                    <a href="https://wa.me/?text=${{t}}%20${{u}}" target="_blank" class="share-btn bg-wa">{icon_svg("whatsapp")}</a>
+                                </div>
+                            </div>
+                            <a href="blog.html" class="btn btn-primary" style="margin-top:2rem;">&larr; Back to Blog</a>
+                        </div>
+                    `;
+                    break;
+                }}
+            }}
+        }} catch(e) {{}}
+    }}
+    loadPost();
+    </script>
+    """
+
+def gen_inner_header(title):
+    return fragment("inner_header", key=post_slug(title), title=title)
+
+def gen_contact_content(cfg):
+    return fragment("contact", key="contact-us", title="Contact Us", address=cfg.biz_addr.split("\n"), phone=cfg.biz_phone,
+                    email=cfg.biz_email, wa_num=cfg.wa_num, prod_url=cfg.prod_url, map_embed=Markup(cfg.map_iframe))
+
+# --- PAGE ASSEMBLY ---
+def gen_home_sections(cfg):
+    home_sections = []
+    if cfg.show_hero: home_sections.append(("hero", gen_hero(cfg)))
+    if cfg.show_stats: home_sections.append(("stats", gen_stats(cfg)))
+    if cfg.show_features: home_sections.append(("features", gen_features(cfg)))
+    if cfg.show_pricing: home_sections.append(("pricing", gen_pricing_table(cfg)))
+    if cfg.show_inventory: home_sections.append(("inventory", gen_inventory(cfg)))
+    if cfg.show_gallery: home_sections.append(("about", gen_about_section(cfg)))
+    if cfg.show_testimonials:
+        quotes = [(n, x.split("|")[0], x.split("|")[1]) for n, x in enumerate(cfg.testi_data.split('\n'), 1) if "|" in x]
+        home_sections.append(("testimonials", fragment("testimonials", quotes=quotes)))
+    if cfg.show_faq: home_sections.append(("faq", gen_faq_section(cfg)))
+    if cfg.show_cta: home_sections.append(("cta", fragment("cta")))
+    return home_sections
+
+def gen_text_page(title, text):
+    return fragment("text_page", key=post_slug(title), title=title, text=text)
+
+def site_pages(cfg, demo=False):
+    # (file, title, content builder). Builders run lazily so a preview only renders its own page.
+    pages = [
+        ("index.html", "Home", lambda: gen_home_sections(cfg)),
+        ("about.html", "About", lambda: gen_text_page("About", cfg.about_long)),
+        ("contact.html", "Contact", lambda: gen_contact_content(cfg)),
+        ("privacy.html", "Privacy", lambda: gen_text_page("Privacy", cfg.priv_txt)),
+        ("terms.html", "Terms", lambda: gen_text_page("Terms", cfg.term_txt)),
+        ("booking.html", "Book Now", lambda: gen_booking_content(cfg)),
+        ("product.html", "Product Name" if demo else "Product Details", lambda: gen_product_page_content(cfg, is_demo=demo)),
+    ]
+    if cfg.show_blog or demo:
+        pages += [("blog.html", "Blog", lambda: gen_blog_index_html(cfg)), ("post.html", "Article", lambda: gen_blog_post_html(cfg, demo=demo))]
+    if cfg.lite: pages = lite_pages(cfg, pages, demo)
+    return pages
+
+def lite_pages(cfg, pages, demo):
+    # Query-string detail pages become one static file per product and post. The preview
+    # keeps product.html/post.html and shows the first of each.
+    products = product_pages(cfg)
+    feed = get_blog_feed(cfg)
+    posts = list(feed[1].values()) if feed else []
+    out = [p for p in pages if p[0] not in ("product.html", "post.html")]
+    if demo:
+        first = products[0] if products else ("product.html", None)
+        out.append(("product.html", "Product Name", lambda: gen_product_static(cfg, *first)))
+        out.append(("post.html", "Article", lambda: gen_post_static(cfg, posts[0] if posts else None)))
+        return out
+    # Default arguments pin each loop value into its builder
+    out += [(f, item[0], lambda f=f, item=item: gen_product_static(cfg, f, item)) for f, item in products]
+    if cfg.show_blog:
+        out += [(f"post-{p['slug']}.html", p["title"], lambda p=p: gen_post_static(cfg, p)) for p in posts]
+    return out
+
+def site_assets(cfg):
+    # Non-page files shipped next to the HTML
+    if cfg.lite:
+        # Everything dynamic was rendered into the pages
+        return [icon_sprite(), ("manifest.json", gen_pwa_manifest(cfg))]
+    assets = [icon_sprite(), ("manifest.json", gen_pwa_manifest(cfg)), ("service-worker.js", gen_sw())]
+    if cfg.show_blog: assets += blog_assets(cfg)
+    if cfg.show_inventory: assets += store_assets(cfg)
+    return assets
@@ -0,0 +1,223 @@
+# --- TITAN HOST CONFIGS ---
+# Cache and preload headers for the exported site, written for the common static hosts:
+# Netlify / Cloudflare Pages (_headers), Vercel (vercel.json), nginx and Apache (.htaccess).
+# All four come from the same file classes, so they agree with each other.
+# `python -m titan.host_config verify <site_dir>` serves a build with the _headers rules applied
+# (nginx-style, gzip included) and checks every file gets the header its class promises.
+import argparse
+import gzip
+import io
+import json
+import os
+import re
+import sys
+import threading
+import urllib.request
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, max-age=0, must-revalidate"
+
+# name -> (path regex, Cache-Control). First match wins.
+FILE_CLASSES = {
+    "sprite": (r"(^|/)icons-[0-9a-f]{8}\.svg$", IMMUTABLE),
+    "service-worker": (r"(^|/)service-worker\.js$", "no-cache"),
+    "manifest": (r"(^|/)manifest\.json$", "public, max-age=86400"),
+    "data": (r"(^|/)(store-index\.json|blog/.+\.json)$", "public, max-age=300, stale-while-revalidate=86400"),
+    "html": (r"(\.html|/)$", REVALIDATE),
+}
+DEFAULT_CACHE = "public, max-age=3600"
+COMPRESSIBLE = ("text/html", "text/css", "application/javascript", "text/javascript", "application/json", "image/svg+xml", "application/manifest+json")
+
+def classify(path):
+    for name, (rx, _) in FILE_CLASSES.items():
+        if re.search(rx, path): return name
+    return None
+
+def cache_control(path):
+    c = classify(path)
+    return FILE_CLASSES[c][1] if c else DEFAULT_CACHE
+
+def _url_paths(files):
+    # Request paths per file; folder indexes are also reachable as "/" and "/es/"
+    for f in files:
+        yield f, "/" + f
+        if f == "index.html" or f.endswith("/index.html"): yield f, "/" + f[:-len("index.html")]
+
+def gen_netlify(files, links, index_links):
+    # Exact paths only: Netlify merges every matching rule, so nothing may overlap.
+    out = ["# Netlify / Cloudflare Pages headers (generated)"]
+    for f, path in _url_paths(sorted(files)):
+        if f.startswith("blog/posts/"): continue
+        out.append(path)
+        out.append(f"  Cache-Control: {cache_control(f)}")
+        if classify(f) == "html":
+            page_links = links + (index_links if f.endswith("index.html") else [])
+            if page_links: out.append(f"  Link: {', '.join(page_links)}")
+        out.append("")
+    if any(f.startswith("blog/posts/") for f in files):
+        out += ["/blog/posts/*", f"  Cache-Control: {FILE_CLASSES['data'][1]}", ""]
+    return "\n".join(out)
+
+def gen_vercel(files, links, index_links):
+    headers = []
+    def rule(source, cc, page_links=()):
+        h = [{"key": "Cache-Control", "value": cc}]
+        if page_links: h.append({"key": "Link", "value": ", ".join(page_links)})
+        headers.append({"source": source, "headers": h})
+    for f, path in _url_paths(sorted(files)):
+        if f.startswith("blog/posts/"): continue
+        html = classify(f) == "html"
+        rule(path, cache_control(f), (links + (index_links if f.endswith("index.html") else [])) if html else ())
+    if any(f.startswith("blog/posts/") for f in files):
+        rule("/blog/posts/(.*)", FILE_CLASSES["data"][1])
+    return json.dumps({"cleanUrls": False, "headers": headers}, indent=2)
+
+def gen_nginx(links, index_links):
+    def block(rx, cc, page_links=()):
+        lines = [f'location ~* "{rx}" {{', f'    add_header Cache-Control "{cc}" always;']
+        if page_links: lines.append(f"    add_header Link '{', '.join(page_links)}' always;")
+        return "\n".join(lines + ["}"])
+    out = [
+        "# nginx snippet (generated). Include inside the site's server { } block, next to root/index.",
+        "# add_header in a location replaces server-level add_header, so each block is complete.",
+        "gzip on;",
+        "gzip_vary on;",
+        "gzip_comp_level 6;",
+        f"gzip_types {' '.join(t for t in COMPRESSIBLE if t != 'text/html')};",
+        "# gzip_static on;  # serve pre-compressed .gz files when present (ngx_http_gzip_static_module)",
+        "",
+        block(r"^/([a-z-]+/)?(index\.html)?$", REVALIDATE, links + index_links),
+    ]
+    for name, (rx, cc) in FILE_CLASSES.items():
+        out.append(block(rx.replace("(^|/)", "/"), cc, links if name == "html" else ()))
+    out.append(block(r".", DEFAULT_CACHE))
+    return "\n".join(out) + "\n"
+
+def gen_htaccess(links, index_links):
+    # FilesMatch sees the file name only; later blocks win, so the specific ones come last.
+    def block(rx, cc, page_links=()):
+        lines = [f'  <FilesMatch "{rx}">', f'    Header set Cache-Control "{cc}"']
+        if page_links: lines.append(f"    Header set Link \"{', '.join(page_links).replace(chr(34), chr(39))}\"")
+        return lines + ["  </FilesMatch>"]
+    out = ["# Apache .htaccess (generated)", "<IfModule mod_headers.c>", f'  Header set Cache-Control "{DEFAULT_CACHE}"']
+    out += block(r"\.json$", FILE_CLASSES["data"][1])
+    out += block(r"\.html$", REVALIDATE, links)
+    out += block(r"^index\.html$", REVALIDATE, links + index_links)
+    out += block(r"^manifest\.json$", FILE_CLASSES["manifest"][1])
+    out += block(r"^service-worker\.js$", "no-cache")
+    out += block(r"^icons-[0-9a-f]{8}\.svg$", IMMUTABLE)
+    out += ["</IfModule>", "<IfModule mod_deflate.c>", f"  AddOutputFilterByType DEFLATE {' '.join(COMPRESSIBLE)}", "</IfModule>"]
+    return "\n".join(out) + "\n"
+
+def host_configs(files, links=(), index_links=()):
+    # files: every exported path ("index.html", "es/about.html", "blog/feed-1.json", ...)
+    # links: Link header values for every page; index_links: extra ones for index pages
+    links, index_links = list(links), list(index_links)
+    return [
+        ("_headers", gen_netlify(files, links, index_links)),
+        ("vercel.json", gen_vercel(files, links, index_links)),
+        ("nginx-titan.conf", gen_nginx(links, index_links)),
+        (".htaccess", gen_htaccess(links, index_links)),
+    ]
+
+# --- LOCAL VERIFICATION SERVER ---
+def parse_headers_file(text):
+    # Netlify _headers -> [(path pattern, [(name, value)])]
+    rules, current = [], None
+    for line in text.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"): continue
+        if not line[0].isspace():
+            current = (line.strip(), [])
+            rules.append(current)
+        elif current and ":" in line:
+            k, v = line.strip().split(":", 1)
+            current[1].append((k.strip(), v.strip()))
+    return rules
+
+def _matches(pattern, path):
+    if pattern.endswith("*"): return path.startswith(pattern[:-1])
+    return path == pattern
+
+def make_handler(root, rules):
+    class Handler(SimpleHTTPRequestHandler):
+        def __init__(self, *a, **kw):
+            super().__init__(*a, directory=root, **kw)
+
+        def end_headers(self):
+            path = self.path.split("?")[0]
+            merged = {}
+            for pattern, headers in rules:
+                if _matches(pattern, path):
+                    for k, v in headers: merged[k] = f"{merged[k]}, {v}" if k in merged else v
+            for k, v in merged.items(): self.send_header(k, v)
+            super().end_headers()
+
+        def send_head(self):
+            # gzip like nginx's "gzip on" for compressible types
+            path = self.translate_path(self.path)
+            if os.path.isdir(path): path = os.path.join(path, "index.html")
+            ctype = self.guess_type(path)
+            if "gzip" not in self.headers.get("Accept-Encoding", "") or not os.path.isfile(path) or not ctype.startswith(COMPRESSIBLE):
+                return super().send_head()
+            with open(path, "rb") as src: body = gzip.compress(src.read())
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            return io.BytesIO(body)
+
+        def log_message(self, fmt, *args):
+            pass
+    return Handler
+
+def serve(root, port=0):
+    with open(os.path.join(root, "_headers"), encoding="utf-8") as f:
+        rules = parse_headers_file(f.read())
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(root, rules))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def verify(root):
+    # Fetch every file through the local server; [(path, problem)] for anything off
+    server = serve(root)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    problems = []
+    try:
+        for dirpath, _, names in os.walk(root):
+            for n in names:
+                f = os.path.relpath(os.path.join(dirpath, n), root).replace(os.sep, "/")
+                # Host configs and hidden files (the export's .titan marker) are not site files
+                if f in ("_headers", "vercel.json", "nginx-titan.conf") or n.startswith("."): continue
+                req = urllib.request.Request(f"{base}/{f}", headers={"Accept-Encoding": "gzip"})
+                with urllib.request.urlopen(req) as resp:
+                    got, want = resp.headers.get("Cache-Control"), cache_control(f)
+                    if got != want: problems.append((f, f"Cache-Control {got!r}, expected {want!r}"))
+                    if classify(f) == "html" and f.endswith("index.html") and "rel=preload" not in (resp.headers.get("Link") or ""):
+                        problems.append((f, "no Link preload header"))
+                    if resp.headers.get_content_type() in COMPRESSIBLE and resp.headers.get("Content-Encoding") != "gzip":
+                        problems.append((f, "not compressed"))
+    finally:
+        server.shutdown()
+    return problems
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve or verify an exported Titan site with its generated headers.")
+    ap.add_argument("command", choices=["serve", "verify"])
+    ap.add_argument("site_dir")
+    ap.add_argument("--port", type=int, default=8080)
+    args = ap.parse_args(argv)
+    if args.command == "verify":
+        problems = verify(args.site_dir)
+        for f, p in problems: print(f"{f}: {p}")
+        print("all headers match" if not problems else f"{len(problems)} problem(s)", file=sys.stderr)
+        return 1 if problems else 0
+    server = serve(args.site_dir, args.port)
+    print(f"Serving {args.site_dir} on http://127.0.0.1:{server.server_address[1]}")
+    try: threading.Event().wait()
+    except KeyboardInterrupt: server.shutdown()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,16 @@
+# --- TITAN HTTP HELPERS ---
+# Request handling shared by the small stdlib servers (rum_collector, preview_server, mock_llm).
+
+class BodyError(Exception):
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status    # 400 missing or malformed length, 413 over the limit
+
+def read_body(handler, max_body):
+    # -> the request body of a BaseHTTPRequestHandler. A missing, malformed or oversized
+    # Content-Length raises BodyError; that body is never read, so the connection is closed.
+    try: size = int(handler.headers.get("Content-Length") or 0)
+    except ValueError: size = 0
+    if 0 < size <= max_body: return handler.rfile.read(size)
+    handler.close_connection = True
+    raise BodyError(413 if size > max_body else 400)
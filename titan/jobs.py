@@ -0,0 +1,92 @@
+# --- TITAN EXPORT JOBS ---
+# Exports run on a small process-wide thread pool, so the script (and every other session)
+# keeps responding while a site is built. Jobs report per-page progress, can be cancelled
+# between pages, and only a handful of finished jobs are kept around.
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from .cache import shared_cache, use_handles
+from .content import sheet_source
+
+class Cancelled(Exception):
+    pass
+
+class ExportJob:
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key              # config digest the job was submitted with
+        self.state = "queued"       # queued, running, done, blocked, failed, cancelled
+        self.done, self.total, self.current = 0, 0, ""
+        self.result = None
+        self.error = None
+        self.cached = False
+        self.submitted, self.finished = time.time(), None
+        self._cancel = threading.Event()
+        # Resolved here, on the script thread: the worker runs without a Streamlit context
+        self._handles = {"cache": shared_cache(), "sheets": sheet_source()}
+
+    @property
+    def active(self):
+        return self.state in ("queued", "running")
+
+    @property
+    def progress(self):
+        return min(self.done / self.total, 1.0) if self.total else 0.0
+
+    def cancel(self):
+        self._cancel.set()
+
+    def step(self, label):
+        # Called by the export before each unit of work; a cancel takes effect here
+        if self._cancel.is_set(): raise Cancelled()
+        self.current = label
+        self.done += 1
+
+class ExportJobs:
+    def __init__(self, workers=2, keep=16):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="titan-export")
+        self.keep = keep
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, key, run):
+        # run(job) -> result. A second click with the same settings joins the running job.
+        with self._lock:
+            for job in self._jobs.values():
+                if job.key == key and job.active: return job
+            job = ExportJob(key)
+            self._jobs[job.id] = job
+            done = [j for j in self._jobs.values() if not j.active]
+            for old in done[:max(0, len(self._jobs) - self.keep)]:
+                del self._jobs[old.id]
+        self.pool.submit(self._run, job, run)
+        return job
+
+    def _run(self, job, run):
+        if job._cancel.is_set():
+            job.state, job.finished = "cancelled", time.time()
+            return
+        job.state = "running"
+        try:
+            with use_handles(**job._handles):
+                job.result = run(job)
+            job.state = "blocked" if job.result.blocked else "done"
+        except Cancelled:
+            job.state = "cancelled"
+        except Exception as e:
+            job.state, job.error = "failed", f"{type(e).__name__}: {e}"
+        finally:
+            job.finished = time.time()
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+@st.cache_resource
+def export_jobs():
+    return ExportJobs()
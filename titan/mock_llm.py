@@ -0,0 +1,102 @@
+# --- TITAN MOCK LLM ---
+# Stand-in for the OpenAI-compatible chat API used by the AI generator (ai.py), for
+# working offline and for timing the concurrent fan-out. It reads the requested keys off
+# the prompt and answers each with canned copy in the right line format after a delay.
+#
+#   python -m titan.mock_llm --port 8788 --delay 1.5 --jitter 1
+#   TITAN_AI_BASE_URL=http://127.0.0.1:8788/v1 streamlit run app.py
+# Any API key works except "bad", which gets a 401. To rehearse failures, --malformed KEY
+# answers prompts asking for KEY with a 200 that has no choices, and --empty KEY sends an
+# empty value for KEY, which fails validation.
+import argparse
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .http_util import BodyError, read_body
+
+MAX_BODY = 65536
+
+CANNED = {
+    "hero_h": "Your Business, Online in a Blink.",
+    "hero_sub": "A site that loads instantly and costs nothing to host. Pay once and own it.",
+    "about_h": "Run Everything from a Spreadsheet",
+    "about_short": "Edit a sheet, and your site updates everywhere. No dashboards, no plugins.",
+    "about_long": "**Why We Exist**\nSmall businesses deserve fast, simple websites.\n* No monthly fees\n* No plugins",
+    "feat_data": ["bolt | Instant Loading | Pages render in a tenth of a second.",
+                  "wallet | No Monthly Fees | Static hosting on free CDN tiers.",
+                  "table | Sheet CMS | Update prices from Google Sheets.",
+                  "shield | Secure | No database to attack."],
+    "testi_data": ["Ana Ruiz, Bakery Owner | Orders doubled after the new site went live.",
+                   "Tom Okafor, Plumber | It loads faster than my competitors' sites on any phone.",
+                   "Mei Chen, Yoga Studio | I change my timetable from my phone in seconds."],
+    "faq_data": ["How fast is it? ? Most pages load in under a second.",
+                 "Do I pay for hosting? ? No. Static hosting is free for small sites.",
+                 "Can I edit it myself? ? Yes. Change the Google Sheet and the site follows."],
+    "priv_txt": "**1. Data We Collect**\nOnly what you send through the contact form.",
+    "term_txt": "**1. Agreement**\nBy using this site you agree to these terms.",
+    "booking_title": "Book a Visit",
+    "booking_desc": "Pick a time that suits you.",
+    "blog_hero_title": "From the Workshop",
+    "blog_hero_sub": "Notes on running a small business online.",
+    "blog_drafts": [{"slug": "why-speed-matters", "title": "Why Speed Matters", "category": "Performance",
+                     "summary": "Slow sites lose customers.", "content": "## Every second counts\nVisitors leave slow pages."},
+                    {"slug": "own-your-site", "title": "Own Your Site", "category": "Business",
+                     "summary": "Stop renting your website.", "content": "## Rent vs own\nA one-time build beats a subscription."}],
+}
+
+def prompt_keys(prompt):
+    return re.findall(r"^(\w+) \(", prompt, re.M)
+
+def answer(prompt, empty=()):
+    return {k: "" if k in empty else CANNED.get(k, f"Mock copy for {k}") for k in prompt_keys(prompt)}
+
+def make_handler(delay=1.0, jitter=0.0, malformed=(), empty=()):
+    class Handler(BaseHTTPRequestHandler):
+        def _json(self, code, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if not self.path.split("?")[0].endswith("/chat/completions"):
+                self.close_connection = True
+                return self._json(404, {"error": {"message": "not found"}})
+            try: body = read_body(self, MAX_BODY)
+            except BodyError as e: return self._json(e.status, {"error": {"message": "bad request size"}})
+            if self.headers.get("Authorization", "") == "Bearer bad":
+                return self._json(401, {"error": {"message": "invalid api key"}})
+            try: prompt = json.loads(body)["messages"][-1]["content"]
+            except (ValueError, KeyError, IndexError, TypeError):
+                return self._json(400, {"error": {"message": "bad request"}})
+            time.sleep(delay + random.uniform(0, jitter))
+            if set(prompt_keys(prompt)) & set(malformed):
+                return self._json(200, {"error": None})
+            content = json.dumps(answer(prompt, empty))
+            self._json(200, {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]})
+
+        def log_message(self, fmt, *args):
+            pass
+    return Handler
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve canned answers for the Titan AI generator.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8788)
+    ap.add_argument("--delay", type=float, default=1.0, help="seconds before each answer")
+    ap.add_argument("--jitter", type=float, default=0.0, help="extra random delay, up to this many seconds")
+    ap.add_argument("--malformed", action="append", default=[], metavar="KEY", help="answer prompts for KEY with a broken payload")
+    ap.add_argument("--empty", action="append", default=[], metavar="KEY", help="send an empty value for KEY")
+    args = ap.parse_args(argv)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.delay, args.jitter, args.malformed, args.empty))
+    print(f"Mock LLM on http://{args.host}:{args.port}/v1/chat/completions")
+    try: server.serve_forever()
+    except KeyboardInterrupt: pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# --- TITAN PERFORMANCE BUDGETS ---
+# Static analysis of the generated pages (output of build_page) against size budgets.
+# Everything is measured from the HTML itself; remote image sizes are only known when
+# a size lookup is passed in (the builder does HEAD requests for that).
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+# metric -> (label, default budget)
+BUDGETS = {
+    "page_kb": ("HTML size (KB)", 150),
+    "render_blocking": ("Render-blocking resources", 3),
+    "third_party": ("Third-party origins", 6),
+    "image_kb": ("Image weight (KB)", 1500),
+    "dom_nodes": ("DOM nodes", 1500),
+    "inline_js_kb": ("Inline script (KB)", 60),
+}
+
+_CSS_URL = re.compile(r"url\(\s*['\"]?([^'\")\s]+)")
+_RESOURCE_ATTRS = {"script": "src", "link": "href", "img": "src", "iframe": "src", "source": "src", "video": "src", "audio": "src", "embed": "src"}
+
+def origin(url):
+    u = urlparse(url)
+    return f"{u.scheme}://{u.netloc}" if u.scheme in ("http", "https") and u.netloc else None
+
+@dataclass
+class PageStats:
+    bytes: int = 0
+    render_blocking: int = 0
+    dom_nodes: int = 0
+    inline_js: int = 0
+    inline_image: int = 0     # data: URIs and inline <svg> markup
+    third_party: tuple = ()
+    images: tuple = ()        # remote image URLs, for an optional size lookup
+
+class _Scan(HTMLParser):
+    def __init__(self, page_html, site_origin):
+        super().__init__(convert_charrefs=True)
+        self.lines = page_html.split("\n")
+        self.site_origin = site_origin
+        self.stats = PageStats()
+        self.origins, self.images = set(), []
+        self.in_head, self.in_script, self.in_style = False, False, False
+        self.svg_depth, self.svg_start = 0, 0
+
+    def _resource(self, url, image=False):
+        if not url: return
+        if url.startswith("data:"):
+            if image: self.stats.inline_image += len(url)
+            return
+        o = origin(url)
+        if o and o != self.site_origin: self.origins.add(o)
+        if image and o: self.images.append(url)
+
+    def handle_starttag(self, tag, attrs):
+        self.stats.dom_nodes += 1
+        a = dict(attrs)
+        if tag == "head": self.in_head = True
+        elif tag == "body": self.in_head = False
+        elif tag == "svg":
+            if not self.svg_depth: self.svg_start = self.getpos()
+            self.svg_depth += 1
+        elif tag == "script":
+            self.in_script = not a.get("src")
+            if a.get("src") and self.in_head and "async" not in a and "defer" not in a and a.get("type") != "module":
+                self.stats.render_blocking += 1
+        elif tag == "style":
+            self.in_style = True
+        elif tag == "link":
+            rel = (a.get("rel") or "").lower()
+            if rel == "stylesheet" and a.get("media", "all") in ("all", "screen", "") and self.in_head:
+                self.stats.render_blocking += 1
+            if rel not in ("stylesheet", "preload", "modulepreload", "icon", "apple-touch-icon", "manifest"): return
+        attr = _RESOURCE_ATTRS.get(tag)
+        if attr: self._resource(a.get(attr), image=tag == "img" or (tag == "link" and "icon" in (a.get("rel") or "")))
+        if a.get("srcset"): self._resource(a["srcset"].split(",")[0].split()[0], image=True)
+        if a.get("style"):
+            for u in _CSS_URL.findall(a["style"]): self._resource(u, image=True)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag == "svg": self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag == "script": self.in_script = False
+        elif tag == "style": self.in_style = False
+        elif tag == "head": self.in_head = False
+        elif tag == "svg" and self.svg_depth:
+            self.svg_depth -= 1
+            if not self.svg_depth: self.stats.inline_image += self._span(self.svg_start, self.getpos())
+
+    def handle_data(self, data):
+        if self.in_script: self.stats.inline_js += len(data.encode())
+        elif self.in_style:
+            for u in _CSS_URL.findall(data): self._resource(u, image=True)
+
+    def _span(self, start, end):
+        # Rough byte size of a block from parser positions (line, col)
+        lines = self.lines
+        if start[0] == end[0]: return end[1] - start[1]
+        return len(lines[start[0] - 1]) - start[1] + sum(len(l) for l in lines[start[0]:end[0] - 1]) + end[1]
+
+def analyze(page_html, site_url=""):
+    scan = _Scan(page_html, origin(site_url))
+    scan.feed(page_html)
+    scan.close()
+    s = scan.stats
+    s.bytes = len(page_html.encode())
+    s.third_party = tuple(sorted(scan.origins))
+    s.images = tuple(dict.fromkeys(scan.images))
+    return s
+
+def measure(stats, image_sizes=None):
+    # PageStats -> {metric: value} in budget units
+    remote = sum((image_sizes or {}).get(u) or 0 for u in stats.images)
+    return {
+        "page_kb": round(stats.bytes / 1024, 1),
+        "render_blocking": stats.render_blocking,
+        "third_party": len(stats.third_party),
+        "image_kb": round((remote + stats.inline_image) / 1024, 1),
+        "dom_nodes": stats.dom_nodes,
+        "inline_js_kb": round(stats.inline_js / 1024, 1),
+    }
+
+def over_budget(values, budgets):
+    # [(metric, value, budget)] for every budget that is exceeded
+    return [(m, v, budgets[m]) for m, v in values.items() if budgets.get(m) is not None and v > budgets[m]]
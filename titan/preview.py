@@ -0,0 +1,98 @@
+# --- TITAN LIVE PREVIEW COMPONENT ---
+# One persistent iframe; reruns ship only the changed sections / theme variables, or just a
+# digest when nothing changed.
+# local_server() is the full-site preview server (preview_server.py) for this process; it
+# belongs to the session that started it (see owns_server).
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+
+import streamlit as st
+
+from .generators import page_parts, render_page
+from .icons import preview_icon_sprite
+from .theme import ROOT_DIR, get_theme_vars
+
+_live_preview = st.components.v1.declare_component(
+    "titan_live_preview", path=os.path.join(ROOT_DIR, "components", "live_preview")
+)
+
+def _digest(*parts):
+    h = hashlib.blake2b(digest_size=12)
+    for part in parts: h.update(part.encode("utf-8", "ignore") + b"\0")
+    return h.hexdigest()
+
+def _split_scripts(html):
+    # Scripts never re-run when markup is patched, so a script change forces a full load
+    return "".join(re.findall(r"<script\b.*?</script>", html, flags=re.S | re.I))
+
+def live_preview(cfg, page_id, title, content, extra_js="", height=600):
+    head, body = page_parts(cfg, title, content, extra_js)
+    body = preview_icon_sprite(body)
+    # Only one page is tracked per session, so preview state stays bounded
+    state = st.session_state.setdefault("_lp_state", {"rev": 0, "resync": None})
+    head_map = dict(head)
+    shell = _digest(page_id, *[h for k, h in head if k not in ("vars", "pwa")], *[sid + _split_scripts(h) for sid, h in body])
+    vars_css = get_theme_vars(cfg)
+    frags = {sid: _digest(h) for sid, h in body}
+
+    ack = st.session_state.get("titan_live_preview") or {}
+    need_full = state.get("shell") != shell or (ack.get("resync") and ack.get("resync") != state["resync"])
+    state["resync"] = ack.get("resync")
+
+    if need_full:
+        state["rev"] += 1
+        payload = {"mode": "full", "rev": state["rev"], "page": page_id, "doc": render_page(head, body, mark_sections=True)}
+    else:
+        changed = {sid: h for sid, h in body if state["frags"].get(sid) != frags[sid]}
+        vars_changed = state["vars"] != vars_css
+        if changed or vars_changed:
+            state["rev"] += 1
+            payload = {"mode": "patch", "rev": state["rev"], "base": state["rev"] - 1, "page": page_id,
+                       "vars": vars_css if vars_changed else None, "sections": changed}
+        else:
+            # Nothing changed: the same few bytes as last time, so the component is not updated.
+            # An iframe that missed the document (remounted) asks for a resync.
+            payload = {"mode": "same", "rev": state["rev"], "page": page_id, "digest": _digest(shell, vars_css, *frags.values())}
+    state.update(shell=shell, vars=vars_css, frags=frags)
+    _live_preview(payload=payload, height=height, key="titan_live_preview", default=None)
+
+OWNER_IDLE = 600    # seconds without a rerun from the owner before another session may take over
+
+@st.cache_resource
+def local_server():
+    # One per process (one port), so one session at a time publishes to it and sets its profile
+    from .preview_server import PreviewServer
+    return PreviewServer()
+
+_owner_lock = threading.Lock()
+
+def session_id():
+    return st.session_state.setdefault("_session_id", uuid.uuid4().hex)
+
+def owns_server(server):
+    # A stopped server is free; a running one belongs to the session that started it. Each of
+    # its reruns renews the claim, so a closed tab only holds the server for OWNER_IDLE seconds.
+    me, now = session_id(), time.time()
+    with _owner_lock:
+        owner, seen = server.owner
+        if not server.running: return True
+        if owner != me and now - seen < OWNER_IDLE: return False
+        server.owner = (me, now)
+        return True
+
+def start_server(server, port):
+    # False when another session started it first
+    with _owner_lock:
+        if server.running: return False
+        server.start(port=port)
+        server.owner = (session_id(), time.time())
+        return True
+
+def stop_server(server):
+    with _owner_lock:
+        server.stop()
+        server.owner = (None, 0.0)
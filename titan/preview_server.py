@@ -0,0 +1,315 @@
+# --- TITAN PREVIEW SERVER ---
+# Local static server for a built site, served from memory. Every response goes through a
+# simulated network (latency per request, one shared downlink), HTML pages get a small
+# client that live-reloads on a new build, stretches long tasks by the CPU slowdown and
+# reports a request waterfall (Navigation/Resource Timing) back to the server.
+#
+#   python -m titan.preview_server dist/site --profile "Slow 3G"
+# The builder runs the same server in-process (Launchpad > Local Preview Server).
+# Third-party requests (fonts, images, sheets, embeds) show up in the waterfall with their
+# real timings but are not throttled; only this server's responses are.
+import argparse
+import json
+import mimetypes
+import os
+import threading
+import time
+import urllib.parse
+from collections import deque
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .http_util import BodyError, read_body
+
+MAX_BODY = 262144
+MAX_LOADS = 50
+MAX_ENTRIES = 300
+CHUNK = 8192
+
+@dataclass(frozen=True)
+class Profile:
+    latency_ms: int     # added to every response, like DevTools' request latency
+    down_kbps: int      # shared downlink; 0 = unlimited
+    cpu: float          # long tasks on the page are stretched to this multiple
+
+# Same numbers as the Chrome DevTools / Lighthouse presets
+PROFILES = {
+    "Off": Profile(0, 0, 1),
+    "Slow 4G (Lighthouse mobile)": Profile(150, 1638, 4),
+    "Fast 3G": Profile(563, 1440, 4),
+    "Slow 3G": Profile(2000, 400, 6),
+}
+
+# What the waterfall groups requests into
+def request_kind(url, initiator):
+    u = urllib.parse.urlparse(url)
+    path, host = u.path.lower(), u.netloc.lower()
+    if initiator == "navigation" or path.endswith((".html", "/")) and initiator in ("", "other"): return "html"
+    if "fonts.gstatic" in host or path.endswith((".woff2", ".woff", ".ttf", ".otf")): return "font"
+    if path.endswith(".css") or "fonts.googleapis" in host: return "css"
+    if path.endswith(".csv") or "output=csv" in u.query or "/spreadsheets/" in path: return "sheet"
+    if initiator == "iframe" or any(h in host + path for h in ("calendly", "google.com/maps", "youtube", "maps.google")): return "embed"
+    if initiator in ("img", "image", "css") or path.endswith((".png", ".jpg", ".jpeg", ".webp", ".avif", ".gif", ".svg")): return "image"
+    if initiator == "script" or path.endswith(".js"): return "script"
+    if path.endswith(".json") or initiator in ("fetch", "xmlhttprequest", "beacon"): return "data"
+    return "other"
+
+# --- THE PAGE CLIENT (injected into served HTML only, never into builds) ---
+CLIENT = """<script>
+(function () {
+  var REV = %(rev)d, CPU = %(cpu)s, lcp = null;
+  if (CPU > 1 && window.PerformanceObserver) {
+    // A stretch is a long task too: tasks that overlap one are ours and are not stretched again
+    var own = [];
+    try { new PerformanceObserver(function (l) { l.getEntries().forEach(function (e) {
+      var s = e.startTime, t = s + e.duration;
+      if (own.some(function (r) { return s < r[1] && t > r[0]; })) return;
+      var start = performance.now(), end = start + e.duration * (CPU - 1); while (performance.now() < end) {}
+      own.push([start, performance.now()]); if (own.length > 50) own.shift();
+    }); }).observe({type: 'longtask', buffered: true}); } catch (e) {}
+  }
+  try { new PerformanceObserver(function (l) { var e = l.getEntries(); lcp = e[e.length - 1].startTime; })
+    .observe({type: 'largest-contentful-paint', buffered: true}); } catch (e) {}
+  function row(r) { return {url: r.name, type: r.initiatorType, start: r.startTime, ttfb: r.responseStart, end: r.responseEnd, bytes: r.transferSize || r.encodedBodySize || 0}; }
+  function report() {
+    var nav = performance.getEntriesByType('navigation')[0];
+    var fcp = performance.getEntriesByName('first-contentful-paint')[0];
+    var res = performance.getEntriesByType('resource').filter(function (r) { return r.name.indexOf('/__titan/') < 0; });
+    navigator.sendBeacon('/__titan/timing', JSON.stringify({
+      page: location.pathname, rev: REV, nav: nav ? row(nav) : null, resources: res.slice(0, %(max_entries)d).map(row),
+      dcl: nav ? nav.domContentLoadedEventEnd : null, load: nav ? nav.loadEventEnd : null, fcp: fcp ? fcp.startTime : null, lcp: lcp}));
+  }
+  addEventListener('load', function () { setTimeout(report, 3000); });
+  var page = location.pathname.replace(/\\/$/, '/index.html');
+  new EventSource('/__titan/events').onmessage = function (m) {
+    var d = JSON.parse(m.data);
+    if (d.rev === REV || (d.changed && d.changed.indexOf(page) < 0 && !d.changed.some(function (p) { return !/\\.html$/.test(p); }))) return;
+    // The site's service worker answers cache-first, so its cache goes before the reload
+    (window.caches ? caches.keys().then(function (k) { return Promise.all(k.map(function (n) { return caches.delete(n); })); }) : Promise.resolve())
+      .then(function () { location.reload(); });
+  };
+})();
+</script>"""
+
+class Link:
+    # One downlink shared by every response, like a phone's radio: chunks queue for airtime
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._free_at = 0.0
+
+    def send_at(self, nbytes, kbps):
+        with self._lock:
+            start = max(time.monotonic(), self._free_at)
+            self._free_at = start + nbytes * 8 / (kbps * 1000)
+            return self._free_at
+
+class PreviewServer:
+    def __init__(self):
+        self.files = {}         # "/path" -> bytes
+        self.rev = 0
+        self.profile = PROFILES["Off"]
+        self.loads = deque(maxlen=MAX_LOADS)
+        self.on_load = None     # called with each recorded load (CLI prints it)
+        self.link = Link()
+        self.httpd = None
+        self.owner = (None, 0.0)    # (session, last seen) when the builder runs it, see preview.py
+        self._changed = deque(maxlen=1)
+        self._cond = threading.Condition()
+
+    @property
+    def running(self):
+        return self.httpd is not None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self, host="127.0.0.1", port=8790):
+        if self.httpd: return self
+        httpd = ThreadingHTTPServer((host, port), make_handler(self))
+        httpd.daemon_threads = True
+        threading.Thread(target=httpd.serve_forever, name="titan-preview-server", daemon=True).start()
+        self.httpd = httpd
+        return self
+
+    def stop(self):
+        httpd, self.httpd = self.httpd, None
+        with self._cond: self._cond.notify_all()     # lets live-reload streams end
+        if httpd:
+            httpd.shutdown()
+            httpd.server_close()
+
+    def publish(self, files):
+        # [(path, str | bytes)] -> the paths that changed; open pages reload if theirs did
+        new = {"/" + p.lstrip("/"): c.encode("utf-8") if isinstance(c, str) else c for p, c in files}
+        changed = sorted(p for p in new.keys() | self.files.keys() if new.get(p) != self.files.get(p))
+        if changed:
+            with self._cond:
+                self.files = new
+                self.rev += 1
+                self._changed.append(changed)
+                self._cond.notify_all()
+        return changed
+
+    def wait_for_change(self, rev, timeout):
+        # -> (rev, changed paths or None if several builds were missed)
+        with self._cond:
+            self._cond.wait_for(lambda: self.rev != rev or not self.running, timeout)
+            if self.rev == rev + 1 and self._changed: return self.rev, self._changed[-1]
+            return self.rev, None
+
+    def record(self, data):
+        load = clean_load(data, self.profile)
+        if load is None: return None
+        self.loads.append(load)
+        if self.on_load: self.on_load(load)
+        return load
+
+def _ms(v):
+    return round(float(v), 1) if isinstance(v, (int, float)) and 0 <= v < 600000 else None
+
+def clean_load(data, profile):
+    # Beacon from the page client -> one waterfall, times in ms from navigation start
+    if not isinstance(data, dict) or not isinstance(data.get("resources"), list): return None
+    rows = [data["nav"]] if isinstance(data.get("nav"), dict) else []
+    rows += [r for r in data["resources"][:MAX_ENTRIES] if isinstance(r, dict)]
+    entries = []
+    for i, r in enumerate(rows):
+        url, start, end = str(r.get("url", ""))[:500], _ms(r.get("start")), _ms(r.get("end"))
+        if not url or start is None or end is None: continue
+        initiator = "navigation" if i == 0 and rows[0] is data.get("nav") else str(r.get("type", ""))[:20]
+        entries.append({"url": url, "kind": request_kind(url, initiator), "start": start, "ttfb": _ms(r.get("ttfb")),
+                         "end": max(end, start), "bytes": int(r.get("bytes") or 0) if isinstance(r.get("bytes"), (int, float)) else 0})
+    entries.sort(key=lambda e: e["start"])
+    metrics = {m: _ms(data.get(m)) for m in ("fcp", "lcp", "dcl", "load")}
+    return {"ts": time.time(), "page": str(data.get("page", "/"))[:200], "profile": asdict(profile), "metrics": metrics, "entries": entries}
+
+def make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, code, body, ctype, throttle=True):
+            p = server.profile
+            if throttle and p.latency_ms: time.sleep(p.latency_ms / 1000)
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            if self.command == "HEAD": return
+            for i in range(0, len(body), CHUNK):
+                chunk = body[i:i + CHUNK]
+                if throttle and p.down_kbps:
+                    time.sleep(max(0.0, server.link.send_at(len(chunk), p.down_kbps) - time.monotonic()))
+                self.wfile.write(chunk)
+
+        def do_GET(self):
+            path = urllib.parse.unquote(urllib.parse.urlsplit(self.path).path)
+            if path == "/__titan/events": return self._events()
+            if path == "/__titan/loads":
+                return self._send(200, json.dumps(list(server.loads)[::-1]).encode(), "application/json", throttle=False)
+            if path.endswith("/"): path += "index.html"
+            body = server.files.get(path)
+            if body is None:
+                return self._send(404, b"Not found", "text/plain; charset=utf-8")
+            ctype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            if ctype == "text/html":
+                client = CLIENT % {"rev": server.rev, "cpu": server.profile.cpu, "max_entries": MAX_ENTRIES}
+                text = body.decode("utf-8", "replace")
+                at = text.rfind("</body>")
+                body = (text[:at] + client + text[at:] if at >= 0 else text + client).encode("utf-8")
+            if ctype.startswith("text/") or ctype in ("application/json", "application/javascript", "image/svg+xml"):
+                ctype += "; charset=utf-8"
+            self._send(200, body, ctype)
+
+        do_HEAD = do_GET
+
+        def _events(self):
+            # Server-sent events: the current build on connect, then one message per new build
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            rev, changed = server.rev, None
+            try:
+                while server.running:
+                    self.wfile.write(f"data: {json.dumps({'rev': rev, 'changed': changed})}\n\n".encode())
+                    self.wfile.flush()
+                    new_rev, changed = server.wait_for_change(rev, 15)
+                    if new_rev == rev: self.wfile.write(b": ping\n\n")
+                    rev = new_rev
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            self.close_connection = True
+
+        def do_POST(self):
+            if self.path != "/__titan/timing":
+                self.close_connection = True
+                return self._send(404, b"", "text/plain", throttle=False)
+            try: body = read_body(self, MAX_BODY)
+            except BodyError as e: return self._send(e.status, b"", "text/plain", throttle=False)
+            try: load = server.record(json.loads(body))
+            except ValueError: load = None
+            self._send(204 if load else 400, b"", "text/plain", throttle=False)
+
+        def log_message(self, fmt, *args):
+            pass
+    return Handler
+
+# --- FOLDER MODE (CLI) ---
+def read_dir(root):
+    files = []
+    for base, _, names in os.walk(root):
+        for n in names:
+            full = os.path.join(base, n)
+            with open(full, "rb") as f:
+                files.append((os.path.relpath(full, root).replace(os.sep, "/"), f.read()))
+    return files
+
+def _dir_stamp(root):
+    return sorted((os.path.relpath(os.path.join(b, n), root), os.stat(os.path.join(b, n)).st_mtime_ns) for b, _, ns in os.walk(root) for n in ns)
+
+def summary(load):
+    m = load["metrics"]
+    fmt = lambda v: "-" if v is None else f"{v:.0f}ms"
+    size = sum(e["bytes"] for e in load["entries"])
+    return (f"{load['page']}: FCP {fmt(m['fcp'])}, LCP {fmt(m['lcp'])}, load {fmt(m['load'])}, "
+            f"{len(load['entries'])} requests, {size / 1024:.0f} KB")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve a built Titan site with throttling, live reload and load waterfalls.")
+    ap.add_argument("root", help="folder with the built site (an export to a folder)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8790)
+    ap.add_argument("--profile", default="Off", choices=list(PROFILES))
+    ap.add_argument("--latency", type=int, help="ms per request (overrides the profile)")
+    ap.add_argument("--down", type=int, help="downlink kbps, 0 = unlimited (overrides the profile)")
+    ap.add_argument("--cpu", type=float, help="long-task slowdown factor (overrides the profile)")
+    args = ap.parse_args(argv)
+    p = PROFILES[args.profile]
+    server = PreviewServer()
+    server.profile = Profile(p.latency_ms if args.latency is None else args.latency,
+                             p.down_kbps if args.down is None else args.down, p.cpu if args.cpu is None else args.cpu)
+    server.on_load = lambda load: print(summary(load), flush=True)
+    server.publish(read_dir(args.root))
+    server.start(args.host, args.port)
+    print(f"Serving {args.root} on {server.url} ({server.profile})")
+    stamp = _dir_stamp(args.root)
+    try:
+        while True:
+            # Exports replace the folder atomically; a new stamp means a new build
+            time.sleep(1)
+            try: new = _dir_stamp(args.root)
+            except FileNotFoundError: continue
+            if new != stamp:
+                try: files = read_dir(args.root)
+                except FileNotFoundError: continue     # swapped mid-read; next tick
+                stamp = new
+                changed = server.publish(files)
+                if changed: print(f"Reloaded: {len(changed)} file(s) changed", flush=True)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
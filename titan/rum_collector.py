@@ -0,0 +1,154 @@
+# --- TITAN RUM COLLECTOR ---
+# Self-hostable endpoint for the web-vitals beacon that generated sites send
+# (see gen_rum_beacon in generators.py). Beacons are appended to a JSONL file or a
+# SQLite table; the builder's Field Data view reads the same storage back.
+#
+#   python -m titan.rum_collector --port 8787 --jsonl rum.jsonl
+#   python -m titan.rum_collector --port 8787 --sqlite rum.db
+import argparse
+import json
+import math
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .http_util import BodyError, read_body
+
+METRICS = ["lcp", "inp", "cls", "ttfb", "sheet"]
+MAX_BODY = 4096
+
+def clean_sample(data):
+    # Only known fields, bounded strings and finite numbers are kept
+    if not isinstance(data, dict): return None
+    site, page = str(data.get("site", ""))[:80], str(data.get("page", "/"))[:200]
+    if not site: return None
+    sample = {"ts": int(time.time()), "site": site, "page": page}
+    for m in METRICS:
+        v = data.get(m)
+        if isinstance(v, (int, float)) and math.isfinite(v) and 0 <= v < 600000:
+            sample[m] = round(float(v), 4 if m == "cls" else 1)
+    return sample
+
+class JsonlStore:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def add(self, sample):
+        line = json.dumps(sample, separators=(",", ":")) + "\n"
+        with self.lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def samples(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try: yield json.loads(line)
+                    except ValueError: continue
+        except FileNotFoundError:
+            return
+
+class SqliteStore:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        with self._db() as db:
+            db.execute(f"CREATE TABLE IF NOT EXISTS rum (ts INTEGER, site TEXT, page TEXT, {', '.join(m + ' REAL' for m in METRICS)})")
+            db.execute("CREATE INDEX IF NOT EXISTS rum_site_page ON rum (site, page)")
+
+    def _db(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def add(self, sample):
+        cols = ["ts", "site", "page"] + METRICS
+        with self.lock, self._db() as db:
+            db.execute(f"INSERT INTO rum ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})", [sample.get(c) for c in cols])
+
+    def samples(self):
+        db = self._db()
+        try:
+            cur = db.execute(f"SELECT ts, site, page, {', '.join(METRICS)} FROM rum")
+            for row in cur:
+                s = {"ts": row[0], "site": row[1], "page": row[2]}
+                s.update({m: v for m, v in zip(METRICS, row[3:]) if v is not None})
+                yield s
+        finally:
+            db.close()
+
+def open_store(path):
+    return SqliteStore(path) if path.endswith((".db", ".sqlite", ".sqlite3")) else JsonlStore(path)
+
+def percentile(sorted_values, p):
+    # Nearest-rank percentile
+    if not sorted_values: return None
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+def aggregate(samples, ps=(50, 75, 95)):
+    # Rows per (site, page): sample count and the requested percentiles of every metric
+    groups = {}
+    for s in samples:
+        g = groups.setdefault((s.get("site", ""), s.get("page", "")), {m: [] for m in METRICS})
+        for m in METRICS:
+            if m in s: g[m].append(s[m])
+    rows = []
+    for (site, page), g in sorted(groups.items()):
+        row = {"Site": site, "Page": page, "Samples": max(len(v) for v in g.values())}
+        for m in METRICS:
+            values = sorted(g[m])
+            for p in ps:
+                row[f"{m.upper()} p{p}"] = percentile(values, p)
+        rows.append(row)
+    return rows
+
+def make_handler(store, path="/rum"):
+    class Handler(BaseHTTPRequestHandler):
+        def _cors(self):
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Access-Control-Allow-Methods", "POST, OPTIONS")
+            self.send_header("Access-Control-Allow-Headers", "Content-Type")
+
+        def do_OPTIONS(self):
+            self.send_response(204); self._cors(); self.end_headers()
+
+        def do_GET(self):
+            ok = self.path == "/health"
+            self.send_response(200 if ok else 404); self.end_headers()
+            if ok: self.wfile.write(b"ok")
+
+        def _reject(self, code):
+            # The body is never read, so the connection can't be reused
+            self.close_connection = True
+            self.send_response(code); self._cors(); self.end_headers()
+
+        def do_POST(self):
+            if self.path.split("?")[0] != path: return self._reject(404)
+            # Beacons are a few hundred bytes
+            try: body = read_body(self, MAX_BODY)
+            except BodyError as e: return self._reject(e.status)
+            try: sample = clean_sample(json.loads(body))
+            except ValueError: sample = None
+            if sample: store.add(sample)
+            self.send_response(204 if sample else 400); self._cors(); self.end_headers()
+
+        def log_message(self, fmt, *args):
+            pass
+    return Handler
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Collect web-vitals beacons from Titan sites.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8787)
+    ap.add_argument("--path", default="/rum", help="beacon URL path")
+    out = ap.add_mutually_exclusive_group()
+    out.add_argument("--jsonl", default="rum.jsonl")
+    out.add_argument("--sqlite")
+    args = ap.parse_args(argv)
+    store = SqliteStore(args.sqlite) if args.sqlite else JsonlStore(args.jsonl)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(store, args.path))
+    print(f"RUM collector on http://{args.host}:{args.port}{args.path} -> {args.sqlite or args.jsonl}")
+    try: server.serve_forever()
+    except KeyboardInterrupt: pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# --- TITAN SHEET WATCHER ---
+# Rebuild daemon for exported sites. Every interval it revalidates the sheets of every site
+# (conditional GETs over HTTP, a file stat for local paths; see data_sources), diffs changed
+# sheets row by row and re-renders only the pages those rows feed. Lite sites get the product
+# or post page of each changed row plus the store and blog index pages; standard sites only
+# bake the first page of blog cards into blog.html, the rest is in the JSON assets. Changed
+# files are published in place with one atomic rename each (export.publish_files); index pages
+# go out last, so they never link to a page that is not there yet.
+#
+#   python -m titan.sheet_watcher sites/*.json --out dist --interval 30
+# Each settings file is one site as saved from the builder (Launchpad > Site Settings) and is
+# published to <out>/<file name>. A site keeps only 8-byte digests (one per row with its own
+# page, one per published file); parsed rows live in the bounded shared cache, so memory grows
+# with the number of sites and pages, not with the size of their sheets.
+import argparse
+import hashlib
+import logging
+import os
+import time
+
+from .config import SiteConfig
+from .cache import CACHE_LIMITS, SharedCache, use_handles
+from .content import get_blog_feed, localize_site, site_languages
+from .data_sources import SheetError, SheetSource
+from .export import publish_files, site_host_configs, write_dir
+from .generators import build_page, product_pages, site_assets, site_pages
+
+STORE_PAGES = ("index.html", "product.html")     # render the whole store
+BLOG_PAGES = ("blog.html", "post.html")          # render the whole blog
+INDEX_PAGES = ("index.html", "blog.html")        # published after the pages they link to
+
+log = logging.getLogger(__name__)
+
+def _digest(value):
+    return hashlib.blake2b(repr(value).encode("utf-8", "ignore"), digest_size=8).digest()
+
+def row_digests(cfg):
+    # {page file: digest of the sheet rows it renders}, for the pages this build mode has.
+    feed = get_blog_feed(cfg)
+    if not cfg.lite:
+        # The store and the articles are read by the browser from store-index.json and the blog
+        # shards (assets, diffed on every round); blog.html holds the first page of cards and
+        # post.html only knows whether there are shards at all
+        return {"blog.html": _digest(feed and (feed[0][0], len(feed[0]))), "post.html": _digest(bool(feed and feed[1]))}
+    # Lite: one page per store item and blog post. product.html / post.html hold the row
+    # order, which the index pages follow.
+    items = product_pages(cfg)
+    posts = feed[1] if feed else {}
+    rows = {f: _digest(item) for f, item in items}
+    rows.update((f"post-{slug}.html", _digest(shard)) for slug, shard in posts.items())
+    rows["product.html"], rows["post.html"] = _digest([f for f, _ in items]), _digest(list(posts))
+    return rows
+
+def dirty_pages(old, new):
+    # Row digests before and after -> page files to render again
+    rows = {f for f in old.keys() | new.keys() if old.get(f) != new.get(f)}
+    pages = set(rows)
+    if any(f.startswith("product") for f in rows): pages.update(STORE_PAGES)
+    if any(f.startswith("post") for f in rows): pages.update(BLOG_PAGES)
+    return pages
+
+class Site:
+    def __init__(self, path, out):
+        with open(path, encoding="utf-8") as f:
+            self.cfg = SiteConfig.from_json(f.read())
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.out = out
+        self.versions = {}      # sheet url -> version last built
+        self.rows = {}          # page file -> row digest
+        self.files = {}         # published path -> content digest
+
+    @property
+    def urls(self):
+        return [u for u in (self.cfg.sheet_url, self.cfg.blog_sheet_url, self.cfg.lang_sheet) if u]
+
+    def update(self, versions):
+        # {url: version} seen this round -> published and removed paths (empty when nothing changed)
+        changed = {u for u in self.urls if versions.get(u) != self.versions.get(u)}
+        if self.files and not changed: return []
+        cfg, rows = self.cfg, row_digests(self.cfg)
+        # Translations touch every page; a first build has nothing to diff against
+        # No dirty page still runs the diff below: a changed row may only reach the assets
+        pages = None if not self.files or cfg.lang_sheet in changed else dirty_pages(self.rows, rows)
+        specs = site_pages(cfg)
+        built = [(f, build_page(cfg, title, builder())) for f, title, builder in specs if pages is None or f in pages]
+        names = [f for f, _, _ in specs]
+        names += [f"{c}/{f}" for c in site_languages(cfg) for f in names]
+        assets = site_assets(cfg)
+        files = localize_site(cfg, built) + assets
+        files += site_host_configs(cfg, names + [f for f, _ in assets])
+        if not self.files:
+            write_dir(files, self.out)
+            self.files = {p: _digest(d) for p, d in files}
+            paths = [p for p, _ in files]
+        else:
+            digests = {p: _digest(d) for p, d in files}
+            writes = [(p, d) for p, d in files if self.files.get(p) != digests[p]]
+            writes.sort(key=lambda w: w[0].rsplit("/", 1)[-1] in INDEX_PAGES)
+            removed = sorted(self.files.keys() - set(names) - digests.keys())
+            publish_files(writes, self.out, removed)
+            for p, _ in writes: self.files[p] = digests[p]
+            for p in removed: del self.files[p]
+            paths = [p for p, _ in writes] + removed
+        # Recorded only once published, so a failed build is retried next round
+        self.versions, self.rows = versions, rows
+        return paths
+
+def poll(sites, source):
+    # One round: every distinct sheet URL revalidated at once, then each site brought up to date
+    got = source.fetch_all([u for site in sites for u in site.urls])
+    for site in sites:
+        failed = [u for u in site.urls if isinstance(got.get(u), SheetError)]
+        if failed and site.files:
+            # Keep serving the last good build; a missing sheet would empty its pages
+            log.warning("%s: skipped, %s", site.name, got[failed[0]])
+            continue
+        started = time.perf_counter()
+        try:
+            paths = site.update({u: got[u].version for u in site.urls if u not in failed})
+        except Exception as e:
+            # One broken site must not stop the others
+            log.error("%s: build failed: %r", site.name, e)
+            continue
+        if paths:
+            log.info("%s: %d file(s) published in %.2fs", site.name, len(paths), time.perf_counter() - started)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Republish Titan sites whenever their sheets change.")
+    ap.add_argument("settings", nargs="+", help="site settings JSON files saved from the builder")
+    ap.add_argument("--out", default="dist", help="each site is published to <out>/<settings file name>")
+    ap.add_argument("--interval", type=float, default=60, help="seconds between polls")
+    ap.add_argument("--once", action="store_true", help="poll once and exit (for cron)")
+    args = ap.parse_args(argv)
+    names = [os.path.splitext(os.path.basename(p))[0] for p in args.settings]
+    if len(set(names)) < len(names): ap.error("settings files need distinct names")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    sites = [Site(p, os.path.join(args.out, n)) for p, n in zip(args.settings, names)]
+    # Revalidate every round, but let the builds of one round reuse its downloads. Settings
+    # files are trusted here, so sheets may be local paths anywhere.
+    source = SheetSource(fresh_for=args.interval / 2, local_dirs=None)
+    log.info("Watching %d site(s), %d sheet(s), every %gs", len(sites), len({u for s in sites for u in s.urls}), args.interval)
+    try:
+        # Own handles: nothing reaches st.cache_resource, so no Streamlit runtime is needed
+        with use_handles(cache=SharedCache(CACHE_LIMITS), sheets=source):
+            while True:
+                due = time.monotonic() + args.interval
+                poll(sites, source)
+                if args.once: return
+                time.sleep(max(0.0, due - time.monotonic()))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
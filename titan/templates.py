@@ -0,0 +1,380 @@
+# --- TITAN TEMPLATES ---
+# Page sections as Jinja2 templates, compiled once per process. Autoescaping is on, so a
+# quote or "<" in user text can't break the markup. Values that already are HTML (embed
+# codes, compiled posts, nested fragments) arrive as Markup; icons and Markdown are resolved
+# in the template. fragment() keeps each rendered section in the shared cache, keyed by the
+# template and the raw values it was given.
+import json
+import urllib.parse
+
+from jinja2 import DictLoader, Environment, StrictUndefined
+from markupsafe import Markup
+
+from .cache import shared_cache
+from .content import format_text
+from .icons import get_simple_icon, icon_svg
+
+SOURCES = {}
+
+# --- PARTIALS ---
+SOURCES["macros"] = """
+{% macro section_head(key, title, sub=None) -%}
+<div class="section-head reveal"><h2 data-t="{{ key }}.title">{{ title }}</h2>{% if sub %}<p data-t="{{ key }}.sub">{{ sub }}</p>{% endif %}</div>
+{%- endmacro %}
+{% macro share_row(url, text, label, networks, label_style="font-weight:bold;") -%}
+<p style="{{ label_style }}">{{ label }}</p>
+<div class="share-row">
+{% for net in networks %}
+{% if net == "whatsapp" %}<a href="https://wa.me/?text={{ text | urlquote }}%20{{ url | urlquote }}" target="_blank" class="share-btn bg-wa">{{ icon("whatsapp") }}</a>
+{% elif net == "facebook" %}<a href="https://www.facebook.com/sharer/sharer.php?u={{ url | urlquote }}" target="_blank" class="share-btn bg-fb">{{ icon("facebook") }}</a>
+{% elif net == "x" %}<a href="https://twitter.com/intent/tweet?url={{ url | urlquote }}&text={{ text | urlquote }}" target="_blank" class="share-btn bg-x">{{ icon("x") }}</a>
+{% elif net == "linkedin" %}<a href="https://www.linkedin.com/sharing/share-offsite/?url={{ url | urlquote }}" target="_blank" class="share-btn bg-li">{{ icon("linkedin") }}</a>
+{% endif %}
+{% endfor %}
+</div>
+{%- endmacro %}
+"""
+
+# --- PAGE SHELL ---
+SOURCES["head"] = """
+<meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{{ title }} | {{ biz_name }}</title>
+<meta name="description" content="{{ description }}">
+{% if gsc_tag %}<meta name="google-site-verification" content="{{ gsc_tag }}">{% endif %}
+"""
+
+SOURCES["pwa"] = """
+<link rel="manifest" href="manifest.json">
+<meta name="theme-color" content="{{ theme_color }}">
+<link rel="apple-touch-icon" href="{{ icon }}">
+"""
+
+SOURCES["fonts"] = """<link href="{{ href }}" rel="stylesheet">"""
+
+SOURCES["schema"] = """<script type="application/ld+json">{{ schema | tojson }}</script>"""
+
+# The page itself is only two joins; generators.render_page fills it with str.format
+PAGE_SHELL = """<!DOCTYPE html>
+<html lang="en">
+<head>
+{head}</head>
+<body>
+{body}</body>
+</html>
+"""
+
+# --- SECTIONS ---
+SOURCES["nav"] = """
+<nav><div class="container nav-flex">
+    <a href="index.html" style="text-decoration:none">{% if logo_url %}<img src="{{ logo_url }}" height="40" alt="{{ biz_name }} Logo">{% else %}<span style="font-weight:900; font-size:1.5rem; color:var(--p)">{{ biz_name }}</span>{% endif %}</a>
+    {% if lite %}
+    <input type="checkbox" id="nav-toggle" class="nav-toggle" aria-label="Menu"><label for="nav-toggle" class="mobile-menu">☰</label>
+    {% else %}
+    <div class="mobile-menu" onclick="document.querySelector('.nav-links').classList.toggle('active')">☰</div>
+    {% endif %}
+    {% set click = "" if lite else ' onclick="toggleMenu()"' | safe %}
+    <div class="nav-links">
+        <a href="index.html"{{ click }} data-t="nav.home">Home</a>
+        {% if show_features %}<a href="index.html#features"{{ click }} data-t="nav.features">Features</a>{% endif %}
+        {% if show_pricing %}<a href="index.html#pricing"{{ click }} data-t="nav.savings">Savings</a>{% endif %}
+        {% if show_inventory %}<a href="index.html#inventory"{{ click }} data-t="nav.store">Store</a>{% endif %}
+        {% if show_blog %}<a href="blog.html"{{ click }} data-t="nav.blog">Blog</a>{% endif %}
+        {% if show_booking %}<a href="booking.html"{{ click }} data-t="nav.book">Book Now</a>{% endif %}
+        {{ lang_links }}
+        <a href="contact.html"{{ click }} data-t="nav.contact">Contact</a>
+        <a href="tel:{{ phone }}" class="btn-accent" style="padding:0.6rem 1.5rem; margin-left:1.5rem; margin-bottom:0; border-radius:50px; color:white !important; width:auto; text-align:center; display:inline-block;" data-t="nav.call">Call Now</a>
+    </div>
+</div></nav>
+{% if not lite %}<script>function toggleMenu() { document.querySelector('.nav-links').classList.remove('active'); }</script>{% endif %}
+"""
+
+SOURCES["hero"] = """
+<section class="hero">
+    <div class="hero-overlay"></div>
+    {% for img in images %}
+    <div class="carousel-slide{% if loop.first %} active{% endif %}" style="background-image: url('{{ img | cssurl }}')"></div>
+    {% endfor %}
+    <div class="container hero-content">
+        <h1 data-t="hero.title">{{ title }}</h1>
+        <p data-t="hero.sub">{{ sub }}</p>
+        <div style="display:flex; gap:1rem; justify-content:center; flex-wrap:wrap;">
+            <a href="#inventory" class="btn btn-accent" data-t="hero.cta">Explore Now</a>
+            <a href="contact.html" class="btn" style="background:rgba(255,255,255,0.2); backdrop-filter:blur(10px); color:white;" data-t="hero.contact">Contact Us</a>
+        </div>
+    </div>
+</section>
+{% if not lite %}
+<script>
+    let currentSlide = 0;
+    setInterval(() => {
+        // Re-query each tick so the live preview can patch the hero markup in place
+        let slides = document.querySelectorAll('.carousel-slide');
+        if (!slides.length) return;
+        slides[currentSlide % slides.length].classList.remove('active');
+        currentSlide = (currentSlide + 1) % slides.length;
+        slides[currentSlide].classList.add('active');
+    }, 4000);
+</script>
+{% endif %}
+"""
+
+SOURCES["stats"] = """
+<div style="background:var(--p); color:white; padding:3rem 0; text-align:center;">
+    <div class="container grid-3">
+        {% for value, label in stats %}
+        <div class="reveal"><h3 style="color:#ffffff; margin:0; font-size:3rem;">{{ value }}</h3><p style="color:rgba(255,255,255,0.8); margin:0;" data-t="stats.{{ loop.index }}.label">{{ label }}</p></div>
+        {% endfor %}
+    </div>
+</div>
+"""
+
+SOURCES["features"] = """
+{% from "macros" import section_head %}
+<section id="features"><div class="container">{{ section_head("features", title) }}<div class="grid-3">
+{% for n, icon, name, desc in cards %}
+<div class="card reveal"><div style="color:var(--s); margin-bottom:1rem;">{{ simple_icon(icon) }}</div><h3 data-t="features.{{ n }}.title">{{ name }}</h3><div data-t="features.{{ n }}.desc">{{ desc | markdown }}</div></div>
+{% endfor %}
+</div></div></section>
+"""
+
+SOURCES["pricing"] = """
+{% from "macros" import section_head %}
+<section id="pricing"><div class="container">
+    {{ section_head("pricing", "The Cost of Ownership", 'See how the "Monthly Trap" adds up over 5 years.') }}
+    <div class="pricing-wrapper reveal">
+        <table class="pricing-table">
+            <thead>
+                <tr><th style="width:40%" data-t="pricing.col.category">Expense Category</th><th style="background:var(--s); font-size:1.2rem;" data-t="pricing.col.us">Titan Engine (Us)</th><th>{{ rival }}</th></tr>
+            </thead>
+            <tbody>
+                <tr><td data-t="pricing.row.setup">Initial Setup Fee</td><td><strong>{{ price }}</strong></td><td>$0</td></tr>
+                <tr><td data-t="pricing.row.annual">Annual Costs</td><td><strong>{{ annual }}</strong></td><td>{{ rival_annual }}</td></tr>
+                <tr><td><strong data-t="pricing.row.savings">Your 5-Year Savings</strong></td><td style="color:var(--s); font-size:1.3rem;">You Save {{ savings }}</td><td>$0</td></tr>
+            </tbody>
+        </table>
+    </div>
+</div></section>
+"""
+
+SOURCES["about"] = """
+<section id="about"><div class="container">
+    <div class="about-grid">
+        <div class="reveal">
+            <h2 style="font-size:2.5rem; margin-bottom:1.5rem;" data-t="about.title">{{ title }}</h2>
+            <div style="font-size:1.1rem; opacity:0.9; margin-bottom:2rem; color:var(--txt);" data-t="about.summary">{{ summary | markdown }}</div>
+            <a href="about.html" class="btn btn-primary" style="padding: 0.8rem 2rem; font-size:0.9rem;" data-t="about.cta">Read Our Full Story</a>
+        </div>
+        <img src="{{ image }}" class="reveal" loading="lazy" style="width:100%; border-radius:var(--radius); box-shadow:0 20px 50px -20px rgba(0,0,0,0.2); aspect-ratio:4/3; object-fit:cover;">
+    </div>
+</div></section>
+"""
+
+SOURCES["testimonials"] = """
+{% from "macros" import section_head %}
+<section style="background:#f8fafc"><div class="container">{{ section_head("testimonials", "Client Stories") }}<div class="grid-3">
+{% for n, name, quote in quotes %}
+<div class="card reveal" style="text-align:center;"><i>"<span data-t="testimonials.{{ n }}.quote">{{ quote }}</span>"</i><br><b>- {{ name }}</b></div>
+{% endfor %}
+</div></div></section>
+"""
+
+SOURCES["faq"] = """
+{% from "macros" import section_head %}
+<section id="faq"><div class="container" style="max-width:800px;">{{ section_head("faq", "Frequently Asked Questions") }}
+{% for n, q, a in items %}
+<details class='reveal'><summary data-t="faq.{{ n }}.q">{{ q }}?</summary><p data-t="faq.{{ n }}.a">{{ a }}</p></details>
+{% endfor %}
+</div></section>
+"""
+
+SOURCES["cta"] = """
+<section style="background:var(--s); color:white; text-align:center;"><div class="container reveal"><h2 data-t="cta.title">Start Owning Your Future</h2><p style="margin-bottom:2rem;" data-t="cta.sub">Stop paying rent.</p><a href="contact.html" class="btn" style="background:white; color:var(--s);" data-t="cta.button">Get Started</a></div></section>
+"""
+
+SOURCES["footer"] = """
+<footer><div class="container">
+    <div class="footer-grid">
+        <div>
+            <h3 style="color:white; margin-bottom:1.5rem;">{{ biz_name }}</h3>
+            <p style="opacity:0.8; font-size:0.9rem;" data-t="footer.address">{{ address }}</p>
+            <div style="margin-top:1.5rem; display:flex; gap:1.2rem;">
+            {% for href, label, name in socials %}<a href="{{ href }}" target="_blank" aria-label="{{ label }}">{{ icon(name, "social-icon") }}</a>{% endfor %}
+            </div>
+        </div>
+        <div>
+            <h4 style="color:white; font-size:0.9rem; text-transform:uppercase;" data-t="footer.links">Links</h4>
+            <a href="index.html" data-t="nav.home">Home</a><a href="blog.html" data-t="nav.blog">Blog</a><a href="booking.html" data-t="nav.book">Book Now</a>
+        </div>
+        <div>
+            <h4 style="color:white; font-size:0.9rem; text-transform:uppercase;" data-t="footer.legal">Legal</h4>
+            <a href="privacy.html" data-t="footer.privacy">Privacy</a><a href="terms.html" data-t="footer.terms">Terms</a>
+        </div>
+    </div>
+    <div style="border-top:1px solid rgba(255,255,255,0.1); margin-top:3rem; padding-top:2rem; text-align:center; opacity:0.4; font-size:0.8rem;">
+        &copy; 2026 {{ biz_name }}. Powered by Titan Engine.
+    </div>
+</div></footer>
+"""
+
+SOURCES["wa"] = """<a href="https://wa.me/{{ number }}" class="wa-float" target="_blank" style="position:fixed; bottom:30px; right:30px; background:#25d366; color:white; width:60px; height:60px; border-radius:50%; display:flex; align-items:center; justify-content:center; box-shadow:0 10px 30px rgba(37,211,102,0.4); z-index:9999;">{{ icon("whatsapp", size=32) }}</a>"""
+
+SOURCES["inner_header"] = """<section class="hero" style="min-height: 40vh; background:var(--p);"><div class="container"><h1 data-t="page.{{ key }}.title">{{ title }}</h1></div></section>"""
+
+SOURCES["text_page"] = """{% include "inner_header" %}<div class='container' data-t="page.{{ key }}.body">{{ text | markdown }}</div>"""
+
+SOURCES["booking"] = """
+<section class="hero" style="min-height:30vh; background:var(--p);">
+    <div class="container hero-content"><h1 data-t="booking.title">{{ title }}</h1><p data-t="booking.desc">{{ desc }}</p></div>
+</section>
+<section>
+    <div class="container" style="text-align:center;">
+        <div style="background:white; border-radius:12px; overflow:hidden; box-shadow:0 10px 40px rgba(0,0,0,0.1); width:100%;">
+            {{ embed }}
+        </div>
+    </div>
+</section>
+"""
+
+SOURCES["contact"] = """
+{% include "inner_header" %}
+<section>
+    <div class="container">
+        <div class="contact-grid">
+            <div>
+                <div style="background:var(--card); padding:2rem; border-radius:12px; border:1px solid #eee;">
+                    <h3 style="color:var(--p);" data-t="contact.title">Get In Touch</h3>
+                    <p style="margin-top:1rem;"><strong data-t="contact.address">📍 Address:</strong><br>{% for line in address %}{{ line }}{% if not loop.last %}<br>{% endif %}{% endfor %}</p>
+                    <p style="margin-top:1rem;"><strong data-t="contact.phone">📞 Phone:</strong><br><a href="tel:{{ phone }}" style="color:var(--s);">{{ phone }}</a></p>
+                    <p style="margin-top:1rem;"><strong data-t="contact.email">📧 Email:</strong><br><a href="mailto:{{ email }}">{{ email }}</a></p>
+                    <br>
+                    <a href="https://wa.me/{{ wa_num }}" target="_blank" class="btn btn-accent" style="width:100%; text-align:center;" data-t="contact.whatsapp">Chat on WhatsApp</a>
+                </div>
+            </div>
+
+            <div class="card">
+                <h3 style="margin-bottom:1.5rem;" data-t="contact.form">Send a Message</h3>
+                <form action="https://formsubmit.co/{{ email | urlquote("@") }}" method="POST">
+                    <div style="display:grid; grid-template-columns:1fr 1fr; gap:1rem;">
+                        <div><label data-t="contact.name">Name</label><input type="text" name="name" required placeholder="Your Name"></div>
+                        <div><label data-t="contact.your_email">Email</label><input type="email" name="email" required placeholder="Your Email"></div>
+                    </div>
+                    <label data-t="contact.message">Message</label><textarea name="message" rows="5" required placeholder="How can we help you?"></textarea>
+                    <button type="submit" class="btn btn-primary" style="width:100%;" data-t="contact.send">Send Message</button>
+                    <input type="hidden" name="_captcha" value="false">
+                    <input type="hidden" name="_next" value="{{ prod_url }}/contact.html">
+                </form>
+            </div>
+        </div>
+        <br><br>
+        <div style="border-radius:12px; overflow:hidden; box-shadow:0 10px 30px rgba(0,0,0,0.1);">{{ map_embed }}</div>
+    </div>
+</section>
+"""
+
+SOURCES["blog_hero"] = """
+<section class="hero" style="min-height:40vh; background-image: linear-gradient(rgba(0,0,0,0.6), rgba(0,0,0,0.6)), url('{{ image | cssurl }}'); background-size: cover;">
+    <div class="container"><h1 data-t="blog.title">{{ title }}</h1><p data-t="blog.sub">{{ sub }}</p></div>
+</section>
+"""
+
+SOURCES["blog_card"] = """<div class="card reveal"><img src="{{ image }}" class="prod-img" loading="lazy"><div><span class="blog-badge">{{ category }}</span><h3><a href="{{ href }}">{{ title }}</a></h3><p style="font-size:0.9rem; opacity:0.8;">{{ excerpt }}</p></div></div>"""
+
+# --- LITE (STATIC) STORE & BLOG ---
+SOURCES["store"] = """
+{% from "macros" import section_head %}
+<section id="inventory" style="background:rgba(0,0,0,0.02)"><div class="container">
+    {{ section_head("store", "Portfolio & Store", "Secure Checkout available.") }}
+    <div class="grid-3">
+    {% for file, name, price, desc, img, buy in cards %}
+    <div class="card reveal"><img src="{{ img }}" class="prod-img" loading="lazy" alt="{{ name }}"><div><h3><a href="{{ file }}">{{ name }}</a></h3><p style="font-weight:bold; color:var(--s);">{{ price }}</p><p style="font-size:0.9rem; opacity:0.8;">{{ desc }}</p>{{ buy }}</div></div>
+    {% else %}
+    <p style="text-align:center; padding:2rem;" data-t="store.empty">New products coming soon.</p>
+    {% endfor %}
+    </div>
+</div></section>
+"""
+
+SOURCES["buy_link"] = """
+{%- if stripe -%}
+<a href="{{ stripe }}" class="btn btn-primary" style="{{ style }}">Buy Now</a>
+{%- else -%}
+<a href="https://wa.me/{{ wa_num }}?text={{ order | urlquote }}" target="_blank" rel="noopener" class="btn" style="{{ style }}" data-t="store.order">Order on WhatsApp</a>
+{%- endif -%}
+"""
+
+SOURCES["product"] = """
+{% from "macros" import share_row %}
+<section style="padding-top:150px;"><div class="container"><div id="product-detail">
+    <div class="detail-view">
+        <img src="{{ img }}" alt="{{ name }}" style="width:100%; border-radius:12px;">
+        <div>
+            <h1 style="font-size:3rem; line-height:1.1;">{{ name }}</h1>
+            <p style="font-size:1.5rem; color:var(--s); font-weight:bold; margin-bottom:1.5rem;">{{ price }}</p>
+            <p>{{ desc }}</p>
+            {{ buy }}
+            <div style="margin-top:2rem; border-top:1px solid #eee; padding-top:1rem;">
+                {{ share_row(url, name, "Share Product:", ["whatsapp", "facebook", "x", "linkedin"], "font-size:0.9rem; font-weight:bold;") }}
+            </div>
+        </div>
+    </div>
+</div></div></section>
+"""
+
+SOURCES["post"] = """
+{% from "macros" import share_row %}
+<div id="post-container" style="padding-top:70px;">
+    <div style="background:var(--p); padding:clamp(3rem, 8vw, 6rem) 1rem; color:white; text-align:center;">
+        <div class="container">
+            <span class="blog-badge">{{ category }}</span>
+            <h1 style="font-size:clamp(1.8rem, 5vw, 3.5rem); margin-top:1rem;">{{ title }}</h1>
+        </div>
+    </div>
+    <div class="container" style="max-width:800px; padding:3rem 1.5rem;">
+        <img src="{{ image }}" alt="" style="width:100%; border-radius:12px; margin-bottom:2rem;">
+        <div style="line-height:1.8;">{{ body }}</div>
+        <div style="margin-top:3rem; border-top:1px solid #eee; padding-top:1.5rem;">
+            {{ share_row(url, title, "Share this article:", ["whatsapp"]) }}
+        </div>
+        <a href="blog.html" class="btn btn-primary" style="margin-top:2rem;">&larr; Back to Blog</a>
+    </div>
+</div>
+"""
+
+def _cssurl(value):
+    # For url('...') inside a style attribute: nothing that could end the string or the call
+    return urllib.parse.quote(str(value), safe=":/?#[]@!$&*+,;=%~.-_")
+
+def _urlquote(value, safe=""):
+    # Markup is already HTML; the URL wants the text it stands for
+    return urllib.parse.quote(value.unescape() if isinstance(value, Markup) else str(value), safe=safe)
+
+env = Environment(loader=DictLoader(SOURCES), autoescape=True, undefined=StrictUndefined, trim_blocks=True, lstrip_blocks=True)
+env.filters["cssurl"] = _cssurl
+env.filters["urlquote"] = _urlquote
+# Icons and Markdown are resolved inside the templates, so cache hits skip them and keys stay small
+env.filters["markdown"] = lambda text: Markup(format_text(text))
+env.globals["icon"] = lambda name, css_class="", size=None: Markup(icon_svg(name, css_class, size))
+env.globals["simple_icon"] = lambda name: Markup(get_simple_icon(name))
+env.policies["json.dumps_kwargs"] = {"sort_keys": False}
+TEMPLATES = {name: env.get_template(name) for name in SOURCES}
+
+def render(name, /, **ctx):
+    # Plain str, like every other generator; pass it back into a template as Markup(...)
+    return TEMPLATES[name].render(**ctx)
+
+def fragment(name, /, **ctx):
+    # Same template and inputs -> the HTML rendered last time, for every page and session
+    return cached((name, sorted(ctx.items())), lambda: render(name, **ctx))
+
+# A page build makes dozens of lookups and each shared_cache() call goes through
+# st.cache_resource (~9us), so the handle is resolved once per process
+_cache = None
+
+def cached(key, build):
+    global _cache
+    if _cache is None: _cache = shared_cache()
+    return _cache.get_or_set("html", key, build)
+
+def js(value):
+    # A Python value as a JS literal that is safe inside an inline <script>
+    return json.dumps(value).replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026").replace("'", "\\u0027")
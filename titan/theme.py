@@ -0,0 +1,268 @@
+# --- TITAN THEMES ---
+# Each theme only defines the variable block; the stylesheet itself is shared.
+# "dark" names a second theme served through prefers-color-scheme.
+import json
+import os
+
+import streamlit as st
+
+from .cache import shared_cache
+
+# Theme files and the preview component live next to app.py
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THEMES = {
+    "Clean Corporate (Light)": {"bg": "#ffffff", "txt": "#0f172a", "card": "#ffffff", "nav": "rgba(255, 255, 255, 0.95)"},
+    "Midnight SaaS (Dark)": {"bg": "#0f172a", "txt": "#f8fafc", "card": "#1e293b", "nav": "rgba(15, 23, 42, 0.9)"},
+    "Glassmorphism (Blur)": {"bg": "#ffffff", "txt": "#0f172a", "card": "#ffffff", "nav": "rgba(255, 255, 255, 0.95)"},
+    "Cyberpunk Neon": {"bg": "#050505", "txt": "#00ff9d", "card": "#111", "nav": "rgba(0,0,0,0.8)"},
+    "Luxury Gold": {"bg": "#1c1c1c", "txt": "#D4AF37", "card": "#2a2a2a", "nav": "rgba(28,28,28,0.95)"},
+    "Forest Eco": {"bg": "#f1f8e9", "txt": "#1b5e20", "card": "#ffffff", "nav": "rgba(241,248,233,0.9)"},
+    "Ocean Breeze": {"bg": "#e0f7fa", "txt": "#006064", "card": "#ffffff", "nav": "rgba(224,247,250,0.9)"},
+    "Stark Minimalist": {"bg": "#ffffff", "txt": "#000000", "card": "#ffffff", "nav": "rgba(255,255,255,1)"},
+    "Auto (Light/Dark)": {"bg": "#ffffff", "txt": "#0f172a", "card": "#ffffff", "nav": "rgba(255, 255, 255, 0.95)", "dark": "Midnight SaaS (Dark)"},
+}
+THEME_KEYS = ("bg", "txt", "card", "nav")
+THEMES_DIR = os.environ.get("TITAN_THEMES_DIR", os.path.join(ROOT_DIR, "themes"))
+
+def _themes_signature():
+    # Changes whenever a theme file is added, removed or edited
+    if not os.path.isdir(THEMES_DIR): return ()
+    return tuple(sorted((f, os.path.getmtime(os.path.join(THEMES_DIR, f))) for f in os.listdir(THEMES_DIR) if f.endswith(".json")))
+
+def registry():
+    # Built-in themes plus every valid file in THEMES_DIR, reloaded when a file changes
+    return _load_themes(_themes_signature())
+
+@st.cache_resource
+def _load_themes(signature):
+    themes = dict(THEMES)
+    for file_name, _ in signature:
+        try:
+            with open(os.path.join(THEMES_DIR, file_name), encoding="utf-8") as fh:
+                spec = json.load(fh)
+            name = spec.get("name") or file_name[:-5]
+            if all(k in spec for k in THEME_KEYS): themes[name] = spec
+        except (OSError, ValueError):
+            continue  # A broken theme file should never take the builder down
+    return themes
+
+def resolve(themes, name):
+    # -> (theme, its dark pair or None); only these two go into the site settings (cfg.theme_spec,
+    # cfg.dark_spec), so other theme files never change a build's digest
+    theme = themes.get(name, THEMES["Clean Corporate (Light)"])
+    return theme, themes.get(theme.get("dark"))
+
+def get_theme_vars(cfg):
+    # Keyed by the theme's values (not its name) so edited theme files never serve stale CSS
+    key = (cfg.theme_spec, cfg.dark_spec, cfg.p_color, cfg.s_color, cfg.h_font, cfg.b_font, cfg.border_rad)
+    return shared_cache().get_or_set("theme", ("vars",) + key, lambda: _compile_theme_vars(cfg))
+
+def _theme_block(theme):
+    return f"--bg: {theme['bg']}; --txt: {theme['txt']}; --card: {theme['card']}; --nav: {theme['nav']};"
+
+def _compile_theme_vars(cfg):
+    # Kept apart from the stylesheet so the live preview can swap just this block
+    css = f"""
+    :root {{
+        --p: {cfg.p_color}; --s: {cfg.s_color}; {_theme_block(cfg.theme_spec)}
+        --radius: {cfg.border_rad};
+        --h-font: '{cfg.h_font}', sans-serif; --b-font: '{cfg.b_font}', sans-serif;
+    }}
+    """
+    if cfg.dark_spec:
+        css += f"@media (prefers-color-scheme: dark) {{ :root {{ {_theme_block(cfg.dark_spec)} }} }}"
+    return css
+
+def get_theme_css(cfg):
+    return shared_cache().get_or_set("theme", ("css", cfg.anim_type), lambda: _compile_theme_css(cfg))
+
+def _compile_theme_css(cfg):
+    anim_css = ""
+    if cfg.anim_type == "Fade Up":
+        anim_css = ".reveal { opacity: 0; transform: translateY(30px); transition: all 0.8s ease-out; } .reveal.active { opacity: 1; transform: translateY(0); }"
+    elif cfg.anim_type == "Zoom In":
+        anim_css = ".reveal { opacity: 0; transform: scale(0.95); transition: all 0.8s cubic-bezier(0.175, 0.885, 0.32, 1.275); } .reveal.active { opacity: 1; transform: scale(1); }"
+    
+    hero_css = """
+    .hero { position: relative; min-height: 90vh; overflow: hidden; display: flex; align-items: center; justify-content: center; text-align: center; color: white; padding-top: 80px; background-color: var(--p); }
+    .carousel-slide { position: absolute; top: 0; left: 0; width: 100%; height: 100%; background-size: cover; background-position: center; opacity: 0; transition: opacity 1.5s ease-in-out; z-index: 0; }
+    .carousel-slide.active { opacity: 1; }
+    .hero-overlay { background: rgba(0,0,0,0.5); position: absolute; top: 0; left: 0; width: 100%; height: 100%; z-index: 1; }
+    .hero-content { z-index: 2; position: relative; animation: slideUp 1s ease-out; width: 100%; padding: 0 20px; }
+    @keyframes slideUp { from { opacity:0; transform: translateY(30px); } to { opacity:1; transform: translateY(0); } }
+    """
+
+    # Added CSS for Shopping Cart Modal & SOCIAL SHARE
+    cart_css = """
+    #cart-float { position: fixed; bottom: 100px; right: 30px; background: var(--p); color: white; padding: 15px 20px; border-radius: 50px; box-shadow: 0 10px 20px rgba(0,0,0,0.2); cursor: pointer; z-index: 998; display: flex; align-items: center; gap: 10px; font-weight: bold; }
+    #cart-modal { display: none; position: fixed; top: 50%; left: 50%; transform: translate(-50%, -50%); background: var(--card); width: 90%; max-width: 500px; padding: 2rem; border-radius: 16px; box-shadow: 0 20px 50px rgba(0,0,0,0.3); z-index: 1001; border: 1px solid rgba(128,128,128,0.2); }
+    #cart-overlay { display: none; position: fixed; top: 0; left: 0; width: 100%; height: 100%; background: rgba(0,0,0,0.5); z-index: 1000; }
+    .cart-item { display: flex; justify-content: space-between; align-items: center; gap: 10px; border-bottom: 1px solid #eee; padding: 10px 0; }
+    .cart-qty { display: inline-flex; align-items: center; gap: 6px; }
+    .cart-qty button { width: 26px; height: 26px; border-radius: 50%; border: 1px solid rgba(128,128,128,0.4); background: transparent; color: inherit; cursor: pointer; line-height: 1; }
+    .cart-rm { color: red; cursor: pointer; background: none; border: none; font-size: 1rem; }
+    #cart-toast { position: fixed; bottom: 30px; left: 50%; transform: translate(-50%, 20px); background: var(--txt); color: var(--bg); padding: 10px 20px; border-radius: 50px; opacity: 0; pointer-events: none; transition: 0.25s; z-index: 1002; font-weight: 600; }
+    #cart-toast.show { opacity: 1; transform: translate(-50%, 0); }
+    
+    /* SOCIAL SHARE STYLES */
+    .share-row { display: flex; gap: 10px; margin-top: 20px; flex-wrap: wrap; }
+    .share-label { font-weight: bold; margin-right: 5px; font-size: 0.9rem; align-self: center; }
+    .share-btn { width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; border-radius: 50%; color: white; transition: 0.3s; border: none; cursor: pointer; text-decoration: none; }
+    .share-btn:hover { transform: translateY(-3px); filter: brightness(1.1); }
+    .share-btn svg { width: 18px; height: 18px; fill: white; }
+    .bg-fb { background: #1877F2; }
+    .bg-x { background: #000000; }
+    .bg-li { background: #0A66C2; }
+    .bg-wa { background: #25D366; }
+    .bg-rd { background: #FF4500; }
+
+    /* STORE SEARCH & FILTERS */
+    .inv-filters { display: flex; flex-wrap: wrap; gap: 0.8rem; margin-bottom: 2rem; }
+    .inv-filters input, .inv-filters select { margin: 0; flex: 1 1 140px; }
+    .inv-filters #inv-q { flex: 3 1 240px; }
+    """
+
+    return f"""
+    * {{ box-sizing: border-box; }}
+    html {{ scroll-behavior: smooth; font-size: 16px; }}
+    body {{ background-color: var(--bg); color: var(--txt); font-family: var(--b-font); margin: 0; line-height: 1.6; overflow-x: hidden; }}
+    
+    p, h1, h2, h3, h4, h5, h6, span, li, div {{ color: inherit; }}
+    .legal-text {{ color: var(--txt) !important; }}
+    
+    h1, h2, h3, h4 {{ font-family: var(--h-font); color: var(--p); line-height: 1.1; margin-bottom: 1rem; }}
+    strong {{ color: var(--p); font-weight: 800; }}
+    
+    /* MOBILE OPTIMIZED TYPOGRAPHY */
+    h1 {{ font-size: clamp(2.5rem, 5vw, 4.5rem); }}
+    h2 {{ font-size: clamp(2rem, 4vw, 3rem); }}
+    
+    /* FORCE HERO TEXT WHITE */
+    .hero h1 {{ color: #ffffff !important; text-shadow: 0 4px 20px rgba(0,0,0,0.4); }}
+    .hero p {{ color: rgba(255,255,255,0.95) !important; font-size: clamp(1.1rem, 2vw, 1.3rem); max-width: 700px; margin: 0 auto 2rem auto; text-shadow: 0 2px 10px rgba(0,0,0,0.4); }}
+    
+    input, textarea, select {{ width: 100%; padding: 0.8rem; margin-bottom: 1rem; border: 1px solid #ccc; border-radius: 6px; font-family: inherit; }}
+    label {{ color: var(--txt); font-weight: bold; margin-bottom: 0.5rem; display: block; }}
+
+    .container {{ max-width: 1280px; margin: 0 auto; padding: 0 20px; }}
+    .btn {{ display: inline-block; padding: 1rem 2.5rem; border-radius: var(--radius); font-weight: 700; text-decoration: none; transition: 0.3s; text-transform: uppercase; letter-spacing: 0.5px; cursor: pointer; border: none; text-align: center; }}
+    .btn-primary {{ background: var(--p); color: white !important; }}
+    .btn-accent {{ background: var(--s); color: white !important; box-shadow: 0 10px 25px -5px var(--s); }}
+    .btn:hover {{ transform: translateY(-3px); filter: brightness(1.15); }}
+    
+    /* Nav */
+    nav {{ position: fixed; top: 0; width: 100%; z-index: 1000; background: var(--nav); backdrop-filter: blur(12px); border-bottom: 1px solid rgba(100,100,100,0.1); padding: 1rem 0; }}
+    .nav-flex {{ display: flex; justify-content: space-between; align-items: center; }}
+    .nav-links {{ display: flex; align-items: center; }}
+    .nav-links a {{ margin-left: 2rem; text-decoration: none; font-weight: 600; color: var(--txt); font-size: 0.9rem; opacity: 0.8; transition:0.2s; }}
+    .nav-links a:hover {{ opacity: 1; color: var(--s); }}
+    .mobile-menu {{ display: none; font-size: 1.5rem; cursor: pointer; }}
+    
+    {hero_css}
+    {cart_css}
+    
+    section {{ padding: clamp(3rem, 8vw, 5rem) 0; }}
+    .section-head {{ text-align: center; margin-bottom: clamp(2rem, 5vw, 4rem); }}
+    
+    /* GRIDS */
+    .grid-3 {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 2rem; }}
+    .about-grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 4rem; align-items: center; }}
+    .contact-grid {{ display: grid; grid-template-columns: 1fr 2fr; gap: 3rem; }}
+    .detail-view {{ display: grid; grid-template-columns: 1fr 1fr; gap: 4rem; align-items: start; }}
+    
+    .card {{ background: var(--card); padding: 2rem; border-radius: var(--radius); border: 1px solid rgba(100,100,100,0.1); transition: 0.3s; height: 100%; display: flex; flex-direction: column; }}
+    .card:hover {{ transform: translateY(-5px); box-shadow: 0 20px 40px -10px rgba(0,0,0,0.1); border-color: var(--s); }}
+    
+    /* DARK MODE FIX: FORCE CARD TEXT TO USE TEXT COLOR */
+    .card h1, .card h2, .card h3, .card h4, .card h5, .card h6, .card a {{ color: var(--txt) !important; text-decoration: none; }}
+    .card p {{ color: var(--txt); opacity: 0.9; }}
+    
+    .prod-img {{ width: 100%; height: 250px; object-fit: cover; border-radius: calc(var(--radius) - 4px); margin-bottom: 1.5rem; background: #f1f5f9; }}
+    
+    /* PRICING & FAQ */
+    .pricing-wrapper {{ overflow-x: auto; margin: 2rem 0; -webkit-overflow-scrolling: touch; padding-bottom: 1rem; }}
+    .pricing-table {{ width: 100%; border-collapse: collapse; min-width: 600px; }}
+    .pricing-table th {{ background: var(--p); color: white; padding: 1.5rem; text-align: left; font-size: 1.1rem; }}
+    .pricing-table td {{ padding: 1.5rem; border-bottom: 1px solid rgba(100,100,100,0.1); background: var(--card); color: var(--txt); }}
+    .pricing-table tr:last-child td {{ font-weight: bold; font-size: 1.2rem; background: rgba(var(--s), 0.1); border-bottom: none; }}
+
+    details {{ background: var(--card); border: 1px solid rgba(100,100,100,0.1); border-radius: 8px; margin-bottom: 1rem; padding: 1rem; cursor: pointer; color: var(--txt); }}
+    details summary {{ font-weight: bold; font-size: 1.1rem; color: var(--txt); }}
+    details p {{ margin-top: 1rem; margin-bottom: 0; opacity: 0.9; color: var(--txt); }}
+
+    /* Footer & Social */
+    footer {{ background: var(--p); color: white; padding: 4rem 0; margin-top: auto; }}
+    .footer-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 3rem; }}
+    footer a {{ color: rgba(255,255,255,0.8) !important; text-decoration: none; display: block; margin-bottom: 0.5rem; transition: 0.3s; }}
+    footer a:hover {{ color: #ffffff !important; text-decoration: underline; }}
+    .social-icon {{ width: 24px; height: 24px; fill: rgba(255,255,255,0.7); transition: 0.3s; }}
+    .social-icon:hover {{ fill: #ffffff; transform: scale(1.1); }}
+
+    /* BLOG & SHARE */
+    .blog-badge {{ background: var(--s); color: white; padding: 0.3rem 0.8rem; border-radius: 50px; font-size: 0.75rem; text-transform: uppercase; font-weight: bold; width: fit-content; margin-bottom: 1rem; display:inline-block; }}
+    
+    {anim_css}
+    
+    /* MOBILE OPTIMIZATIONS (FIXED) */
+    @media (max-width: 768px) {{
+        .nav-links {{ 
+            position: fixed; top: 70px; left: -100%; width: 100%; height: calc(100vh - 70px); 
+            background: var(--bg); flex-direction: column; padding: 2rem; transition: 0.3s; 
+            align-items: flex-start; justify-content: flex-start; border-top: 1px solid rgba(0,0,0,0.1); overflow-y: auto; gap: 1.5rem;
+        }}
+        .nav-links.active {{ left: 0; }}
+        .nav-links a {{ margin-left: 0; font-size: 1.2rem; }}
+        .mobile-menu {{ display: block; }}
+        
+        .hero {{ min-height: 60vh; padding-top: 100px; }}
+        .about-grid, .contact-grid, .detail-view {{ grid-template-columns: 1fr !important; gap: 2rem; }}
+        
+        /* Mobile Image Sizing Fix */
+        .prod-img, .about-grid img {{ height: auto !important; aspect-ratio: 16/9; }}
+        
+        /* Padding Fixes for Mobile */
+        .container {{ padding: 0 1.5rem; }}
+        
+        .btn {{ width: 100%; margin-bottom: 0.5rem; }}
+        .hero-content .btn {{ width: auto; }}
+        
+        /* Cart Position Adjustment */
+        #cart-float {{ bottom: 110px; right: 20px; }}
+    }}
+    """
+
+
+# --- LITE PROFILE ---
+# CSS stand-ins for the scripted parts of a page: the mobile menu is a checkbox, the hero
+# slides cross-fade on a keyframe loop and .reveal uses a scroll-driven animation where
+# the browser has one (content is simply visible elsewhere).
+REVEAL_FROM = {"Fade Up": "opacity: 0; transform: translateY(30px);", "Zoom In": "opacity: 0; transform: scale(0.95);"}
+
+def get_lite_css(cfg):
+    return shared_cache().get_or_set("theme", ("lite", cfg.anim_type), lambda: _compile_lite_css(cfg))
+
+def _compile_lite_css(cfg):
+    css = """
+    .nav-toggle { position: absolute; opacity: 0; width: 1px; height: 1px; pointer-events: none; }
+    .nav-toggle:focus-visible + .mobile-menu { outline: 2px solid var(--s); }
+    @media (max-width: 768px) { .nav-toggle:checked ~ .nav-links { left: 0; } }
+    .carousel-slide { transition: none; animation: titan-slide 12s linear infinite; }
+    .hero .carousel-slide:nth-child(2) { animation-delay: -1s; }
+    .hero .carousel-slide:nth-child(3) { animation-delay: 3s; }
+    .hero .carousel-slide:nth-child(4) { animation-delay: 7s; }
+    @keyframes titan-slide { 0% { opacity: 0; } 8.3%, 33.3% { opacity: 1; } 41.6%, 100% { opacity: 0; } }
+    @media (prefers-reduced-motion: reduce) { .carousel-slide { animation: none; } }
+    .reveal { opacity: 1; transform: none; transition: none; }
+    """
+    start = REVEAL_FROM.get(cfg.anim_type)
+    if start:
+        css += f"""
+    @keyframes titan-reveal {{ from {{ {start} }} }}
+    @supports (animation-timeline: view()) {{ @media (prefers-reduced-motion: no-preference) {{
+        .reveal {{ animation: titan-reveal linear both; animation-timeline: view(); animation-range: entry 0% entry 60%; }}
+    }} }}
+    """
+    return css
+
+def fonts_url(cfg):
+    return f"https://fonts.googleapis.com/css2?family={cfg.h_font.replace(' ', '+')}:wght@400;700;900&family={cfg.b_font.replace(' ', '+')}:wght@300;400;600&display=swap"
@@ -0,0 +1,595 @@
+# --- TITAN BUILDER UI ---
+# The Streamlit script body: sidebar, tabs and the Launchpad. Each rerun collects the
+# widget values into a SiteConfig and hands it to the generators, which are only
+# imported (and defined) once per process.
+import hashlib
+import os
+import time
+
+import streamlit as st
+
+from . import ai, perf_budget, theme
+from .cache import shared_cache
+from .config import SiteConfig
+from .content import sheet_source
+from .export import ARCHIVE_FORMATS, EXPORT_BASE, cached_site_files, export_site
+from .generators import PREFETCH_TYPES, site_pages
+from .jobs import export_jobs
+from .preview import OWNER_IDLE, live_preview, local_server, owns_server, start_server, stop_server
+from .preview_server import PROFILES, Profile
+
+# --- 0. STATE MANAGEMENT (AI INTEGRATION) ---
+def init_state(key, default_val):
+    if key not in st.session_state:
+        st.session_state[key] = default_val
+
+# --- 3. SIDEBAR: THE CONTROL CENTER ---
+def sidebar(cfg):
+    with st.sidebar:
+        st.title("Titan Architect")
+        st.caption("v35.5 | Type Safety Added")
+        st.divider()
+
+        # --- FEATURE 1: TITAN AI GENERATOR ---
+        with st.expander("🤖 Titan AI Generator", expanded=True):
+            st.info("Auto-write your website content.")
+
+            # 1. Strip accidental spaces
+            raw_key = st.text_input("Groq API Key (Free)", type="password", help="Get at console.groq.com")
+            groq_key = raw_key.strip() if raw_key else ""
+
+            biz_desc = st.text_input("Business Description", placeholder="e.g. Luxury Dental Clinic in Dubai")
+            sections = st.multiselect("Sections", list(ai.SECTIONS), default=list(ai.SECTIONS), format_func=lambda n: ai.SECTIONS[n].label)
+            with st.popover("⚙️ Endpoint"):
+                base_url = st.text_input("API Base URL", ai.BASE_URL, help="Any OpenAI-compatible endpoint. `python -m titan.mock_llm` serves canned answers locally.")
+                limit = st.slider("Parallel requests", 1, 8, ai.MAX_CONCURRENCY)
+                fresh = st.checkbox("Regenerate", help="Ask again instead of reusing the answers already given for this key and description.")
+
+            if st.button("✨ Generate Copy"):
+                if not groq_key or not biz_desc or not sections:
+                    st.error("Key, Description & Sections required.")
+                else:
+                    # Each section lands in session_state as soon as its answer is validated; the
+                    # tabs render after the sidebar, so they pick the new text up in this same run.
+                    log = st.container(border=True)
+                    log.caption("Titan AI is writing...")
+                    t0, done, slowest = time.perf_counter(), [], 0.0
+
+                    def on_result(name, result, error, seconds):
+                        nonlocal slowest
+                        slowest = max(slowest, seconds)
+                        label = ai.SECTIONS[name].label
+                        if error:
+                            log.caption(f"❌ {label}: {error}")
+                            return
+                        values, problems = result
+                        st.session_state.update(values)
+                        done.append(name)
+                        log.caption(f"✅ {label} ({seconds:.1f}s)" + (f" — skipped {'; '.join(problems)}" if problems else ""))
+
+                    try:
+                        ai.generate_sections(groq_key, biz_desc, sections, on_result, base_url=base_url, limit=limit, fresh=fresh)
+                    except Exception as e:
+                        log.caption(f"AI Error: {e}")
+                    summary = f"{len(done)}/{len(sections)} sections in {time.perf_counter() - t0:.1f}s (slowest {slowest:.1f}s)"
+                    (st.success if len(done) == len(sections) else st.warning if done else st.error)(summary)
+
+        # 3.1 VISUAL DNA
+        with st.expander("🎨 Visual DNA", expanded=False):
+            themes = theme.registry()
+            cfg.theme_mode = st.selectbox("Base Theme", list(themes))
+            cfg.theme_spec, cfg.dark_spec = theme.resolve(themes, cfg.theme_mode)
+            c1, c2 = st.columns(2)
+            cfg.p_color = c1.color_picker("Primary Brand", "#0F172A") 
+            cfg.s_color = c2.color_picker("Action (CTA)", "#EF4444")  
+
+            st.markdown("**Typography**")
+            cfg.h_font = st.selectbox("Headings", ["Montserrat", "Space Grotesk", "Playfair Display", "Oswald", "Clash Display"])
+            cfg.b_font = st.selectbox("Body Text", ["Inter", "Open Sans", "Roboto", "Satoshi", "Lora"])
+
+            st.markdown("**UI Physics**")
+            cfg.border_rad = st.select_slider("Corner Roundness", ["0px", "4px", "12px", "24px", "40px"], value="12px")
+            cfg.anim_type = st.selectbox("Animation Style", ["Fade Up", "Zoom In", "Slide Right", "None"])
+
+        # 3.2 MODULE MANAGER
+        with st.expander("🧩 Section Manager", expanded=False):
+            cfg.lite = st.radio("Build Profile", ["Standard", "Lite (zero JS)"], horizontal=True,
+                                help="Lite renders the store and blog at build time (one page per product and post), uses CSS for the menu, carousel and reveal, and ships no cart, service worker or search. Only the beacon runs script, if enabled.") != "Standard"
+            st.caption("Toggle sections to include:")
+            cfg.show_hero = st.checkbox("Hero Carousel", value=True)
+            cfg.show_stats = st.checkbox("Trust Stats/Logos", value=True)
+            cfg.show_features = st.checkbox("Feature Grid (4 Pillars)", value=True)
+            cfg.show_pricing = st.checkbox("Pricing Comparison Table", value=True)
+            cfg.show_inventory = st.checkbox("Portfolio/Inventory (CSV)", value=True)
+            cfg.show_blog = st.checkbox("Blog / News Engine", value=True)
+            cfg.show_gallery = st.checkbox("About Section", value=True)
+            cfg.show_testimonials = st.checkbox("Testimonials", value=True)
+            cfg.show_faq = st.checkbox("F.A.Q.", value=True)
+            cfg.show_cta = st.checkbox("Final Call to Action", value=True)
+            cfg.show_booking = st.checkbox("Booking Engine (New)", value=True) 
+
+        # 3.3 TECHNICAL
+        with st.expander("⚙️ SEO & Analytics", expanded=False):
+            st.markdown("**Targeting**")
+            cfg.seo_area = st.text_input("Service Area (City/Region)", "Global / Online")
+            seo_kw = st.text_area("SEO Keywords", "web design, no monthly fees, one time payment website, stop web rent")
+
+            st.markdown("**Verification**")
+            cfg.gsc_tag = st.text_input("Google Verification ID")
+            ga_tag = st.text_input("Google Analytics ID (G-XXXX)")
+            og_image = st.text_input("Social Share Image URL")
+
+        # 3.4 PERFORMANCE BUDGETS (checked on every export)
+        with st.expander("📏 Performance Budgets", expanded=False):
+            cfg.budgets = {m: st.number_input(label, min_value=0, value=default, step=1, key=f"budget_{m}") for m, (label, default) in perf_budget.BUDGETS.items()}
+            cfg.budget_mode = st.radio("When a budget is exceeded", ["Warn", "Block download"], horizontal=True)
+            cfg.budget_images = st.checkbox("Measure remote image sizes", value=True, help="HEAD request per image URL, cached per process.")
+
+        # 3.5 REAL USER MONITORING
+        with st.expander("📡 Real User Monitoring", expanded=False):
+            cfg.rum_on = st.checkbox("Inject web-vitals beacon", value=False, help="LCP, INP, CLS, TTFB and sheet fetch time, sent with sendBeacon when the visitor leaves the page.")
+            cfg.rum_endpoint = st.text_input("Beacon Endpoint", "http://localhost:8787/rum", help="Run `python -m titan.rum_collector` to collect locally.")
+            cfg.rum_site = st.text_input("Site ID", "", placeholder="defaults to the business name")
+            cfg.rum_sample = st.slider("Sample Rate (%)", 1, 100, 100)
+            cfg.rum_store = st.text_input("Collector Data File", "rum.jsonl", help="The JSONL or .db (SQLite) file the collector writes; read by the Field Data view.")
+
+        # 3.6 NAVIGATION PREFETCH
+        with st.expander("🚀 Navigation Prefetch", expanded=False):
+            st.caption("Speculation Rules plus a hover/touch prefetch fallback. Skipped on Save-Data and 2G connections.")
+            cfg.prefetch_modes = {t: st.selectbox(label, ["Off", "Prefetch", "Prerender"], index=default, key=f"prefetch_{t}") for t, (label, default) in PREFETCH_TYPES.items()}
+            cfg.prefetch_eagerness = st.select_slider("Eagerness", ["conservative", "moderate", "eager"], value="moderate", help="conservative: on press, moderate: on hover, eager: as soon as the link is seen.")
+
+        # 3.7 ARCHIVE FORMAT
+        with st.expander("📦 Archive", expanded=False):
+            st.caption("Reproducible output: sorted entries, fixed timestamps (`SOURCE_DATE_EPOCH`), 0644 files.")
+            cfg.archive_format = st.selectbox("Format", list(ARCHIVE_FORMATS), format_func=lambda f: "Folder on this server" if f == "dir" else f)
+            if cfg.archive_format == "dir":
+                cfg.export_dir = st.text_input("Output Folder", "site", help=f"Inside {EXPORT_BASE}/ on this server. Replaced atomically on every export.")
+            else:
+                cfg.archive_level = st.slider("Compression Level", 0, 9, 6, help="Higher is smaller and slower. xz levels are presets.")
+
+        # 3.8 SHARED CACHE METRICS
+        with st.expander("📈 Cache Metrics", expanded=False):
+            st.caption("Process-wide caches shared by every open session.")
+            st.dataframe(shared_cache().metrics(), hide_index=True, use_container_width=True)
+
+
+# --- 4. MAIN WORKSPACE ---
+def workspace(cfg):
+    st.title("🏗️ StopWebRent Site Builder v35.5")
+
+    # Each tab is a form: edits batch together and only rerun the app on "Apply Changes"
+    tabs = st.tabs(["1. Identity & PWA", "2. Content Blocks", "3. Pricing Logic", "4. Store & Payments", "5. Booking", "6. Blog Engine", "7. Legal & Footer"])
+
+    with tabs[0], st.form("identity_form", border=False):
+        c1, c2 = st.columns(2)
+        with c1:
+            cfg.biz_name = st.text_input("Business Name", "StopWebRent.com")
+            biz_tagline = st.text_input("Tagline", "Stop Renting. Start Owning.")
+            cfg.biz_phone = st.text_input("Phone", "966572562151")
+            cfg.biz_email = st.text_input("Email (For Forms)", "hello@kaydiemscriptlab.com")
+        with c2:
+            cfg.prod_url = st.text_input("Website URL", "https://www.stopwebrent.com")
+            cfg.biz_addr = st.text_area("Address", "Kaydiem Script Lab\nKanishka’s House, Garia Station Rd\nKolkata, West Bengal 700084, India", height=100)
+            cfg.map_iframe = st.text_area("Google Map Embed Code", placeholder='<iframe src="..."></iframe>', height=100)
+            cfg.seo_d = st.text_area("Meta Description (SEO)", "Stop paying monthly fees for Wix or Shopify. The Titan Engine builds ultra-fast (0.1s) websites with $0 hosting costs. Pay once, own your code forever.", height=100)
+            cfg.logo_url = st.text_input("Logo URL (PNG/SVG)")
+
+        # --- FEATURE 4: PWA SETTINGS ---
+        st.subheader("📱 Progressive Web App (PWA)")
+        st.info("Makes your website installable as an App on Android/iOS.")
+        cfg.pwa_short = st.text_input("App Short Name", cfg.biz_name[:12])
+        cfg.pwa_desc = st.text_input("App Description", "Official App")
+        cfg.pwa_icon = st.text_input("App Icon (512x512 PNG)", cfg.logo_url)
+
+        # --- FEATURE 5: MULTI-LANGUAGE ---
+        st.subheader("🌍 Multi-Language Static Builds")
+        st.info("Provide a second Google Sheet URL with translations. Columns: `ElementID`, `TranslatedText`, optional `Lang`. Each language is exported as its own folder (e.g. `/es/`).")
+        cfg.lang_sheet = st.text_input("Translation Sheet CSV URL (Optional)")
+        cfg.lang_list = st.text_input("Translation Languages", "es", help="Comma-separated language codes. Rows without a Lang column go to the first one.")
+
+        st.subheader("Social Links")
+        sc1, sc2, sc3 = st.columns(3)
+        cfg.fb_link = sc1.text_input("Facebook URL")
+        cfg.ig_link = sc2.text_input("Instagram URL")
+        cfg.x_link = sc3.text_input("X (Twitter) URL")
+
+        sc4, sc5, sc6 = st.columns(3)
+        cfg.li_link = sc4.text_input("LinkedIn URL")
+        cfg.yt_link = sc5.text_input("YouTube URL")
+        cfg.wa_num = sc6.text_input("WhatsApp Number (No +)", "966572562151")
+        st.form_submit_button("💾 Apply Changes")
+
+    with tabs[1], st.form("content_form", border=False):
+        st.subheader("Hero Carousel (AI Editable)")
+        st.info("💡 Titan AI can auto-fill these fields.")
+        cfg.hero_h = st.text_input("Hero Headline", key="hero_h")
+        cfg.hero_sub = st.text_input("Hero Subtext", key="hero_sub")
+
+        hc1, hc2, hc3 = st.columns(3)
+        cfg.hero_img_1 = hc1.text_input("Slide 1 Image", "https://images.unsplash.com/photo-1460925895917-afdab827c52f?q=80&w=1600")
+        cfg.hero_img_2 = hc2.text_input("Slide 2 Image", "https://images.unsplash.com/photo-1551288049-bebda4e38f71?q=80&w=1600")
+        cfg.hero_img_3 = hc3.text_input("Slide 3 Image", "https://images.unsplash.com/photo-1526374965328-7f61d4dc18c5?q=80&w=1600")
+
+        st.divider()
+
+        st.subheader("Trust Stats Data")
+        col_s1, col_s2, col_s3 = st.columns(3)
+        cfg.stat_1 = col_s1.text_input("Stat 1", "0.1s")
+        cfg.label_1 = col_s1.text_input("Label 1", "Load Speed")
+
+        cfg.stat_2 = col_s2.text_input("Stat 2", "$0")
+        cfg.label_2 = col_s2.text_input("Label 2", "Monthly Fees")
+
+        cfg.stat_3 = col_s3.text_input("Stat 3", "100%")
+        cfg.label_3 = col_s3.text_input("Label 3", "Ownership")
+
+        st.divider()
+
+        st.subheader("The 4 Pillars (Feature Grid)")
+        cfg.f_title = st.text_input("Features Title", "The Titan Value Pillars")
+        cfg.feat_data_input = st.text_area("Features List", key="feat_data", height=150)
+
+        st.subheader("About Content")
+
+        cfg.about_h_in = st.text_input("About Title", key="about_h")
+        cfg.about_img = st.text_input("About Side Image", "https://images.unsplash.com/photo-1543286386-713df548e9cc?q=80&w=1600")
+
+        c_a1, c_a2 = st.columns(2)
+        cfg.about_short_in = c_a1.text_area("Home Page Summary (Short)", key="about_short", height=200)
+        cfg.about_long = c_a2.text_area("Full About Page Content (Long)", key="about_long", height=200)
+        st.form_submit_button("💾 Apply Changes")
+
+    with tabs[2], st.form("pricing_form", border=False):
+        st.subheader("💰 Pricing Comparison Table")
+        st.info("This configures the table that compares you vs. Wix/Shopify.")
+        col_p1, col_p2, col_p3 = st.columns(3)
+        cfg.titan_price = col_p1.text_input("Titan Setup Price", "$199")
+        cfg.titan_mo = col_p1.text_input("Titan Monthly", "$0")
+        cfg.wix_name = col_p2.text_input("Competitor Name", "Wix (Core Plan)")
+        cfg.wix_mo = col_p2.text_input("Competitor Monthly", "$29/mo")
+        cfg.save_val = col_p3.text_input("5-Year Savings Calculation", "$1,466")
+        st.form_submit_button("💾 Apply Changes")
+
+    with tabs[3], st.form("store_form", border=False):
+        st.subheader("🛒 Store, Payment & Inventory")
+        st.info("⚡ Power your portfolio with a Google Sheet. **Added Feature: Payment Links**")
+        cfg.sheet_url = st.text_input("Google Sheet CSV Link", placeholder="https://docs.google.com/spreadsheets/d/e/.../pub?output=csv", help="A local HTTP server also works for builds; local CSV files only from the folders in TITAN_LOCAL_SHEETS.")
+        cfg.custom_feat = st.text_input("Default Product Image URL (Fallback)", "https://images.unsplash.com/photo-1460925895917-afdab827c52f?q=80&w=800")
+
+        # --- FEATURE 2: PAYMENTS ---
+        st.markdown("### 💳 Payment Gateways")
+        st.caption("We have added a Shopping Cart (Cart.js) and direct payment links.")
+        col_pay1, col_pay2 = st.columns(2)
+        cfg.paypal_link = col_pay1.text_input("PayPal.me Link", "https://paypal.me/yourid")
+        cfg.upi_id = col_pay2.text_input("UPI ID (India)", "yourname@upi")
+
+        st.markdown("""
+        **CSV Instruction Update:**
+        Add a 5th Column to your CSV named `StripeLink`. 
+        - If you paste a Stripe Payment Link there, the button becomes "Buy Now".
+        - If empty, the button is "Add to Cart" (WhatsApp Checkout).
+        """)
+        st.form_submit_button("💾 Apply Changes")
+
+    # --- NEW: CATALOG VALIDATION ---
+    with tabs[3], st.expander("🔍 Validate Catalog"):
+        st.caption("Streams the sheet row by row: malformed rows, missing columns, bad image or payment URLs and duplicate names. "
+                   "Rows with errors and repeated names are left out of the build. For very large files run `python -m titan.catalog_check <csv> --out clean.csv`.")
+        if st.button("Run Check", disabled=not cfg.sheet_url):
+            from . import catalog_check, data_sources
+            try:
+                sheet = sheet_source().fetch(cfg.sheet_url)
+            except data_sources.SheetError as e:
+                st.error(f"Could not load the sheet: {e}")
+            else:
+                issues, counts = [], {"row": 0, "error": 0, "warning": 0}
+                for kind, x in catalog_check.validate(sheet.rows()):
+                    counts[kind if kind == "row" else x.severity] += 1
+                    if kind == "issue" and len(issues) < 500: issues.append({"Line": x.line, "Level": x.severity, "Column": x.column, "Problem": x.message})
+                c1, c2, c3 = st.columns(3)
+                c1.metric("Clean rows", counts["row"]); c2.metric("Errors", counts["error"]); c3.metric("Warnings", counts["warning"])
+                if issues: st.dataframe(issues, use_container_width=True, hide_index=True)
+                else: st.success("Catalog looks good.")
+
+    with tabs[4], st.form("booking_form", border=False):
+        # --- FEATURE 3: BOOKING ENGINE ---
+        st.subheader("📅 One-Click Booking Engine")
+
+        # INSTRUCTION BOX FOR THE USER
+        st.markdown("""
+        <div style="background:#e0f2fe; padding:15px; border-radius:10px; border-left: 5px solid #0284c7; color: #0284c7; margin-bottom:15px;">
+            <strong>⚠️ Avoid "Unavailable" Errors:</strong><br>
+            1. Login to Calendly and ensure your Event Type is <strong>ON</strong>.<br>
+            2. Click <strong>Share</strong> on the specific event -> <strong>Add to Website</strong> -> <strong>Inline Embed</strong>.<br>
+            3. Copy that code. Do NOT just paste the URL.
+        </div>
+        """, unsafe_allow_html=True)
+
+        # Defaulting to a working demo so it never looks broken initially
+        cfg.booking_embed = st.text_area("Paste Embed Code (iframe)", height=150, value='<!-- Calendly inline widget begin -->\n<div class="calendly-inline-widget" data-url="https://calendly.com/titan-demo/30min" style="min-width:320px;height:630px;"></div>\n<script type="text/javascript" src="https://assets.calendly.com/assets/external/widget.js" async></script>\n<!-- Calendly inline widget end -->')
+        cfg.booking_title = st.text_input("Booking Page Title", key="booking_title")
+        cfg.booking_desc = st.text_input("Booking Page Subtext", key="booking_desc")
+        st.form_submit_button("💾 Apply Changes")
+
+    with tabs[5], st.form("blog_form", border=False):
+        st.subheader("📰 Titan Blog Engine")
+        st.info("Connect a Google Sheet to power your blog. Zero database required.")
+        st.caption("Columns: `Slug`, `Title`, `Date`, `Category`, `Summary`, `ImageURL`, `Content` (Markdown). The sheet is compiled into a paged summary feed plus one file per post at export time.")
+        cfg.blog_sheet_url = st.text_input("Blog CSV Link", placeholder="https://docs.google.com/spreadsheets/d/e/.../pub?output=csv", help="Publish your sheet as CSV")
+        cfg.blog_hero_title = st.text_input("Blog Page Title", key="blog_hero_title")
+        cfg.blog_hero_sub = st.text_input("Blog Page Subtext", key="blog_hero_sub")
+        st.text_area("AI Blog Drafts (CSV)", key="blog_drafts", height=120, help="Written by the AI generator. Paste these rows into your blog sheet; they are not exported directly.")
+        st.form_submit_button("💾 Apply Changes")
+
+    with tabs[6], st.form("legal_form", border=False):
+        st.subheader("Trust & Legal")
+        cfg.testi_data = st.text_area("Testimonials (Name | Quote)", key="testi_data", height=100)
+        cfg.faq_data = st.text_area("FAQ Data (Q? ? A)", key="faq_data", height=100)
+        l1, l2 = st.columns(2)
+        cfg.priv_txt = l1.text_area("Privacy Policy Text", key="priv_txt", height=200)
+        cfg.term_txt = l2.text_area("Terms of Service Text", key="term_txt", height=200)
+        st.form_submit_button("💾 Apply Changes")
+
+# --- 7. DEPLOYMENT & RESTORED PREVIEW ---
+PREVIEW_PAGES = {
+    "Home": "index.html", "About": "about.html", "Contact": "contact.html", "Blog Index": "blog.html",
+    "Blog Post (Demo)": "post.html", "Privacy": "privacy.html", "Terms": "terms.html",
+    "Product Detail (Demo)": "product.html", "Booking Page": "booking.html",
+}
+
+def launchpad(cfg):
+    st.divider()
+    st.subheader("🚀 Launchpad")
+    c1, c2 = st.columns([3, 1])
+    with c1:
+        preview_panel(cfg)
+    with c2:
+        export_panel(cfg)
+    server_panel(cfg)
+
+    # NEW: Per-page budget breakdown from the last export
+    if st.session_state.get("_budget_report"):
+        report, over = st.session_state["_budget_report"]
+        with st.expander("📏 Performance Budget Report", expanded=bool(over)):
+            for page_file, metric, value, limit in over:
+                st.markdown(f"- `{page_file}`: {perf_budget.BUDGETS[metric][0]} is **{value}** (budget {limit})")
+            st.dataframe(report, hide_index=True, use_container_width=True)
+
+# Runs as a fragment: switching preview pages only reruns the preview,
+# and this is the only place that pays the page render cost.
+@st.fragment
+def preview_panel(cfg):
+    live = st.toggle("⚡ Live Preview", value=True, help="Pause to keep editing without re-rendering the preview.")
+    # RESTORED RADIO BUTTONS FOR PREVIEW
+    preview_mode = st.radio("Preview Page:", list(PREVIEW_PAGES), horizontal=True)
+
+    if live or st.button("🔄 Render Preview Once"):
+        if preview_mode == "Product Detail (Demo)":
+            st.info("ℹ️ Demo Mode Active: Showing the first available product from your CSV.")
+        page_file = PREVIEW_PAGES[preview_mode]
+        _, title, builder = next(p for p in site_pages(cfg, demo=True) if p[0] == page_file)
+        live_preview(cfg, page_file, title, builder())
+    else:
+        st.info("⏸️ Live preview paused.")
+        # The iframe is gone, so the next render must ship a full document
+        st.session_state.pop("_lp_state", None)
+
+# --- NEW: BACKGROUND EXPORT ---
+# The build runs on the export job pool (see jobs.py); this fragment only polls it,
+# so neither the export nor the download button ever reruns the preview.
+def export_panel(cfg):
+    job = export_jobs().get(st.session_state.get("_export_job"))
+    st.fragment(_export_panel, run_every=0.5 if job and job.active else None)(cfg)
+
+def _export_panel(cfg):
+    job = export_jobs().get(st.session_state.get("_export_job"))
+    if job and job.active:
+        st.progress(job.progress, text=f"Building `{job.current}` ({job.done}/{job.total})" if job.current else "Queued...")
+        if st.button("✖ Cancel Export"): job.cancel()
+        return
+    if job and st.session_state.get("_export_seen") != job.id:
+        # Finished since the last full run: rerun the app once to stop polling and show the report
+        st.session_state["_export_seen"] = job.id
+        if job.result: st.session_state["_budget_report"] = (job.result.report, job.result.over)
+        st.rerun()
+
+    status = st.empty()
+    last = st.session_state.get("_budget_report")
+    if last is None: status.info("Budgets are checked on export.")
+    elif last[1]: status.warning(f"{len(last[1])} budget(s) exceeded. See the breakdown below.")
+    else: status.success("System Ready. All pages within budget.")
+    if job and job.state == "blocked": status.error(f"Export blocked: {len(job.result.over)} budget(s) exceeded. See the breakdown below.")
+    elif job and job.state == "failed": status.error(f"Export failed: {job.error}")
+    elif job and job.state == "cancelled": status.info("Export cancelled.")
+
+    label = "WRITE WEBSITE FOLDER" if cfg.archive_format == "dir" else f"DOWNLOAD WEBSITE {cfg.archive_format.upper()}"
+    if st.button(label, type="primary"):
+        job = export_jobs().submit(cfg.digest(), lambda j: export_site(cfg, j))
+        st.session_state["_export_job"] = job.id
+        # Full rerun so the panel is registered again, now polling
+        st.rerun()
+
+    if job and job.state == "done":
+        r = job.result
+        how = "from cache" if job.cached else f"built in {job.finished - job.submitted:.1f}s"
+        if r.mime is None:
+            st.success(f"Written to `{r.file_name}`")
+            st.caption(f"{r.files} files, {how}.")
+        else:
+            st.download_button("📥 Click to Save", r.archive, r.file_name, r.mime)
+            st.caption(f"{r.files} files, {len(r.archive) / 1024:.0f} KB, {how}. sha256 `{hashlib.sha256(r.archive).hexdigest()[:16]}`")
+        if job.key != cfg.digest(): st.caption("⚠️ Settings changed since this export.")
+
+    # Input for the sheet watcher, which republishes the site when its sheets change
+    st.download_button("⬇ Site Settings", cfg.to_json(), f"{cfg.biz_name.lower().replace(' ','_')}.json", "application/json",
+                       help="Run `python -m titan.sheet_watcher <file>` to rebuild changed product, post and index pages whenever the sheets change.")
+
+# --- NEW: LOCAL PREVIEW SERVER ---
+# The whole site (every page, translation and asset) served from memory behind a simulated
+# network. Each full rerun of the session that started it republishes the build (rebuilt only
+# when settings or sheets change); open tabs reload when their file changed.
+def server_panel(cfg):
+    server = local_server()
+    with st.expander("🛰️ Local Preview Server", expanded=server.running):
+        if not owns_server(server):
+            st.info(f"Serving another session's build at {server.url}. It can be started here once that session stops it or goes idle for {OWNER_IDLE // 60} minutes.")
+            return
+        c1, c2, c3, c4 = st.columns(4)
+        name = c1.selectbox("Network Profile", list(PROFILES) + ["Custom"], index=1)
+        if name == "Custom":
+            base = PROFILES["Slow 3G"]
+            profile = Profile(c2.number_input("Latency (ms)", 0, 10000, base.latency_ms, step=50),
+                              c3.number_input("Downlink (kbps)", 0, 100000, base.down_kbps, step=100, help="0 = unlimited"),
+                              c4.number_input("CPU Slowdown", 1.0, 20.0, float(base.cpu), step=1.0, help="Long tasks on the page take this many times longer."))
+        else:
+            profile = PROFILES[name]
+            c2.metric("Latency", f"{profile.latency_ms} ms")
+            c3.metric("Downlink", f"{profile.down_kbps} kbps" if profile.down_kbps else "unlimited")
+            c4.metric("CPU Slowdown", f"{profile.cpu:g}x")
+        st.caption("Throttling applies to this server's responses; third-party requests (fonts, images, sheets, embeds) are timed but not slowed.")
+
+        if not server.running:
+            port = st.number_input("Port", 1024, 65535, 8790)
+            if st.button("▶ Start Preview Server"):
+                try: start_server(server, int(port))
+                except OSError as e: st.error(f"Could not start the server: {e}")
+                else: st.rerun()
+            return
+        server.profile = profile
+        changed = server.publish(cached_site_files(cfg))
+        st.success(f"Serving build #{server.rev} ({len(server.files)} files) at {server.url}")
+        if changed: st.caption(f"{len(changed)} file(s) changed in this build; open pages showing them reload.")
+        if st.button("■ Stop Preview Server"):
+            stop_server(server)
+            st.rerun()
+        waterfall(server)
+
+def _short_url(url, site):
+    return url[len(site) - 1:] if url.startswith(site) else url.split("://", 1)[-1][:70]
+
+@st.fragment
+def waterfall(server):
+    st.button("🔄 Refresh Waterfall")
+    loads = list(server.loads)[::-1]
+    if not loads:
+        st.info("Open a page from the server. Its waterfall shows up here about 3 seconds after it finishes loading.")
+        return
+    labels = {f"{time.strftime('%H:%M:%S', time.localtime(l['ts']))}  {l['page']}": l for l in loads}
+    load = labels[st.selectbox("Page Load", list(labels))]
+    m, p, entries = load["metrics"], load["profile"], load["entries"]
+    st.caption(f"Loaded at {p['latency_ms']} ms latency, {p['down_kbps'] or 'unlimited'} kbps, {p['cpu']:g}x CPU.")
+    cols = st.columns(6)
+    for col, (label, v) in zip(cols, [("FCP", m["fcp"]), ("LCP", m["lcp"]), ("DOM Ready", m["dcl"]), ("Load", m["load"])]):
+        col.metric(label, "-" if v is None else f"{v / 1000:.2f} s")
+    cols[4].metric("Requests", len(entries))
+    cols[5].metric("Transferred", f"{sum(e['bytes'] for e in entries) / 1024:.0f} KB")
+    target = st.number_input("LCP Target (s)", 0.1, 30.0, 2.5, step=0.1, help="The speed the site is sold on; 2.5 s is the Core Web Vitals 'good' threshold.")
+    if m["lcp"] is None: st.info("The browser reported no LCP for this load.")
+    elif m["lcp"] <= target * 1000: st.success(f"LCP {m['lcp'] / 1000:.2f} s is within the {target:g} s target.")
+    else: st.warning(f"LCP {m['lcp'] / 1000:.2f} s misses the {target:g} s target.")
+
+    site = server.url
+    rows = [{"request": f"{i:02d} {_short_url(e['url'], site)}", "url": e["url"], "kind": e["kind"], "start": e["start"], "end": e["end"],
+             "ms": round(e["end"] - e["start"], 1), "KB": round(e["bytes"] / 1024, 1)} for i, e in enumerate(entries, 1)]
+    st.vega_lite_chart(spec={
+        "data": {"values": rows}, "mark": "bar", "height": max(120, 20 * len(rows)),
+        "encoding": {
+            "y": {"field": "request", "type": "nominal", "sort": None, "title": None, "axis": {"labelLimit": 360}},
+            "x": {"field": "start", "type": "quantitative", "title": "ms after navigation start"}, "x2": {"field": "end"},
+            "color": {"field": "kind", "type": "nominal", "title": None},
+            "tooltip": [{"field": "url"}, {"field": "kind"}, {"field": "start", "type": "quantitative"}, {"field": "ms", "type": "quantitative"}, {"field": "KB", "type": "quantitative"}],
+        },
+    }, use_container_width=True)
+    st.dataframe([{k: r[k] for k in ("request", "kind", "start", "end", "ms", "KB")} for r in rows], hide_index=True, use_container_width=True)
+
+# --- 8. FIELD DATA (RUM) ---
+@st.fragment
+def field_data(cfg):
+    with st.expander("📡 Field Data (RUM)", expanded=False):
+        st.caption(f"Percentiles per site and page from `{cfg.rum_store}`. Times in ms, CLS unitless.")
+        if not os.path.exists(cfg.rum_store):
+            st.info("No samples yet. Enable the beacon in the sidebar, publish, and run `python -m titan.rum_collector`.")
+            return
+        st.button("🔄 Refresh")
+        from . import rum_collector
+        rows = rum_collector.aggregate(rum_collector.open_store(cfg.rum_store).samples())
+        if rows: st.dataframe(rows, hide_index=True, use_container_width=True)
+        else: st.info("The collector file has no samples yet.")
+
+def main():
+    init_state('hero_h', "Stop Paying Rent for Your Website.")
+    init_state('hero_sub', "The Titan Engine is the world’s first 0.1s website architecture that runs on $0 monthly fees. Pay once. Own it forever.")
+    init_state('about_h', "Control Your Empire from a Spreadsheet")
+    init_state('about_short', "No WordPress dashboard. No plugins to update. Just open your private Google Sheet, change a text, and watch your site update globally in seconds.")
+    init_state('feat_data', "bolt | The Performance Pillar | **0.1s High-Velocity Loading**. While traditional sites take 3–5s, Titan loads instantly.\nwallet | The Economic Pillar | **$0 Monthly Fees**. We eliminated hosting subscriptions.\ntable | The Functional Pillar | **Google Sheets CMS**. Update prices and photos directly from a simple spreadsheet.\nshield | The Authority Pillar | **Unhackable Security**. Zero-DB Architecture removes the hacker's primary entry point.\nlayers | The Reliability Pillar | **Global Edge Deployment**. Distributed across 100+ servers worldwide.\nstar | The Conversion Pillar | **One-Tap WhatsApp**. Direct-to-Chat technology.")
+    init_state('about_long', "**The Digital Landlord Trap**\nMost business owners don't realize they are trapped in a rental cycle...")
+    init_state('testi_data', "Rajesh Gupta, HVAC Business Owner | I was paying Wix $35/month for 3 years. Titan built me a faster site for a one-time fee. I stopped the bleeding and finally own my asset.\nSarah Jenkins, Cafe Owner | Updating my menu used to be a nightmare on WordPress. Now, I just open a Google Sheet on my phone, change the price, and it updates the website instantly.\nDavid Miller, Financial Consultant | Speed is everything for SEO. My old site took 4 seconds to load. My new Titan site loads in 0.1 seconds. My Google ranking jumped to Page 1 within a month.")
+    init_state('faq_data', "Do I really pay $0 for hosting? ? Yes. We utilize 'Static Site Architecture' which allows your site to be hosted on Enterprise CDNs (like Netlify/Vercel) within their generous free tiers for small businesses.\nWhat about my Domain Name? ? You pay that directly to the registrar (like GoDaddy or Namecheap). It usually costs ~$15/year. We do not mark this up.\nCan I add a blog later? ? Yes. The Titan Engine is scalable. We can add a blog, gallery, or more pages for a one-time expansion fee.\nIs it secure? ? It is safer than WordPress. Because there is no database to hack, your site is virtually impenetrable to common SQL injection attacks.")
+    init_state('priv_txt', "**1. Introduction & Digital Sovereignty**\nAt StopWebRent.com (operated by Kaydiem Script Lab), we treat data privacy not just as a compliance requirement, but as a fundamental architectural feature...")
+    init_state('term_txt', "**1. Service Agreement**\nBy engaging StopWebRent.com (Kaydiem Script Lab) for web development services, you agree to these Terms...")
+    init_state('booking_title', "Book an Appointment")
+    init_state('booking_desc', "Select a time slot that works for you.")
+    init_state('blog_hero_title', "Latest Insights")
+    init_state('blog_hero_sub', "Thoughts on technology, business, and freedom.")
+    init_state('blog_drafts', "")
+
+    # --- 1. APP CONFIGURATION ---
+    st.set_page_config(
+        page_title="Titan v35.5 | AI Type Fix", 
+        layout="wide", 
+        page_icon="⚡",
+        initial_sidebar_state="expanded"
+    )
+
+    # --- 2. ADVANCED UI SYSTEM (CSS) ---
+    st.markdown("""
+        <style>
+        /* UI Reset & Variables */
+        :root { --primary: #0f172a; --accent: #ef4444; }
+        .stApp { background-color: #f8fafc; color: #1e293b; font-family: 'Inter', sans-serif; }
+
+        /* Sidebar Styling */
+        [data-testid="stSidebar"] { background-color: #ffffff; border-right: 1px solid #e2e8f0; }
+        [data-testid="stSidebar"] h1 { 
+            background: linear-gradient(90deg, #0f172a, #ef4444);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            font-weight: 900 !important;
+            font-size: 1.8rem !important;
+        }
+
+        /* Modern Inputs */
+        .stTextInput input, .stTextArea textarea, .stSelectbox div[data-baseweb="select"] {
+            background-color: #ffffff !important;
+            border: 1px solid #cbd5e1 !important;
+            border-radius: 8px !important;
+            color: #0f172a !important;
+            transition: all 0.2s ease;
+        }
+        .stTextInput input:focus, .stTextArea textarea:focus {
+            border-color: #3b82f6 !important;
+            box-shadow: 0 0 0 4px rgba(59, 130, 246, 0.1) !important;
+        }
+
+        /* Action Buttons */
+        .stButton>button {
+            width: 100%; border-radius: 8px; height: 3.5rem;
+            background: linear-gradient(135deg, #0f172a 0%, #334155 100%);
+            color: white; font-weight: 800; border: none;
+            box-shadow: 0 4px 15px rgba(15, 23, 42, 0.3);
+            text-transform: uppercase; letter-spacing: 1px;
+            transition: transform 0.2s;
+        }
+        .stButton>button:hover { transform: translateY(-2px); }
+
+        /* AI Badge */
+        .ai-badge { background: #6366f1; color: white; padding: 2px 6px; border-radius: 4px; font-size: 0.7em; font-weight: bold; margin-left: 5px; }
+        </style>
+        """, unsafe_allow_html=True)
+
+    cfg = SiteConfig()
+    sidebar(cfg)
+    workspace(cfg)
+    launchpad(cfg)
+    field_data(cfg)